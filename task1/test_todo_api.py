@@ -0,0 +1,47 @@
+import json
+import socket
+
+import pytest
+
+from todo_api import ApiServer
+from todo_store import Priority, Task, open_store
+
+
+@pytest.fixture
+def server(tmp_path):
+    store = open_store(str(tmp_path / "tasks.json"))
+    store.load()
+    store.put_many([Task(1, "milk", Priority.HIGH), Task(2, "eggs", Priority.LOW)])
+    api = ApiServer(store, port=0)
+    api.start()
+    yield api
+    api.stop()
+    store.close()
+
+
+def _get(port, target, host):
+    with socket.create_connection(("127.0.0.1", port)) as sock:
+        sock.sendall(f"GET {target} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+        data = b""
+        while chunk := sock.recv(65536):
+            data += chunk
+    head, _, body = data.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body) if body else None
+
+
+@pytest.mark.parametrize("host", ["127.0.0.1", "localhost", "[::1]"])
+def test_local_host_names_are_served(server, host):
+    status, body = _get(server.port, "/tasks", f"{host}:{server.port}")
+    assert status == 200 and body["total"] == 2
+
+
+@pytest.mark.parametrize("host", ["evil.example", f"evil.example:{{port}}", "localhost", "127.0.0.1:1"])
+def test_other_hosts_are_refused(server, host):
+    # A DNS-rebinding page reaches 127.0.0.1 under its own name and sends no Origin
+    status, body = _get(server.port, "/tasks", host.format(port=server.port))
+    assert status == 421 and "tasks" not in body
+
+
+def test_priority_filter_high(server):
+    status, body = _get(server.port, "/tasks?priority=High", f"127.0.0.1:{server.port}")
+    assert status == 200 and body["total"] == 1
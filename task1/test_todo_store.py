@@ -0,0 +1,160 @@
+import json
+import multiprocessing
+import os
+
+import pytest
+
+import todo_store
+from todo_store import JournalTaskStore, Priority, Task, iter_snapshot, open_store
+
+
+def _write(path, tasks):
+    with open(path, "w") as f:
+        json.dump(tasks, f)
+
+
+def _legacy(id, priority="Medium"):
+    return {"id": id, "text": f"task {id}", "priority": priority, "completed": False,
+            "created": "2024-01-01T09:00:00"}
+
+
+def test_bad_record_in_the_middle_does_not_drop_the_rest(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    bad = {"id": 2, "priority": "High"}   # no text
+    _write(path, [_legacy(1), bad, _legacy(3)])
+
+    skipped = []
+    tasks = [t for batch in iter_snapshot(path, skipped=skipped) for t in batch]
+    assert [t.id for t in tasks] == [1, 3]
+    assert skipped == [bad]
+
+
+def test_unknown_priority_label_is_kept_not_rewritten(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    urgent = _legacy(2, "Urgent")
+    _write(path, [_legacy(1), urgent, _legacy(3, "low")])
+
+    skipped = []
+    tasks = [t for batch in iter_snapshot(path, skipped=skipped) for t in batch]
+    assert [t.priority for t in tasks] == [Priority.MEDIUM, Priority.LOW]
+    assert skipped == [urgent]
+
+    store = JournalTaskStore(path)
+    try:
+        store.load()
+        store.rewrite(list(store.tasks))
+    finally:
+        store.close()
+    with open(path) as f:
+        assert urgent in json.load(f)
+
+
+def test_compaction_keeps_records_it_cannot_read(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    bad = {"id": 2, "priority": "High"}
+    _write(path, [_legacy(1), bad, _legacy(3)])
+
+    store = JournalTaskStore(path)
+    try:
+        store.load()
+        store.rewrite(list(store.tasks))
+    finally:
+        store.close()
+    with open(path) as f:
+        assert bad in json.load(f)
+
+    store = JournalTaskStore(path)
+    try:
+        assert sorted(t.id for t in store.load()) == [1, 3]
+    finally:
+        store.close()
+
+
+def test_load_leaves_a_legacy_file_alone(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    _write(path, [_legacy(1), _legacy(2, "Urgent"), _legacy(3)])
+    with open(path) as f:
+        before = f.read()
+
+    store = JournalTaskStore(path)
+    try:
+        tasks = store.load()
+        assert len(tasks) == 2 and all(t.rank for t in tasks)   # ranked in memory only
+    finally:
+        store.close()
+    with open(path) as f:
+        assert f.read() == before
+
+
+def test_cut_short_load_never_rewrites(tmp_path):
+    path = str(tmp_path / "tasks.json")
+    _write(path, [_legacy(1), _legacy(1), _legacy(2)])   # duplicate id: a repair is due
+    with open(path) as f:
+        before = f.read()
+
+    store = JournalTaskStore(path)
+    try:
+        batches = store.iter_load(batch=2)
+        store.apply_loaded(next(batches))
+        batches.close()
+        store.finish_load()
+    finally:
+        store.close()
+    with open(path) as f:
+        assert f.read() == before
+
+    store = JournalTaskStore(path)
+    try:
+        assert len(store.load()) == 3   # a complete load still repairs the ids
+    finally:
+        store.close()
+    with open(path) as f:
+        assert len({t["id"] for t in json.load(f)}) == 3
+
+
+def test_forked_child_gets_its_own_id_node():
+    if not hasattr(os, "fork"):
+        pytest.skip("needs fork")
+    # Ids from the same millisecond differ only by node, so a child that kept
+    # its parent's node would mint the parent's ids.
+    ctx = multiprocessing.get_context("fork")
+    nodes = ctx.Queue()
+    child = ctx.Process(target=_report_node, args=(nodes,))
+    child.start()
+    child.join()
+    assert nodes.get() != todo_store._ids.node
+
+
+def _report_node(nodes):
+    nodes.put(todo_store._ids.node)
+
+
+@pytest.mark.parametrize("name", ["tasks.json", "tasks.db"])
+def test_filter_by_high_priority(tmp_path, name):
+    # Priority.HIGH is 0, so a truthiness test reads it as "no filter"
+    store = open_store(str(tmp_path / name))
+    try:
+        store.load()
+        store.put_many([Task(1, "a", Priority.HIGH), Task(2, "b", Priority.LOW),
+                        Task(3, "c", Priority.HIGH)])
+        assert [t.id for t in store.page(priority=Priority.HIGH)] == [1, 3]
+        assert store.count(priority=Priority.HIGH) == 2
+        assert store.ids("Active", priority=Priority.LOW) == [2]
+    finally:
+        store.close()
+
+
+@pytest.mark.parametrize("name", ["tasks.json", "tasks.db"])
+def test_page_after_continues_where_the_last_page_ended(tmp_path, name):
+    store = open_store(str(tmp_path / name))
+    try:
+        store.load()
+        store.put_many([Task(i, f"t{i}", Priority.HIGH if i % 2 else Priority.LOW)
+                        for i in range(1, 8)])
+        first = store.page(limit=3)
+        assert [t.id for t in first] == [1, 2, 3]
+        assert [t.id for t in store.page(limit=3, after=first[-1])] == [4, 5, 6]
+        high = store.page(limit=2, priority=Priority.HIGH)
+        assert [t.id for t in store.page(priority=Priority.HIGH, after=high[-1])] == [5, 7]
+    finally:
+        store.close()
@@ -1,13 +1,54 @@
 import customtkinter as ctk
-import json
+import argparse
+import bisect
+import concurrent.futures
 import os
 from datetime import datetime
 from tkinter import messagebox
+import queue
+import sys
+import threading
+import time
 import tkinter as tk
 
+import todo_store
+from todo_core import (PRIORITIES, TASKS_FILE, ReminderQueue, clear_completed, delete_tasks,
+                       format_due, move_task, new_task, parse_due, set_completed, set_priority)
+from todo_store import DAY, DUE_FILTERS, Priority, datetime_of, now_created, open_store
+from todo_api import ApiServer
+from todo_perf import PROFILER, format_counters
+
 
 # ── Constants ──────────────────────────────────────────────────────────────────
-TASKS_FILE = "tasks.json"
+# Above this many tasks the list only builds cards for the rows on screen
+VIRTUAL_THRESHOLD = 500
+
+# Progressive startup: render once this many tasks are in, then hand the Tk
+# loop at most LOAD_SLICE seconds of loading per tick, redrawing every LOAD_REFRESH
+FIRST_SCREEN = 20
+LOAD_SLICE = 0.012
+LOAD_REFRESH = 0.25
+
+# The reminder timer sleeps until the next reminder, due time or midnight, but
+# never longer than this (ms), so suspend or clock changes cannot strand it
+MAX_TIMER_MS = 60 * 60 * 1000
+NOTICE_MS = 8000
+
+# How often (ms) to look for writes other processes made to the store
+POLL_MS = 1000
+
+# How often (ms) the Tk loop picks up local API requests: right away while they
+# keep coming, then backing off once the queue runs dry
+API_BUSY_MS = 1
+API_IDLE_MS = 15
+
+# Timing overlay (F12, with --profile): refresh interval and rows shown
+OVERLAY_MS = 500
+OVERLAY_ROWS = 16
+
+# Reminder menu label -> lead time before the due time (µs); None = no reminder
+REMIND_CHOICES = {"No reminder": None, "At due time": 0, "15 min before": 15 * 60_000_000,
+                  "1 hour before": 60 * 60_000_000, "1 day before": DAY}
 
 COLORS = {
     "bg_dark":       "#0A0A1F",
@@ -30,41 +71,18 @@ COLORS = {
     "btn_add":       "#4A90FF",
     "btn_add_hover": "#5AA0FF",
     "complete_bg":   "#1A3A2A",
+    "selected_bg":   "#26265A",
 }
 
-PRIORITY_COLORS = {"High": COLORS["high"], "Medium": COLORS["medium"], "Low": COLORS["low"]}
-PRIORITY_BG     = {"High": "#2A1A1A",      "Medium": "#2A2A1A",         "Low": "#1A2A1A"}
-
-
-# ── Data Layer ─────────────────────────────────────────────────────────────────
-def load_tasks():
-    if os.path.exists(TASKS_FILE):
-        try:
-            with open(TASKS_FILE, "r") as f:
-                return json.load(f)
-        except Exception:
-            pass
-    return []
-
-
-def save_tasks(tasks):
-    with open(TASKS_FILE, "w") as f:
-        json.dump(tasks, f, indent=2)
-
-
-def new_task(text, priority="Medium"):
-    return {
-        "id": int(datetime.now().timestamp() * 1000),
-        "text": text,
-        "priority": priority,
-        "completed": False,
-        "created": datetime.now().isoformat()
-    }
+PRIORITY_COLORS = {Priority.HIGH: COLORS["high"], Priority.MEDIUM: COLORS["medium"],
+                   Priority.LOW: COLORS["low"]}
+PRIORITY_BG     = {Priority.HIGH: "#2A1A1A",      Priority.MEDIUM: "#2A2A1A",
+                   Priority.LOW: "#1A2A1A"}
 
 
 # ── Main Application ───────────────────────────────────────────────────────────
 class TodoApp(ctk.CTk):
-    def __init__(self):
+    def __init__(self, path=TASKS_FILE, virtual=None, api_port=None, profile_out=None):
         super().__init__()
         self.title("✦ Todo List")
         self.geometry("760x900")
@@ -74,12 +92,43 @@ class TodoApp(ctk.CTk):
         ctk.set_appearance_mode("dark")
         ctk.set_default_color_theme("blue")
 
-        self.tasks = load_tasks()
+        self.timings = {}   # startup milestone -> seconds since __init__
+        self._t0 = time.perf_counter()
+
+        # Stores that can stream their file are filled in the background after
+        # the window is up; the rest (SQLite) are paged on demand anyway.
+        self.store = open_store(path, write_behind=True)
+        self.loading = hasattr(self.store, "iter_load")
+        if not self.loading:
+            self.store.load()
+        self.auto_virtual = virtual is None
+        self.virtual = self.store.count() > VIRTUAL_THRESHOLD if virtual is None else virtual
         self.current_filter = "All"
         self.edit_id = None
+        self.selected = set()      # ids of the selected tasks
+        self._anchor = None        # id a shift-click extends the selection from
+        self._cards = {}   # task id -> live TaskCard
+        self._shown = []   # cards currently packed, in display order
+        self.reminders = ReminderQueue()
+        self._reminder_job = None
+        self._edit_remind = None   # reminder kept when editing a task with a custom one
+        self._notices = []
+        self._notice_job = None
+        self._today = now_created() // DAY
+        self.api_port = api_port   # serve the local HTTP API on this port once loaded
+        self.api = None
+        self._api_calls = queue.Queue()
+        self.profile_out = profile_out   # export the timing samples here on close
+        self._overlay = None
+        self._overlay_job = None
 
         self._build_ui()
         self._refresh_tasks()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        if self.loading:
+            self._set_input_state("disabled")
+            self.status_label.pack(pady=(0, 10))
+        self.after_idle(self._on_first_paint)
 
     # ── UI Construction ────────────────────────────────────────────────────────
     def _build_ui(self):
@@ -96,8 +145,26 @@ class TodoApp(ctk.CTk):
         self._build_input(outer)
         self._build_filters(outer)
         self._build_task_area(outer)
+        self._build_bulk_bar(outer)
         self._build_footer(outer)
 
+        # Reminder pop-up, floating over the top-right corner
+        self.notice = ctk.CTkLabel(self, text="", font=("Helvetica", 12, "bold"),
+                                   fg_color=COLORS["accent_purple"], text_color="white",
+                                   corner_radius=12, justify="left", padx=14, pady=10)
+
+        # Drop position marker while a card is dragged; plain Tk so that
+        # place() takes the same physical pixels winfo_* reports
+        self.drop_line = tk.Frame(self, height=3, bg=COLORS["accent_blue"])
+        self._drag = None   # task being dragged
+
+        # Selection shortcuts; left to the entries while one has focus
+        self.bind("<Control-a>", self._on_select_all_key)
+        self.bind("<Escape>", lambda e: self._clear_selection())
+        self.bind("<Delete>", self._on_delete_key)
+        if PROFILER.enabled:
+            self.bind("<F12>", lambda e: self._toggle_overlay())
+
     def _build_header(self, parent):
         hdr = ctk.CTkFrame(parent, fg_color=COLORS["glass"], corner_radius=20,
                             border_width=1, border_color=COLORS["glass_border"])
@@ -153,7 +220,7 @@ class TodoApp(ctk.CTk):
 
         self.priority_var = ctk.StringVar(value="Medium")
         prio = ctk.CTkOptionMenu(
-            row, values=["High", "Medium", "Low"],
+            row, values=list(PRIORITIES),
             variable=self.priority_var, width=110, height=44, corner_radius=12,
             fg_color=COLORS["bg_card"], button_color=COLORS["bg_card"],
             button_hover_color=COLORS["bg_card_hover"],
@@ -180,6 +247,32 @@ class TodoApp(ctk.CTk):
         self.cancel_btn.grid(row=0, column=3, padx=(6, 0))
         self.cancel_btn.grid_remove()
 
+        when = ctk.CTkFrame(inner, fg_color="transparent")
+        when.grid(row=2, column=0, sticky="ew", pady=(8, 0))
+        when.grid_columnconfigure(0, weight=1)
+
+        self.due_entry = ctk.CTkEntry(
+            when, placeholder_text="◷ Due: YYYY-MM-DD [HH:MM], today or tomorrow",
+            height=34, corner_radius=12,
+            fg_color=COLORS["bg_card"], border_color=COLORS["glass_border"],
+            text_color=COLORS["text_primary"],
+            placeholder_text_color=COLORS["text_muted"],
+            font=("Helvetica", 12)
+        )
+        self.due_entry.grid(row=0, column=0, sticky="ew", padx=(0, 8))
+        self.due_entry.bind("<Return>", lambda e: self._add_or_save())
+
+        self.remind_var = ctk.StringVar(value="No reminder")
+        ctk.CTkOptionMenu(
+            when, values=list(REMIND_CHOICES),
+            variable=self.remind_var, width=150, height=34, corner_radius=12,
+            fg_color=COLORS["bg_card"], button_color=COLORS["bg_card"],
+            button_hover_color=COLORS["bg_card_hover"],
+            dropdown_fg_color=COLORS["bg_mid"],
+            text_color=COLORS["text_secondary"],
+            font=("Helvetica", 12)
+        ).grid(row=0, column=1)
+
     def _build_filters(self, parent):
         frame = ctk.CTkFrame(parent, fg_color="transparent")
         frame.grid(row=2, column=0, sticky="ew", padx=20, pady=(4, 8))
@@ -194,27 +287,108 @@ class TodoApp(ctk.CTk):
             btn.pack(side="left", padx=(0, 8))
             self.filter_btns[label] = btn
 
+        # Search, priority and due date narrow whichever status filter is active
+        self.due_filter_var = ctk.StringVar(value="Any date")
+        ctk.CTkOptionMenu(
+            frame, values=["Any date"] + list(DUE_FILTERS),
+            variable=self.due_filter_var, width=110, height=34, corner_radius=17,
+            fg_color=COLORS["glass"], button_color=COLORS["glass"],
+            button_hover_color=COLORS["glass_border"],
+            dropdown_fg_color=COLORS["bg_mid"],
+            text_color=COLORS["text_secondary"], font=("Helvetica", 12),
+            command=lambda _: self._set_filter(self.current_filter)
+        ).pack(side="right", padx=(8, 0))
+
+        self.priority_filter_var = ctk.StringVar(value="Any")
+        ctk.CTkOptionMenu(
+            frame, values=["Any"] + list(PRIORITIES),
+            variable=self.priority_filter_var, width=90, height=34, corner_radius=17,
+            fg_color=COLORS["glass"], button_color=COLORS["glass"],
+            button_hover_color=COLORS["glass_border"],
+            dropdown_fg_color=COLORS["bg_mid"],
+            text_color=COLORS["text_secondary"], font=("Helvetica", 12),
+            command=lambda _: self._set_filter(self.current_filter)
+        ).pack(side="right")
+
+        self.search_var = ctk.StringVar(value="")
+        ctk.CTkEntry(
+            frame, textvariable=self.search_var, placeholder_text="⌕ Search",
+            width=150, height=34, corner_radius=17,
+            fg_color=COLORS["glass"], border_color=COLORS["glass_border"],
+            text_color=COLORS["text_primary"],
+            placeholder_text_color=COLORS["text_muted"], font=("Helvetica", 12)
+        ).pack(side="right", padx=(8, 8))
+        self.search_var.trace_add("write", lambda *_: self._set_filter(self.current_filter))
+
         self._update_filter_styles()
 
     def _build_task_area(self, parent):
+        self._task_parent = parent
+        if self.virtual:
+            self.task_list = VirtualTaskList(self, parent)
+            self.task_list.grid(row=3, column=0, sticky="nsew", padx=20, pady=0)
+            return
+
         self.task_scroll = ctk.CTkScrollableFrame(
             parent, fg_color=COLORS["bg_dark"], corner_radius=0,
             scrollbar_button_color=COLORS["glass_border"],
             scrollbar_button_hover_color=COLORS["text_muted"]
         )
         self.task_scroll.grid(row=3, column=0, sticky="nsew", padx=20, pady=0)
+        self._pool = CardPool(lambda: TaskCard(self, self.task_scroll))
         self.task_scroll.grid_columnconfigure(0, weight=1)
 
         self.empty_label = ctk.CTkLabel(
-            self.task_scroll, text="✦ No tasks here yet\nAdd one above to get started",
+            self.task_scroll, text="✦ No tasks here\nAdd one above to get started",
             font=("Helvetica", 14), text_color=COLORS["text_muted"],
             justify="center"
         )
 
+    def _build_bulk_bar(self, parent):
+        # Shown only while tasks are selected
+        self.bulk_bar = ctk.CTkFrame(parent, fg_color=COLORS["glass"], corner_radius=18,
+                                     border_width=1, border_color=COLORS["accent_purple"])
+        self.bulk_bar.grid(row=4, column=0, sticky="ew", padx=20, pady=(8, 0))
+
+        inner = ctk.CTkFrame(self.bulk_bar, fg_color="transparent")
+        inner.pack(fill="x", padx=14, pady=10)
+
+        self.bulk_label = ctk.CTkLabel(inner, text="", font=("Helvetica", 12, "bold"),
+                                       text_color=COLORS["text_primary"])
+        self.bulk_label.pack(side="left", padx=(0, 8))
+
+        for text, color, command in (
+                ("Complete", COLORS["success"], lambda: self._bulk("complete")),
+                ("Uncomplete", COLORS["text_secondary"], lambda: self._bulk("uncomplete")),
+                ("Delete", COLORS["danger"], lambda: self._bulk("delete"))):
+            ctk.CTkButton(
+                inner, text=text, width=90, height=30, corner_radius=15,
+                fg_color=COLORS["bg_card"], hover_color=COLORS["bg_card_hover"],
+                text_color=color, font=("Helvetica", 12, "bold"), command=command
+            ).pack(side="left", padx=(0, 6))
+
+        self.bulk_priority_var = ctk.StringVar(value="Set priority")
+        ctk.CTkOptionMenu(
+            inner, values=list(PRIORITIES), variable=self.bulk_priority_var,
+            width=120, height=30, corner_radius=15,
+            fg_color=COLORS["bg_card"], button_color=COLORS["bg_card"],
+            button_hover_color=COLORS["bg_card_hover"], dropdown_fg_color=COLORS["bg_mid"],
+            text_color=COLORS["text_secondary"], font=("Helvetica", 12),
+            command=lambda p: self._bulk("priority", p)
+        ).pack(side="left")
+
+        ctk.CTkButton(
+            inner, text="✕", width=30, height=30, corner_radius=15,
+            fg_color="transparent", hover_color=COLORS["glass_border"],
+            text_color=COLORS["text_muted"], font=("Helvetica", 13),
+            command=self._clear_selection
+        ).pack(side="right")
+        self.bulk_bar.grid_remove()
+
     def _build_footer(self, parent):
         frame = ctk.CTkFrame(parent, fg_color=COLORS["glass"], corner_radius=18,
                              border_width=1, border_color=COLORS["glass_border"])
-        frame.grid(row=4, column=0, sticky="ew", padx=20, pady=(8, 20))
+        frame.grid(row=5, column=0, sticky="ew", padx=20, pady=(8, 20))
 
         inner = ctk.CTkFrame(frame, fg_color="transparent")
         inner.pack(padx=20, pady=12)
@@ -223,6 +397,20 @@ class TodoApp(ctk.CTk):
         self.stat_done  = self._stat_pill(inner, "Completed", "0", COLORS["success"])
         self.stat_pend  = self._stat_pill(inner, "Pending", "0", COLORS["warning"])
 
+        actions = ctk.CTkFrame(inner, fg_color="transparent")
+        actions.pack(side="left", padx=(16, 0))
+        for text, command in (("Select all", self._select_all),
+                              ("Clear completed", self._clear_completed)):
+            ctk.CTkButton(
+                actions, text=text, width=120, height=28, corner_radius=14,
+                fg_color=COLORS["bg_card"], hover_color=COLORS["bg_card_hover"],
+                text_color=COLORS["text_secondary"], font=("Helvetica", 11),
+                command=command
+            ).pack(pady=2)
+
+        self.status_label = ctk.CTkLabel(frame, text="Loading tasks…", font=("Helvetica", 11),
+                                         text_color=COLORS["text_muted"])
+
     def _stat_pill(self, parent, label, value, color):
         pill = ctk.CTkFrame(parent, fg_color=COLORS["bg_card"], corner_radius=14)
         pill.pack(side="left", padx=8)
@@ -234,153 +422,586 @@ class TodoApp(ctk.CTk):
 
     # ── Task Rendering ─────────────────────────────────────────────────────────
     def _refresh_tasks(self):
-        for w in self.task_scroll.winfo_children():
-            w.destroy()
+        status, query = self.current_filter, self._query()
+        self._now = now_created()
+        if self.virtual:
+            self.task_list.set_source(
+                self.store.count(status, **query),
+                lambda offset, limit: self.store.page(status, offset, limit, **query))
+            self._update_stats()
+            self._update_filter_styles()
+            return
 
-        filtered = [t for t in self.tasks if self._passes_filter(t)]
+        filtered = self.store.page(status, **query)
 
-        if not filtered:
-            self.empty_label = ctk.CTkLabel(
-                self.task_scroll,
-                text="✦ No tasks here\nAdd one above to get started",
-                font=("Helvetica", 14), text_color=COLORS["text_muted"], justify="center"
-            )
-            self.empty_label.pack(pady=80)
-        else:
-            for i, task in enumerate(filtered):
-                self._render_card(task, i)
+        # Reconcile against the live cards: only tasks that appeared, changed,
+        # moved or disappeared touch any widgets.
+        visible = {t.id for t in filtered}
+        released = set()
+        for task_id in [i for i in self._cards if i not in visible]:
+            card = self._cards.pop(task_id)
+            self._pool.release(card)
+            released.add(card)
+        if released:
+            self._shown = [c for c in self._shown if c not in released]
+
+        order = [self._render_card(task) for task in filtered]
+        self._place_cards(order)
 
+        if not order:
+            self.empty_label.pack(pady=80)
         self._update_stats()
         self._update_filter_styles()
 
-    def _passes_filter(self, task):
-        if self.current_filter == "Active":    return not task["completed"]
-        if self.current_filter == "Completed": return task["completed"]
-        return True
-
-    def _render_card(self, task, idx):
-        pcolor = PRIORITY_COLORS.get(task["priority"], COLORS["text_muted"])
-        is_done = task["completed"]
-        card_bg = COLORS["complete_bg"] if is_done else COLORS["bg_card"]
-
-        outer = ctk.CTkFrame(self.task_scroll, fg_color=pcolor, corner_radius=16)
-        outer.grid(row=idx, column=0, sticky="ew", pady=4)
-        outer.grid_columnconfigure(0, weight=1)
-
-        inner = ctk.CTkFrame(outer, fg_color=card_bg, corner_radius=14)
-        inner.grid(row=0, column=0, sticky="nsew", padx=3, pady=3)
-        inner.grid_columnconfigure(1, weight=1)
-
-        # Checkbox
-        check_var = ctk.BooleanVar(value=is_done)
-        chk = ctk.CTkCheckBox(
-            inner, text="", variable=check_var, width=30, height=30,
-            checkbox_width=22, checkbox_height=22, corner_radius=11,
-            fg_color=pcolor, hover_color=pcolor,
-            border_color=COLORS["glass_border"],
-            command=lambda t=task, v=check_var: self._toggle(t, v)
-        )
-        chk.grid(row=0, column=0, padx=(14, 8), pady=16)
-
-        # Text
-        font_strike = ("Helvetica", 13)
-        text_color  = COLORS["text_muted"] if is_done else COLORS["text_primary"]
-        display     = f"̶{task['text']}̶" if is_done else task["text"]
-
-        txt = ctk.CTkLabel(inner, text=task["text"], font=font_strike,
-                           text_color=text_color, anchor="w", wraplength=380, justify="left")
-        if is_done:
-            txt.configure(text_color=COLORS["text_muted"])
-        txt.grid(row=0, column=1, sticky="w", padx=(0, 8), pady=16)
-
-        # Strike line overlay for completed
-        if is_done:
-            txt.configure(font=("Helvetica", 13))
-            # We'll just mute it; true strikethrough requires tkinter Text widget
-
-        # Priority badge
-        badge = ctk.CTkLabel(inner, text=task["priority"],
-                             font=("Helvetica", 10, "bold"), text_color="black",
-                             fg_color=pcolor, corner_radius=8,
-                             width=60, height=22)
-        badge.grid(row=0, column=2, padx=6, pady=16)
-
-        # Buttons
-        btn_frame = ctk.CTkFrame(inner, fg_color="transparent")
-        btn_frame.grid(row=0, column=3, padx=(0, 12), pady=16)
-
-        edit_btn = ctk.CTkButton(
-            btn_frame, text="✎", width=32, height=32, corner_radius=10,
-            fg_color=COLORS["glass"], hover_color=COLORS["glass_border"],
-            text_color=COLORS["accent_blue"], font=("Helvetica", 14),
-            command=lambda t=task: self._start_edit(t)
-        )
-        edit_btn.pack(side="left", padx=(0, 4))
-
-        del_btn = ctk.CTkButton(
-            btn_frame, text="✕", width=32, height=32, corner_radius=10,
-            fg_color=COLORS["glass"], hover_color="#3A1A1A",
-            text_color=COLORS["danger"], font=("Helvetica", 14),
-            command=lambda t=task: self._delete(t)
-        )
-        del_btn.pack(side="left")
+    def _query(self):
+        priority, due = self.priority_filter_var.get(), self.due_filter_var.get()
+        return {"priority": None if priority == "Any" else Priority.parse(priority),
+                "text": self.search_var.get(),
+                "due": due if due in DUE_FILTERS else None}
+
+    def _render_card(self, task):
+        card = self._cards.get(task.id)
+        if card is None:
+            card = self._pool.acquire()
+            self._cards[task.id] = card
+        card.show(task, task.id in self.selected, self._now)
+        return card
+
+    def _place_cards(self, order):
+        # Cards that kept their relative order stay packed where they are;
+        # everything else is (re)packed right after its new predecessor.
+        if order:
+            self.empty_label.pack_forget()
+        old_pos = {card: i for i, card in enumerate(self._shown)}
+        stable = _longest_increasing([old_pos.get(card, -1) for card in order])
+
+        first_stable = order[min(stable)] if stable else None
+        prev = None
+        for i, card in enumerate(order):
+            if i not in stable:
+                if prev is not None:
+                    card.pack(fill="x", pady=4, after=prev)
+                elif first_stable is not None:
+                    card.pack(fill="x", pady=4, before=first_stable)
+                else:
+                    card.pack(fill="x", pady=4)
+            prev = card
+        self._shown = order
 
     # ── Actions ────────────────────────────────────────────────────────────────
     def _add_or_save(self):
         text = self.task_entry.get().strip()
         if not text:
-            self.task_entry.configure(border_color=COLORS["danger"])
-            self.after(800, lambda: self.task_entry.configure(border_color=COLORS["glass_border"]))
+            self._flash(self.task_entry)
             return
+        try:
+            due = parse_due(self.due_entry.get())
+        except ValueError:
+            self._flash(self.due_entry)
+            return
+        lead = REMIND_CHOICES.get(self.remind_var.get())
+        if self.remind_var.get() == "Custom":   # set elsewhere (CLI); kept as is
+            remind = self._edit_remind
+        else:
+            remind = None if lead is None or due is None else due - lead
 
         if self.edit_id is not None:
-            for t in self.tasks:
-                if t["id"] == self.edit_id:
-                    t["text"] = text
-                    t["priority"] = self.priority_var.get()
-                    break
+            t = self.store.get(self.edit_id)
+            if t is not None:
+                t.text = text
+                t.priority = Priority.parse(self.priority_var.get())
+                t.due, t.remind = due, remind
+                self.store.put(t)
+                self._schedule(t)
             self.edit_id = None
             self.add_btn.configure(text="Add Task")
             self.cancel_btn.grid_remove()
         else:
-            self.tasks.append(new_task(text, self.priority_var.get()))
+            self._schedule(new_task(text, self.priority_var.get(), due, remind), store=True)
 
-        save_tasks(self.tasks)
+        self._reset_input()
+        self._refresh_tasks()
+
+    def _flash(self, entry):
+        entry.configure(border_color=COLORS["danger"])
+        self.after(800, lambda: entry.configure(border_color=COLORS["glass_border"]))
+
+    def _reset_input(self):
         self.task_entry.delete(0, "end")
+        self.due_entry.delete(0, "end")
         self.priority_var.set("Medium")
-        self._refresh_tasks()
+        self.remind_var.set("No reminder")
 
     def _start_edit(self, task):
-        self.edit_id = task["id"]
-        self.task_entry.delete(0, "end")
-        self.task_entry.insert(0, task["text"])
-        self.priority_var.set(task["priority"])
+        if self.loading:
+            return
+        self.edit_id = task.id
+        self._reset_input()
+        self.task_entry.insert(0, task.text)
+        self.priority_var.set(task.priority.label)
+        if task.due is not None:
+            self.due_entry.insert(0, datetime_of(task.due).strftime("%Y-%m-%d %H:%M"))
+        self._edit_remind = task.remind
+        if task.remind is not None:
+            leads = {lead: label for label, lead in REMIND_CHOICES.items() if lead is not None}
+            due = task.due if task.due is not None else task.remind
+            self.remind_var.set(leads.get(due - task.remind, "Custom"))
         self.add_btn.configure(text="Save Task")
         self.cancel_btn.grid()
         self.task_entry.focus()
 
     def _cancel_edit(self):
         self.edit_id = None
-        self.task_entry.delete(0, "end")
-        self.priority_var.set("Medium")
+        self._reset_input()
         self.add_btn.configure(text="Add Task")
         self.cancel_btn.grid_remove()
 
     def _toggle(self, task, var):
-        task["completed"] = var.get()
-        save_tasks(self.tasks)
+        if self.loading:
+            var.set(task.completed)
+            return
+        task.completed = var.get()
+        self.store.put(task)
+        self._schedule(task)
         self._refresh_tasks()
 
     def _delete(self, task):
-        if messagebox.askyesno("Delete Task", f'Delete "{task["text"]}"?', parent=self):
-            self.tasks = [t for t in self.tasks if t["id"] != task["id"]]
-            if self.edit_id == task["id"]:
+        if self.loading:
+            return
+        if messagebox.askyesno("Delete Task", f'Delete "{task.text}"?', parent=self):
+            if self.edit_id == task.id:
                 self._cancel_edit()
-            save_tasks(self.tasks)
+            self.selected.discard(task.id)
+            self.store.delete(task.id)
+            self.reminders.cancel(task.id)
             self._refresh_tasks()
+            self._show_selection()
+
+    # ── Drag to Reorder ────────────────────────────────────────────────────────
+    # Dragging a card's handle moves that task between its new neighbours in
+    # the current view. Only the moved task gets a new rank, so the drop is
+    # one record written and, through the keyed reconciliation, one card
+    # repacked.
+    def _drag_start(self, task):
+        if self.loading or task is None:
+            return
+        self._drag = task
+
+    def _drag_motion(self, event):
+        if self._drag is None:
+            return
+        _, y, left, width = self._drop_gap(event.y_root)
+        self.drop_line.place(x=left - self.winfo_rootx(), y=y - self.winfo_rooty() - 1,
+                             width=width)
+        self.drop_line.lift()
+
+    def _drag_end(self, event):
+        task, self._drag = self._drag, None
+        self.drop_line.place_forget()
+        if task is None:
+            return
+        gap = self._drop_gap(event.y_root)[0]
+        status, query = self.current_filter, self._query()
+        around = self.store.page(status, max(gap - 1, 0), 2 if gap else 1, **query)
+        prev = around[0] if gap and around else None
+        nxt = around[-1] if around and (not gap or len(around) == 2) else None
+        if move_task(self.store, task.id, prev and prev.id, nxt and nxt.id):
+            self._refresh_tasks()
+
+    def _drop_gap(self, y_root):
+        """(gap index in the current view, marker y, list x, list width) for
+        the pointer at `y_root`; gap i sits just above row i."""
+        if self.virtual:
+            tl = self.task_list
+            top = tl.viewport.winfo_rooty()
+            row = tl._apply_widget_scaling(tl.ROW_HEIGHT)
+            offset = tl._apply_widget_scaling(tl.offset)
+            gap = max(0, min(tl.total, round((y_root - top + offset) / row)))
+            return gap, top + gap * row - offset, tl.winfo_rootx(), tl.viewport.winfo_width()
+        cards = self._shown
+        gap = sum(1 for c in cards if c.winfo_rooty() + c.winfo_height() / 2 < y_root)
+        if gap < len(cards):
+            y = cards[gap].winfo_rooty() - 2
+        elif cards:
+            y = cards[-1].winfo_rooty() + cards[-1].winfo_height() + 2
+        else:
+            y = self.task_scroll.winfo_rooty()
+        return gap, y, self.task_scroll.winfo_rootx(), self.task_scroll.winfo_width()
+
+    # ── Selection & Bulk Actions ───────────────────────────────────────────────
+    def _click(self, task, mode):
+        """Card click: "only" selects just this task, "toggle" (ctrl) flips it,
+        "range" (shift) adds everything between the last click and this one."""
+        if self.loading or task is None:
+            return
+        if mode == "range" and self._anchor is not None:
+            status, query = self.current_filter, self._query()
+            ids = self.store.ids(status, **query)
+            try:
+                a, b = sorted((ids.index(self._anchor), ids.index(task.id)))
+            except ValueError:
+                self.selected = {task.id}
+            else:
+                self.selected.update(ids[a:b + 1])
+        elif mode == "toggle":
+            self.selected ^= {task.id}
+            self._anchor = task.id
+        else:
+            self.selected = set() if self.selected == {task.id} else {task.id}
+            self._anchor = task.id
+        self._show_selection()
+
+    def _select_all(self):
+        if self.loading:
+            return
+        status, query = self.current_filter, self._query()
+        self.selected = set(self.store.ids(status, **query))
+        self._show_selection()
+
+    def _clear_selection(self):
+        if self.selected:
+            self.selected.clear()
+            self._show_selection()
+
+    def _show_selection(self):
+        # Selection is not a mutation: just restyle the cards that exist.
+        cards = self.task_list.cards if self.virtual else self._cards
+        for card in cards.values():
+            card.show(card.task, card.task.id in self.selected)
+        if self.selected:
+            self.bulk_label.configure(text=f"{len(self.selected):,} selected")
+            self.bulk_bar.grid()
+        else:
+            self.bulk_bar.grid_remove()
+
+    def _on_select_all_key(self, event):
+        if not isinstance(self.focus_get(), tk.Entry):
+            self._select_all()
+            return "break"
+
+    def _on_delete_key(self, event):
+        if self.selected and not isinstance(self.focus_get(), tk.Entry):
+            self._bulk("delete")
+
+    def _bulk(self, action, priority=None):
+        """Apply `action` to every selected task: one store write, one re-render."""
+        if self.loading or not self.selected:
+            return
+        ids = list(self.selected)
+        if action in ("complete", "uncomplete"):
+            for t in set_completed(self.store, ids, action == "complete"):
+                self._schedule(t)
+        elif action == "priority":
+            self.bulk_priority_var.set("Set priority")
+            set_priority(self.store, ids, priority)
+        elif action == "delete":
+            if not messagebox.askyesno("Delete Tasks", f"Delete {len(ids):,} selected task(s)?",
+                                       parent=self):
+                return
+            for task_id in delete_tasks(self.store, ids):
+                self.reminders.cancel(task_id)
+        self._after_bulk()
+
+    def _clear_completed(self):
+        if self.loading:
+            return
+        done = self.store.stats()[1]
+        if done and messagebox.askyesno("Clear Completed", f"Delete all {done:,} completed task(s)?",
+                                        parent=self):
+            for task_id in clear_completed(self.store):
+                self.reminders.cancel(task_id)
+            self._after_bulk()
+
+    def _after_bulk(self):
+        if self.edit_id is not None and self.store.get(self.edit_id) is None:
+            self._cancel_edit()
+        # Keep only selected tasks that are still in the current view.
+        if self.selected:
+            status, query = self.current_filter, self._query()
+            self.selected &= set(self.store.ids(status, **query))
+        self._refresh_tasks()
+        self._show_selection()
+
+    # ── Progressive Loading ────────────────────────────────────────────────────
+    def _on_first_paint(self):
+        self.update_idletasks()
+        self._mark("first_paint")
+        if not self.loading:
+            self._mark("first_screen")
+            self._mark("fully_loaded")
+            self._report_timings()
+            self._start_reminders()
+            self.after(POLL_MS, self._poll_store)
+            self._start_api()
+            return
+        self._load_queue = queue.Queue()
+        self._last_refresh = 0.0
+        threading.Thread(target=self._load_worker, name="todo-load", daemon=True).start()
+        self.after(1, self._drain_load)
+
+    def _load_worker(self):
+        # Parsing happens here; the model itself is only touched on the Tk thread.
+        try:
+            with PROFILER.span("JournalTaskStore.iter_load"):
+                for batch in self.store.iter_load():
+                    self._load_queue.put(batch)
+        except Exception as exc:
+            self._load_queue.put(exc)
+            return
+        self._load_queue.put(None)
+
+    def _drain_load(self):
+        deadline = time.perf_counter() + LOAD_SLICE
+        while time.perf_counter() < deadline:
+            try:
+                batch = self._load_queue.get_nowait()
+            except queue.Empty:
+                break
+            if batch is None or isinstance(batch, Exception):
+                self._finish_loading(batch)
+                return
+            self.store.apply_loaded(batch)
+
+        now = time.perf_counter()
+        if "first_screen" not in self.timings and self.store.count() >= FIRST_SCREEN:
+            self._refresh_while_loading()
+            self._mark("first_screen")
+        elif now - self._last_refresh >= LOAD_REFRESH:
+            self._refresh_while_loading()
+        self.after(1, self._drain_load)
+
+    def _refresh_while_loading(self):
+        self._last_refresh = time.perf_counter()
+        if self.auto_virtual and not self.virtual and self.store.count() > VIRTUAL_THRESHOLD:
+            self._switch_to_virtual()
+        self.status_label.configure(text=f"Loading tasks… {self.store.count():,}")
+        self._refresh_tasks()
+
+    def _finish_loading(self, error):
+        if error is not None:
+            messagebox.showerror("Todo List", f"Could not finish loading tasks:\n{error}", parent=self)
+        self.store.finish_load()   # after an error this saves nothing (see finish_load)
+        self.loading = False
+        self._set_input_state("normal")
+        self.status_label.pack_forget()
+        self._refresh_while_loading()
+        if "first_screen" not in self.timings:
+            self._mark("first_screen")
+        self._mark("fully_loaded")
+        self._report_timings()
+        self._start_reminders()
+        self.after(POLL_MS, self._poll_store)
+        self._start_api()
+
+    def _switch_to_virtual(self):
+        self.task_scroll.destroy()
+        self._cards.clear()
+        self._shown = []
+        self.virtual = True
+        self._build_task_area(self._task_parent)
+
+    def _set_input_state(self, state):
+        self.task_entry.configure(state=state)
+        self.add_btn.configure(state=state)
+
+    def _mark(self, milestone):
+        self.timings[milestone] = time.perf_counter() - self._t0
+
+    def _report_timings(self):
+        if not PROFILER.enabled:   # startup timings are part of --profile
+            return
+        t = self.timings
+        print(f"todo: first paint {t['first_paint']:.3f}s, first screen {t['first_screen']:.3f}s, "
+              f"fully loaded {t['fully_loaded']:.3f}s ({self.store.count()} tasks)",
+              file=sys.stderr)
+
+    # ── Reminders ──────────────────────────────────────────────────────────────
+    # One Tk timer for the whole list, always armed for the soonest entry in
+    # the ReminderQueue; mutations reschedule just the tasks they touch.
+    def _start_reminders(self):
+        now = now_created()
+        for t in self.store.scheduled():
+            self.reminders.schedule(t, now)
+        self._arm_reminders()
+
+    def _schedule(self, task, store=False):
+        if store:
+            self.store.put(task)
+        self.reminders.schedule(task, now_created())
+        self._arm_reminders()
+
+    def _arm_reminders(self):
+        if self._reminder_job is not None:
+            self.after_cancel(self._reminder_job)
+        now = now_created()
+        wake = (now // DAY + 1) * DAY   # midnight: "today" labels and filters roll over
+        upcoming = self.reminders.next_time()
+        if upcoming is not None:
+            wake = min(wake, upcoming)
+        delay = min(max(0, (wake - now) // 1000), MAX_TIMER_MS)
+        self._reminder_job = self.after(delay, self._fire_reminders)
+
+    def _fire_reminders(self):
+        self._reminder_job = None
+        now = now_created()
+        refresh = now // DAY != self._today
+        self._today = now // DAY
+        for task_id, kind in self.reminders.pop_due(now):
+            t = self.store.get(task_id)
+            if t is None or t.completed:
+                continue
+            if kind == "remind":
+                self._notify(f"⏰ {t.text}" + (f"  · due {format_due(t.due, now)}"
+                                               if t.due is not None else ""))
+            else:
+                self._notify(f"◷ Now due: {t.text}")
+                refresh = True
+        if refresh:
+            self._refresh_tasks()
+        self._arm_reminders()
+
+    def _notify(self, message):
+        self.bell()
+        self._notices = (self._notices + [message])[-3:]
+        self.notice.configure(text="\n".join(self._notices))
+        self.notice.place(relx=1.0, x=-28, y=28, anchor="ne")
+        self.notice.lift()
+        if self._notice_job is not None:
+            self.after_cancel(self._notice_job)
+        self._notice_job = self.after(NOTICE_MS, self._hide_notice)
+
+    def _hide_notice(self):
+        self._notice_job = None
+        self._notices = []
+        self.notice.place_forget()
+
+    # ── External Changes ───────────────────────────────────────────────────────
+    def _poll_store(self):
+        self._apply_external(self.store.poll_changes())
+        self.after(POLL_MS, self._poll_store)
+
+    def _apply_external(self, ids):
+        """Show writes from another window or script: `ids` changed (None = any)."""
+        if ids is not None and not ids:
+            return
+        if ids is None:
+            self.reminders = ReminderQueue()
+            self._start_reminders()
+        else:
+            now = now_created()
+            for task_id in ids:
+                t = self.store.get(task_id)
+                if t is None:
+                    self.reminders.cancel(task_id)
+                else:
+                    self.reminders.schedule(t, now)
+            self._arm_reminders()
+        if self.edit_id is not None and self.store.get(self.edit_id) is None:
+            self._cancel_edit()
+
+        # Tasks whose card is on screen and whose filtered fields did not change
+        # are re-rendered in place; anything that may enter, leave or move in
+        # the view goes through the usual reconciliation.
+        searching = bool(self.search_var.get().strip())
+        cards = []
+        for task_id in ids or ():
+            card, t = self._cards.get(task_id), self.store.get(task_id)
+            if self.virtual or card is None or t is None or (
+                    (t.completed, t.priority, t.due) != (card.task.completed, card.task.priority,
+                                                         card.task.due)
+                    or searching and t.text != card.task.text):
+                break
+            cards.append((card, t))
+        else:
+            if ids is not None:
+                now = now_created()
+                for card, t in cards:
+                    card.show(t, t.id in self.selected, now)
+                return
+        self.selected &= set(self.store.ids(self.current_filter, **self._query()))
+        self._refresh_tasks()
+        self._show_selection()
+
+    # ── Local API ──────────────────────────────────────────────────────────────
+    # The server thread only speaks HTTP. Each batch of requests runs here on
+    # the Tk thread between events, and the list catches up once per batch
+    # through the same path as writes from other processes.
+    def _start_api(self):
+        if self.api_port is None:
+            return
+        self.api = ApiServer(self.store, port=self.api_port, run=self._api_call,
+                             on_change=self._apply_external)
+        try:
+            port = self.api.start()
+        except OSError as exc:
+            self.api = None
+            messagebox.showerror("Todo List", f"Could not start the local API:\n{exc}", parent=self)
+            return
+        print(f"todo: API on http://127.0.0.1:{port}/tasks", file=sys.stderr)
+        self.after(API_IDLE_MS, self._drain_api)
+
+    def _api_call(self, fn):
+        # Server thread: hand fn to the Tk loop, answer when it has run.
+        future = concurrent.futures.Future()
+        self._api_calls.put((fn, future))
+        return future
+
+    def _drain_api(self):
+        busy = False
+        while True:
+            try:
+                fn, future = self._api_calls.get_nowait()
+            except queue.Empty:
+                break
+            busy = True
+            try:
+                future.set_result(fn())
+            except Exception as exc:
+                future.set_exception(exc)
+        self.after(API_BUSY_MS if busy else API_IDLE_MS, self._drain_api)
+
+    # ── Timing Overlay ─────────────────────────────────────────────────────────
+    def _toggle_overlay(self):
+        if self._overlay is not None:
+            self.after_cancel(self._overlay_job)
+            self._overlay.destroy()
+            self._overlay = self._overlay_job = None
+            return
+        self._overlay = tk.Label(self, justify="left", anchor="nw", font=("Courier", 10),
+                                 bg=COLORS["bg_mid"], fg=COLORS["text_primary"],
+                                 padx=10, pady=8, highlightthickness=1,
+                                 highlightbackground=COLORS["glass_border"])
+        self._overlay.place(relx=1.0, x=-12, y=12, anchor="ne")
+        self._update_overlay()
+
+    def _update_overlay(self):
+        # Drawn outside the spans, so the overlay never shows up in itself.
+        lines = [PROFILER.format_summary(OVERLAY_ROWS), ""]
+        writer = getattr(self.store, "writer", None)
+        if writer is not None:
+            lines.append(format_counters("write-behind", writer.counters()))
+        pool = self.task_list.pool if self.virtual else self._pool
+        lines.append(format_counters("card pool", pool.counters()))
+        lines += ["", "F12 to hide"]
+        self._overlay.configure(text="\n".join(lines))
+        self._overlay.lift()
+        self._overlay_job = self.after(OVERLAY_MS, self._update_overlay)
+
+    def _on_close(self):
+        if self.api is not None:
+            self.api.stop()
+        self.store.close()
+        if self.profile_out:
+            PROFILER.export(self.profile_out)
+            print(f"todo: timing samples written to {self.profile_out}", file=sys.stderr)
+        self.destroy()
 
     def _set_filter(self, f):
         self.current_filter = f
+        self.selected.clear()
+        self._show_selection()
+        if self.virtual:
+            self.task_list.scroll_to(0)
         self._refresh_tasks()
 
     def _update_filter_styles(self):
@@ -393,15 +1014,357 @@ class TodoApp(ctk.CTk):
                               hover_color=COLORS["glass_border"])
 
     def _update_stats(self):
-        total = len(self.tasks)
-        done  = sum(1 for t in self.tasks if t["completed"])
+        total, done = self.store.stats()
         pend  = total - done
         self.stat_total.configure(text=str(total))
         self.stat_done.configure(text=str(done))
         self.stat_pend.configure(text=str(pend))
 
 
+def _longest_increasing(seq):
+    """Indices of one longest strictly increasing run of non-negative values."""
+    tails, tail_idx, parent = [], [], [-1] * len(seq)
+    for i, v in enumerate(seq):
+        if v < 0:
+            continue
+        j = bisect.bisect_left(tails, v)
+        if j == len(tails):
+            tails.append(v)
+            tail_idx.append(i)
+        else:
+            tails[j] = v
+            tail_idx[j] = i
+        parent[i] = tail_idx[j - 1] if j else -1
+
+    keep = set()
+    i = tail_idx[-1] if tail_idx else -1
+    while i >= 0:
+        keep.add(i)
+        i = parent[i]
+    return keep
+
+
+# ── Task Card ──────────────────────────────────────────────────────────────────
+class TaskCard(ctk.CTkFrame):
+    def __init__(self, app, parent, **kwargs):
+        super().__init__(parent, fg_color=COLORS["text_muted"], corner_radius=16, **kwargs)
+        self.app = app
+        self.task = None
+        self.signature = None
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.inner = ctk.CTkFrame(self, fg_color=COLORS["bg_card"], corner_radius=14)
+        self.inner.grid(row=0, column=0, sticky="nsew", padx=3, pady=3)
+        self.inner.grid_columnconfigure(1, weight=1)
+
+        # Checkbox
+        self.check_var = ctk.BooleanVar(value=False)
+        self.chk = ctk.CTkCheckBox(
+            self.inner, text="", variable=self.check_var, width=30, height=30,
+            checkbox_width=22, checkbox_height=22, corner_radius=11,
+            border_color=COLORS["glass_border"],
+            command=lambda: self.app._toggle(self.task, self.check_var)
+        )
+        self.chk.grid(row=0, column=0, padx=(24, 8), pady=16)
+
+        # Drag handle, to the left of the checkbox
+        handle = ctk.CTkLabel(self.inner, text="⠿", width=16, font=("Helvetica", 14),
+                              text_color=COLORS["text_muted"], cursor="fleur")
+        handle.place(x=6, rely=0.5, anchor="w")
+        handle.bind("<ButtonPress-1>", lambda e: self.app._drag_start(self.task))
+        handle.bind("<B1-Motion>", self.app._drag_motion)
+        handle.bind("<ButtonRelease-1>", self.app._drag_end)
+
+        # Text — completed tasks are muted; true strikethrough requires tkinter Text widget
+        self.txt = ctk.CTkLabel(self.inner, text="", font=("Helvetica", 13),
+                                text_color=COLORS["text_primary"], anchor="w",
+                                wraplength=380, justify="left")
+        self.txt.grid(row=0, column=1, sticky="w", padx=(0, 8), pady=16)
+
+        # Clicking the card body selects: plain, ctrl (toggle) or shift (range)
+        for widget in (self.inner, self.txt):
+            widget.bind("<Button-1>", lambda e: self.app._click(self.task, "only"))
+            widget.bind("<Control-Button-1>", lambda e: self.app._click(self.task, "toggle"))
+            widget.bind("<Shift-Button-1>", lambda e: self.app._click(self.task, "range"))
+
+        # Due time, only gridded for tasks that have one
+        self.due_label = ctk.CTkLabel(self.inner, text="", font=("Helvetica", 11))
+        self.due_label.grid(row=0, column=2, padx=(0, 4), pady=16)
+        self.due_label.grid_remove()
+
+        # Priority badge
+        self.badge = ctk.CTkLabel(self.inner, text="",
+                                  font=("Helvetica", 10, "bold"), text_color="black",
+                                  corner_radius=8, width=60, height=22)
+        self.badge.grid(row=0, column=3, padx=6, pady=16)
+
+        # Buttons
+        btn_frame = ctk.CTkFrame(self.inner, fg_color="transparent")
+        btn_frame.grid(row=0, column=4, padx=(0, 12), pady=16)
+
+        edit_btn = ctk.CTkButton(
+            btn_frame, text="✎", width=32, height=32, corner_radius=10,
+            fg_color=COLORS["glass"], hover_color=COLORS["glass_border"],
+            text_color=COLORS["accent_blue"], font=("Helvetica", 14),
+            command=lambda: self.app._start_edit(self.task)
+        )
+        edit_btn.pack(side="left", padx=(0, 4))
+
+        del_btn = ctk.CTkButton(
+            btn_frame, text="✕", width=32, height=32, corner_radius=10,
+            fg_color=COLORS["glass"], hover_color="#3A1A1A",
+            text_color=COLORS["danger"], font=("Helvetica", 14),
+            command=lambda: self.app._delete(self.task)
+        )
+        del_btn.pack(side="left")
+
+    def show(self, task, selected=False, now=None):
+        """Point the card at `task`, reconfiguring only what changed since last time."""
+        self.task = task
+        if task.due is None:
+            due = None
+        else:
+            now = now_created() if now is None else now
+            if task.completed:
+                color = COLORS["text_muted"]
+            elif task.due < now:
+                color = COLORS["danger"]
+            else:
+                color = COLORS["warning"] if task.due // DAY == now // DAY else COLORS["text_secondary"]
+            due = ("◷ " + format_due(task.due, now), color)
+        signature = (task.text, task.priority, task.completed, selected, due)
+        if signature == self.signature:
+            return
+        old_text, old_priority, old_done, old_selected, old_due = self.signature or (None,) * 5
+        text, priority, is_done, selected, due = signature
+
+        if priority != old_priority:
+            pcolor = PRIORITY_COLORS.get(priority, COLORS["text_muted"])
+            self.configure(fg_color=pcolor)
+            self.chk.configure(fg_color=pcolor, hover_color=pcolor)
+            self.badge.configure(text=priority.label, fg_color=pcolor)
+        if is_done != old_done or selected != old_selected:
+            if selected:
+                bg = COLORS["selected_bg"]
+            else:
+                bg = COLORS["complete_bg"] if is_done else COLORS["bg_card"]
+            self.inner.configure(fg_color=bg)
+        if is_done != old_done:
+            self.check_var.set(is_done)
+            self.txt.configure(text_color=COLORS["text_muted"] if is_done else COLORS["text_primary"])
+        if text != old_text:
+            self.txt.configure(text=text)
+        if due != old_due:
+            if due is None:
+                self.due_label.grid_remove()
+            else:
+                self.due_label.configure(text=due[0], text_color=due[1])
+                self.due_label.grid()
+        self.signature = signature
+
+    def hide(self):
+        manager = self.winfo_manager()
+        if manager == "pack":
+            self.pack_forget()
+        elif manager == "place":
+            self.place_forget()
+
+
+# ── Card Pool ──────────────────────────────────────────────────────────────────
+class CardPool:
+    """Recycles TaskCards: released cards are unmapped and handed out again.
+
+    A Tk widget cannot change parents, so each list container owns its own
+    pool. At most `limit` idle cards are kept; extras are destroyed.
+    """
+
+    LIMIT = 200
+
+    def __init__(self, factory, limit=LIMIT):
+        self.factory = factory
+        self.limit = limit
+        self.free = []
+        self.hits = 0        # acquires served from the pool
+        self.misses = 0      # acquires that had to build a new card
+        self.discarded = 0   # releases destroyed because the pool was full
+
+    def acquire(self):
+        if self.free:
+            self.hits += 1
+            return self.free.pop()
+        self.misses += 1
+        return self.factory()
+
+    def release(self, card):
+        card.hide()
+        if len(self.free) < self.limit:
+            self.free.append(card)
+        else:
+            self.discarded += 1
+            card.destroy()
+
+    def counters(self):
+        return {"hits": self.hits, "misses": self.misses,
+                "discarded": self.discarded, "idle": len(self.free)}
+
+
+# ── Virtual Task List ──────────────────────────────────────────────────────────
+class VirtualTaskList(ctk.CTkFrame):
+    """Windowed task list: only rows in the viewport (plus overscan) get a card."""
+
+    ROW_HEIGHT = 76
+    OVERSCAN = 4
+    WHEEL_ROWS = 3
+
+    def __init__(self, app, parent):
+        super().__init__(parent, fg_color=COLORS["bg_dark"], corner_radius=0)
+        self.app = app
+        self.total = 0
+        self.fetch = None    # fetch(offset, limit) -> tasks for that slice
+        self._window = None  # (first, last, tasks) most recently fetched
+        self.offset = 0      # scroll position in (unscaled) pixels
+        self.cards = {}      # task id -> placed TaskCard
+        self.pool = CardPool(self._new_card)
+
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.viewport = ctk.CTkFrame(self, fg_color=COLORS["bg_dark"], corner_radius=0)
+        self.viewport.grid(row=0, column=0, sticky="nsew")
+        self.viewport.bind("<Configure>", lambda e: self._layout())
+
+        self.scrollbar = ctk.CTkScrollbar(
+            self, command=self._on_scrollbar,
+            button_color=COLORS["glass_border"],
+            button_hover_color=COLORS["text_muted"]
+        )
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self.empty_label = ctk.CTkLabel(
+            self.viewport, text="✦ No tasks here\nAdd one above to get started",
+            font=("Helvetica", 14), text_color=COLORS["text_muted"], justify="center"
+        )
+
+        # Wheel events go to whichever widget is under the pointer, so grab
+        # them globally only while the pointer is over the list.
+        self.bind("<Enter>", self._bind_wheel)
+        self.bind("<Leave>", self._unbind_wheel)
+
+    def _new_card(self):
+        card = TaskCard(self.app, self.viewport, height=self.ROW_HEIGHT - 8)
+        card.grid_propagate(False)
+        return card
+
+    # ── Rows & Scrolling ───────────────────────────────────────────────────────
+    def set_source(self, total, fetch):
+        self.total = total
+        self.fetch = fetch
+        self._window = None
+        self.offset = min(self.offset, self._max_offset())
+        self._layout()
+
+    def scroll_to(self, offset):
+        offset = max(0, min(int(offset), self._max_offset()))
+        if offset != self.offset:
+            self.offset = offset
+            self._layout()
+
+    def _viewport_height(self):
+        return int(self._reverse_widget_scaling(self.viewport.winfo_height()))
+
+    def _max_offset(self):
+        return max(0, self.total * self.ROW_HEIGHT - self._viewport_height())
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(float(amount) * self.total * self.ROW_HEIGHT)
+        elif action == "scroll":
+            step = self._viewport_height() if unit == "pages" else self.ROW_HEIGHT
+            self.scroll_to(self.offset + int(amount) * step)
+
+    def _on_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            direction = -1
+        else:
+            direction = 1
+        self.scroll_to(self.offset + direction * self.WHEEL_ROWS * self.ROW_HEIGHT)
+
+    def _bind_wheel(self, event=None):
+        self.bind_all("<MouseWheel>", self._on_wheel)
+        self.bind_all("<Button-4>", self._on_wheel)
+        self.bind_all("<Button-5>", self._on_wheel)
+
+    def _unbind_wheel(self, event=None):
+        self.unbind_all("<MouseWheel>")
+        self.unbind_all("<Button-4>")
+        self.unbind_all("<Button-5>")
+
+    # ── Layout ─────────────────────────────────────────────────────────────────
+    def _layout(self):
+        height = self._viewport_height()
+        first = max(0, self.offset // self.ROW_HEIGHT - self.OVERSCAN)
+        last = min(self.total, (self.offset + height) // self.ROW_HEIGHT + 1 + self.OVERSCAN)
+        if self._window is None or self._window[:2] != (first, last):
+            self._window = (first, last, self.fetch(first, last - first) if last > first else [])
+        window = self._window[2]
+
+        wanted = {t.id for t in window}
+        for task_id in [i for i in self.cards if i not in wanted]:
+            self.pool.release(self.cards.pop(task_id))
+
+        for i, task in enumerate(window, first):
+            card = self.cards.get(task.id)
+            if card is None:
+                card = self.pool.acquire()
+                self.cards[task.id] = card
+            card.show(task, task.id in self.app.selected)
+            card.place(x=0, y=i * self.ROW_HEIGHT - self.offset, relwidth=1)
+
+        if self.total:
+            self.empty_label.place_forget()
+        else:
+            self.empty_label.place(relx=0.5, y=80, anchor="n")
+
+        total = self.total * self.ROW_HEIGHT
+        if total > height:
+            self.scrollbar.set(self.offset / total, (self.offset + height) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+
+# ── Profiling ──────────────────────────────────────────────────────────────────
+# What --profile times: the storage calls the window makes (the file read
+# itself is a span in _load_worker), list rebuilds, card rendering and the
+# event handlers. Must run before the window is built, since Tk keeps the
+# bound methods it was given.
+def enable_profiling():
+    PROFILER.instrument(todo_store.MemoryTaskStore, ("put", "delete", "page", "count"))
+    PROFILER.instrument(todo_store.JournalTaskStore,
+                        ("apply_loaded", "finish_load", "poll_changes", "_catch_up", "_reload",
+                         "_write", "_compact", "rewrite"))
+    PROFILER.instrument(todo_store.SQLiteTaskStore,
+                        ("load", "put", "put_many", "delete", "page", "count"))
+    PROFILER.instrument(TodoApp, ("_refresh_tasks", "_render_card", "_apply_external",
+                                  "_add_or_save", "_start_edit", "_toggle", "_delete",
+                                  "_drag_end", "_click", "_bulk", "_clear_completed",
+                                  "_set_filter", "_fire_reminders"))
+    PROFILER.instrument(TaskCard, ("show",))
+    PROFILER.instrument(VirtualTaskList, ("_layout",))
+
+
 # ── Entry Point ────────────────────────────────────────────────────────────────
 if __name__ == "__main__":
-    app = TodoApp()
+    parser = argparse.ArgumentParser(prog="todo", description="Todo list window.")
+    parser.add_argument("file", nargs="?", default=TASKS_FILE, help="task store (default: %(default)s)")
+    parser.add_argument("--api", type=int, metavar="PORT",
+                        help="also serve the local HTTP API on 127.0.0.1:PORT")
+    parser.add_argument("--profile", action="store_true", default=bool(os.environ.get("TODO_PROFILE")),
+                        help="time the hot paths; F12 shows the overlay (also TODO_PROFILE=1)")
+    parser.add_argument("--profile-out", metavar="FILE",
+                        help="with --profile, write the raw samples here on exit (.csv or .json)")
+    args = parser.parse_args()
+    if args.profile:
+        enable_profiling()
+    app = TodoApp(args.file, api_port=args.api, profile_out=args.profile and args.profile_out)
     app.mainloop()
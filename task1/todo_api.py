@@ -0,0 +1,445 @@
+"""Local HTTP/JSON API over a todo store, for other tools on the same machine.
+
+Plain asyncio, no dependencies, and only ever bound to a loopback address.
+Requests from web pages are refused: one carrying an Origin header, or whose
+Host is not 127.0.0.1, localhost or [::1] with the server's port, gets an
+error instead of an answer.
+
+    python todo_api.py --file tasks.json --port 8765     # headless
+    python todo.py tasks.json --api 8765                 # inside the open window
+
+Endpoints (JSON in, JSON out; tasks use the tasks.json schema):
+
+    GET    /tasks?status=Active&priority=High&search=milk&due=Overdue&offset=0&limit=100
+    GET    /tasks/<id>
+    POST   /tasks                 {"text": ..., "priority": ..., "due": ..., "remind": ...}
+    PATCH  /tasks/<id>            any of text, priority, completed, due, remind
+    POST   /tasks/<id>/complete   {"completed": true}   (body optional)
+    DELETE /tasks/<id>
+    POST   /bulk                  {"ops": [{"op": "add", "text": ...},
+                                           {"op": "update", "id": ..., ...},
+                                           {"op": "complete", "id": ..., "completed": true},
+                                           {"op": "delete", "id": ...}]}
+    GET    /stats
+
+Requests are not run one by one. Everything that arrives while a batch is
+being applied is queued and applied together as the next batch, in arrival
+order. That happens on the thread that owns the store, which is the Tk
+thread when the API runs inside the window. Each batch ends with one
+change notification listing the ids it touched. Persistence goes through
+the store's write-behind worker, so a burst of requests becomes a few
+journal writes.
+"""
+import argparse
+import asyncio
+import ipaddress
+import json
+import threading
+from urllib.parse import parse_qsl, unquote
+
+from todo_core import TASKS_FILE, new_task, parse_due
+from todo_store import DUE_FILTERS, STATUS_FILTERS, Priority, open_store
+
+
+# ── Constants ──────────────────────────────────────────────────────────────────
+DEFAULT_PORT = 8765
+MAX_BODY = 1 << 20          # bytes per request body
+PAGE_LIMIT = 100            # tasks per GET /tasks unless ?limit= says otherwise
+MAX_PAGE = 1000
+POLL_INTERVAL = 1.0         # seconds between checks for other processes' writes (headless)
+
+REASONS = {200: "OK", 201: "Created", 204: "No Content", 400: "Bad Request",
+           403: "Forbidden", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 421: "Misdirected Request", 500: "Internal Server Error"}
+
+# Names a local client may use for the server in its Host header
+LOCAL_HOSTS = ("127.0.0.1", "localhost", "[::1]")
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# ── Operations ─────────────────────────────────────────────────────────────────
+class TaskOps:
+    """The API's operations over one store. Not thread-safe: call it only from
+    the thread that owns the store. Every method returns (status, payload)
+    or raises ApiError; ids of tasks written pile up in `changed`."""
+
+    def __init__(self, store):
+        self.store = store
+        self.changed = set()
+
+    def _task(self, task_id):
+        task = self.store.get(task_id)
+        if task is None:
+            raise ApiError(404, f"no task {task_id}")
+        return task
+
+    def list(self, query):
+        status = query.get("status", "All")
+        if status not in STATUS_FILTERS:
+            raise ApiError(400, f"status must be one of {', '.join(STATUS_FILTERS)}")
+        due = query.get("due") or None
+        if due is not None and due not in DUE_FILTERS:
+            raise ApiError(400, f"due must be one of {', '.join(DUE_FILTERS)}")
+        filters = {"priority": _priority(query["priority"]) if query.get("priority") else None,
+                   "text": query.get("search", ""), "due": due}
+        offset = _int(query.get("offset", 0), "offset")
+        limit = min(_int(query.get("limit", PAGE_LIMIT), "limit"), MAX_PAGE)
+        tasks = self.store.page(status, max(offset, 0), max(limit, 0), **filters)
+        return 200, {"total": self.store.count(status, **filters), "offset": offset,
+                     "tasks": [t.to_dict() for t in tasks]}
+
+    def get(self, task_id):
+        return 200, self._task(task_id).to_dict()
+
+    def stats(self):
+        total, done = self.store.stats()
+        return 200, {"total": total, "completed": done, "pending": total - done}
+
+    def add(self, body):
+        text = body.get("text")
+        if not isinstance(text, str) or not text.strip():
+            raise ApiError(400, "text is required")
+        due = _when(body.get("due"), "due")
+        task = new_task(text.strip(), _priority(body.get("priority") or "Medium"),
+                        due, _when(body.get("remind"), "remind"))
+        self.store.put(task)
+        self.changed.add(task.id)
+        return 201, task.to_dict()
+
+    def update(self, task_id, body):
+        # Copy rather than edit in place: the UI compares old and new records
+        # to decide which cards need work.
+        task = self._task(task_id).copy()
+        if "text" in body:
+            if not isinstance(body["text"], str) or not body["text"].strip():
+                raise ApiError(400, "text must be a non-empty string")
+            task.text = body["text"].strip()
+        if "priority" in body:
+            task.priority = _priority(body["priority"])
+        if "completed" in body:
+            task.completed = _bool(body["completed"])
+        if "due" in body:
+            task.due = _when(body["due"], "due")
+        if "remind" in body:
+            task.remind = _when(body["remind"], "remind")
+        self.store.put(task)
+        self.changed.add(task_id)
+        return 200, task.to_dict()
+
+    def complete(self, task_id, body):
+        return self.update(task_id, {"completed": body.get("completed", True)})
+
+    def delete(self, task_id):
+        self._task(task_id)
+        self.store.delete(task_id)
+        self.changed.add(task_id)
+        return 204, None
+
+    def bulk(self, body):
+        ops = body.get("ops")
+        if not isinstance(ops, list):
+            raise ApiError(400, "ops must be a list")
+        results = []
+        for op in ops:
+            try:
+                if not isinstance(op, dict):
+                    raise ApiError(400, "each op must be an object")
+                kind = op.get("op")
+                if kind == "add":
+                    status, payload = self.add(op)
+                elif kind in ("update", "complete", "delete"):
+                    task_id = _int(op.get("id"), "id")
+                    if kind == "delete":
+                        status, payload = self.delete(task_id)
+                    else:
+                        fields = {k: v for k, v in op.items() if k not in ("op", "id")}
+                        status, payload = getattr(self, kind)(task_id, fields)
+                else:
+                    raise ApiError(400, f"unknown op {kind!r}")
+                results.append({"status": status, "task": payload} if payload else
+                               {"status": status})
+            except ApiError as exc:
+                results.append({"status": exc.status, "error": str(exc)})
+        return 200, {"results": results}
+
+
+def _int(value, name):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ApiError(400, f"{name} must be an integer") from None
+
+
+def _bool(value):
+    if not isinstance(value, bool):
+        raise ApiError(400, "completed must be true or false")
+    return value
+
+
+def _priority(value):
+    try:
+        return Priority.parse(value)
+    except (TypeError, ValueError):
+        raise ApiError(400, f"priority must be one of "
+                            f"{', '.join(p.label for p in Priority)}") from None
+
+
+def _when(value, name):
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise ApiError(400, f"{name} must be an ISO date/time string or null")
+    try:
+        return parse_due(value)
+    except ValueError as exc:
+        raise ApiError(400, f"{name}: {exc}") from None
+
+
+def route(method, path, query, body):
+    """The TaskOps call for a request, as a function of the ops object."""
+    parts = [unquote(p) for p in path.strip("/").split("/")]
+    if parts == ["tasks"]:
+        if method == "GET":
+            return lambda ops: ops.list(query)
+        if method == "POST":
+            return lambda ops: ops.add(body)
+    elif parts == ["stats"]:
+        if method == "GET":
+            return lambda ops: ops.stats()
+    elif parts == ["bulk"]:
+        if method == "POST":
+            return lambda ops: ops.bulk(body)
+    elif len(parts) in (2, 3) and parts[0] == "tasks" and parts[2:] in ([], ["complete"]):
+        task_id = _int(parts[1], "task id")
+        if parts[2:] == ["complete"]:
+            if method == "POST":
+                return lambda ops: ops.complete(task_id, body)
+        elif method == "GET":
+            return lambda ops: ops.get(task_id)
+        elif method == "PATCH":
+            return lambda ops: ops.update(task_id, body)
+        elif method == "DELETE":
+            return lambda ops: ops.delete(task_id)
+    else:
+        raise ApiError(404, f"no such endpoint {path}")
+    raise ApiError(405, f"{method} not allowed on {path}")
+
+
+# ── Server ─────────────────────────────────────────────────────────────────────
+class ApiServer:
+    """HTTP/1.1 (keep-alive) front end for TaskOps on its own asyncio loop.
+
+    `run(fn)` hands a batch to the thread that owns the store and returns a
+    concurrent.futures.Future of its result. None means the store belongs to
+    the server's own loop, as in the headless server. `on_change(ids)` is
+    called on that same thread after every batch that wrote something.
+    """
+
+    def __init__(self, store, host="127.0.0.1", port=DEFAULT_PORT, run=None, on_change=None):
+        if not ipaddress.ip_address(host).is_loopback:
+            raise ValueError(f"the API only listens on loopback addresses, not {host}")
+        self.ops = TaskOps(store)
+        self.host = host
+        self.port = port
+        self.run = run
+        self.on_change = on_change
+        self.requests = 0   # requests answered
+        self.batches = 0    # batches applied to the store
+        self.loop = None
+        self._pending = []
+        self._flushing = False
+        self._server = None
+        self._thread = None
+        self._started = threading.Event()
+        self._error = None
+
+    # ── Lifecycle ──────────────────────────────────────────────────────────────
+    def start(self):
+        """Serve on a daemon thread; returns the port (useful with port=0)."""
+        self._thread = threading.Thread(target=self._run_thread, name="todo-api", daemon=True)
+        self._thread.start()
+        self._started.wait()
+        if self._error is not None:
+            raise self._error
+        return self.port
+
+    def _run_thread(self):
+        try:
+            asyncio.run(self.serve())
+        except Exception as exc:   # e.g. the port is taken
+            self._error = exc
+            self._started.set()
+
+    async def serve(self, ready=None):
+        """Serve on the running loop; `ready(port)` is called once bound."""
+        self.loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        self._server = await asyncio.start_server(self._connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._hosts = {f"{name}:{self.port}" for name in LOCAL_HOSTS}
+        self._started.set()
+        if ready is not None:
+            ready(self.port)
+        if self.run is None:
+            self.loop.create_task(self._poll_store())
+        try:
+            await self._stop.wait()
+        finally:
+            # Not `async with`: that would also wait out idle keep-alive clients.
+            self._server.close()
+
+    def stop(self):
+        if self.loop is not None and self._server is not None:
+            self.loop.call_soon_threadsafe(self._stop.set)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    async def _poll_store(self):
+        # Headless, nothing else merges other processes' writes into the model.
+        while True:
+            await asyncio.sleep(POLL_INTERVAL)
+            self.ops.store.poll_changes()
+
+    # ── Batching ───────────────────────────────────────────────────────────────
+    def _submit(self, call):
+        future = self.loop.create_future()
+        self._pending.append((call, future))
+        if not self._flushing:
+            self._flushing = True
+            self.loop.create_task(self._flush())
+        return future
+
+    async def _flush(self):
+        try:
+            while self._pending:
+                batch, self._pending = self._pending, []
+                calls = [call for call, _ in batch]
+                if self.run is None:
+                    results = self._apply(calls)
+                else:
+                    results = await asyncio.wrap_future(self.run(lambda: self._apply(calls)))
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+        finally:
+            self._flushing = False
+
+    def _apply(self, calls):
+        # Runs on the store's thread: one pass over the batch, one notification.
+        results = []
+        for call in calls:
+            try:
+                results.append(call(self.ops))
+            except ApiError as exc:
+                results.append((exc.status, {"error": str(exc)}))
+            except Exception as exc:
+                results.append((500, {"error": f"{type(exc).__name__}: {exc}"}))
+        self.batches += 1
+        changed, self.ops.changed = self.ops.changed, set()
+        if changed and self.on_change is not None:
+            self.on_change(changed)
+        return results
+
+    # ── HTTP ───────────────────────────────────────────────────────────────────
+    async def _connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                keep_alive, status, payload = await self._request(reader, head)
+                self.requests += 1
+                writer.write(_response(status, payload, keep_alive))
+                if writer.transport.get_write_buffer_size() > 1 << 16:
+                    await writer.drain()
+                if not keep_alive:
+                    break
+            await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass   # client went away, or the server is stopping
+        finally:
+            writer.close()
+
+    async def _request(self, reader, head):
+        try:
+            request_line, *lines = head.decode("latin-1").split("\r\n")
+            method, target, version = request_line.split(" ", 2)
+        except ValueError:
+            return False, 400, {"error": "malformed request line"}
+        headers = {}
+        for line in lines:
+            name, _, value = line.partition(":")
+            if name:
+                headers[name.strip().lower()] = value.strip()
+        keep_alive = (version == "HTTP/1.1"
+                      and headers.get("connection", "").lower() != "close")
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            return False, 400, {"error": "bad Content-Length"}
+        if length > MAX_BODY:
+            return False, 413, {"error": f"body over {MAX_BODY} bytes"}
+        try:
+            body = await reader.readexactly(length) if length else b""
+        except asyncio.IncompleteReadError:
+            return False, 400, {"error": "body shorter than Content-Length"}
+        # Browsers attach Origin to cross-site requests; no web page gets to
+        # drive the list through localhost. A DNS-rebinding page sends no
+        # Origin on a same-origin GET, but its Host still names its own site.
+        if "origin" in headers:
+            return keep_alive, 403, {"error": "cross-origin requests are not allowed"}
+        if headers.get("host", "").lower() not in self._hosts:
+            return False, 421, {"error": "Host must name this server (e.g. "
+                                         f"127.0.0.1:{self.port})"}
+        try:
+            data = json.loads(body) if body.strip() else {}
+            if not isinstance(data, dict):
+                raise ApiError(400, "body must be a JSON object")
+            path, _, query = target.partition("?")
+            call = route(method, path, dict(parse_qsl(query)), data)
+        except ValueError:
+            return keep_alive, 400, {"error": "body is not valid JSON"}
+        except ApiError as exc:
+            return keep_alive, exc.status, {"error": str(exc)}
+        status, payload = await self._submit(call)
+        return keep_alive, status, payload
+
+
+def _response(status, payload, keep_alive):
+    body = b"" if payload is None else json.dumps(payload, separators=(",", ":")).encode()
+    head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            + ("Content-Type: application/json\r\n" if body else "")
+            + ("" if keep_alive else "Connection: close\r\n")
+            + "\r\n")
+    return head.encode() + body
+
+
+# ── Command Line ───────────────────────────────────────────────────────────────
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="todo_api", description="Local HTTP API for a todo store.")
+    parser.add_argument("--file", default=TASKS_FILE, help="task store (default: %(default)s)")
+    parser.add_argument("--host", default="127.0.0.1", help="loopback address to bind")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+
+    store = open_store(args.file, write_behind=True)
+    store.load()
+    server = ApiServer(store, args.host, args.port)
+    try:
+        asyncio.run(server.serve(
+            lambda port: print(f"todo API on http://{args.host}:{port}/tasks", flush=True)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,468 @@
+"""Todo benchmarks. Synthetic data only; nothing touches tasks.json.
+
+    python todo_bench.py memory --count 1000000
+    python todo_bench.py snapshot --count 1000000
+    python todo_bench.py suite --out bench.json
+    python todo_bench.py suite --sizes 1000 10000 --baseline bench.json --xvfb
+    python todo_bench.py api --requests 20000 --connections 16 --queued
+
+`suite` writes its results as JSON; with --baseline it exits with status 1
+if any timing got slower than the baseline by more than --tolerance.
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import gc
+import json
+import os
+import platform
+import queue
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import threading
+import tracemalloc
+
+from todo_api import ApiServer
+from todo_core import PRIORITIES, load_tasks, save_tasks, set_completed
+from todo_store import (BINARY_SUFFIX, DAY, BinarySnapshot, JournalTaskStore, Task, TaskModel,
+                        iter_snapshot, now_created, open_store, write_snapshot)
+
+
+SUITE_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+# A timing regresses when it is this much slower than the baseline and
+# also slower by at least MIN_DELTA seconds (so noise in sub-ms timings passes)
+TOLERANCE = 0.25
+MIN_DELTA = 0.002
+
+
+WORDS = ("buy", "call", "email", "fix", "plan", "review", "send", "write", "book", "pay",
+         "milk", "report", "invoice", "dentist", "car", "slides", "budget", "garden")
+
+
+# ── Synthetic Data ─────────────────────────────────────────────────────────────
+def synthetic_tasks(count, seed=0):
+    """`count` tasks in the tasks.json schema, reproducible for a given seed."""
+    rng = random.Random(seed)
+    base = 1_700_000_000
+    return [{"id": 1_000_000 + i,
+             "text": " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 6))),
+             "priority": rng.choice(PRIORITIES),
+             "completed": rng.random() < 0.3,
+             "created": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(base + i * 37))
+                        + f".{rng.randrange(1_000_000):06d}"}
+            for i in range(count)]
+
+
+# ── Memory ─────────────────────────────────────────────────────────────────────
+def traced(build):
+    """Bytes still allocated by `build()` once it returns, and its result."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return size, result
+
+
+def bench_memory(count, seed=0):
+    # Every variant starts from the same JSON text, the way a load does, so
+    # the task text itself is counted in each.
+    raw = json.dumps(synthetic_tasks(count, seed), separators=(",", ":"))
+    results = {}
+
+    size, dicts = traced(lambda: json.loads(raw))
+    results["dict records"] = size
+    del dicts
+
+    size, tasks = traced(lambda: [Task.from_dict(d) for d in json.loads(raw)])
+    results["Task records"] = size
+
+    size, model = traced(lambda: TaskModel(Task.from_dict(d) for d in json.loads(raw)))
+    results["TaskModel (records + indexes)"] = size
+    del model, tasks
+    return results
+
+
+def report_memory(count, results):
+    base = results["dict records"]
+    print(f"{count:,} tasks")
+    for name, size in results.items():
+        print(f"  {name:<30} {size / 2**20:9.1f} MiB  {size / count:7.1f} B/task"
+              f"  {base / size:5.2f}x smaller than dicts" if size != base else
+              f"  {name:<30} {size / 2**20:9.1f} MiB  {size / count:7.1f} B/task")
+
+
+# ── Snapshot Formats ───────────────────────────────────────────────────────────
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def bench_snapshot(count, seed=0, directory=None):
+    """Save/load seconds and file size for the JSON and binary snapshot formats."""
+    tasks = [Task.from_dict(d) for d in synthetic_tasks(count, seed)]
+    results = {}
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        for name, suffix in (("json", ".json"), ("binary", BINARY_SUFFIX)):
+            path = os.path.join(tmp, "tasks" + suffix)
+            save, _ = timed(lambda: write_snapshot(path, tasks))
+            load, loaded = timed(lambda: [t for batch in iter_snapshot(path) for t in batch])
+            if loaded != tasks:
+                raise AssertionError(f"{name} snapshot did not round-trip")
+            results[name] = {"save": save, "load": load, "bytes": os.path.getsize(path)}
+            del loaded
+
+        # Random access straight from the map: one screenful from the middle.
+        path = os.path.join(tmp, "tasks" + BINARY_SUFFIX)
+
+        def middle_page():
+            with BinarySnapshot(path) as snapshot:
+                middle = len(snapshot) // 2
+                return [snapshot[i] for i in range(middle, min(middle + 50, len(snapshot)))]
+        results["binary"]["open + 50 tasks"], _ = timed(middle_page)
+    return results
+
+
+def report_snapshot(count, results):
+    js, binary = results["json"], results["binary"]
+    print(f"{count:,} tasks")
+    for name, r in results.items():
+        print(f"  {name:<7} save {r['save']:7.3f}s  load {r['load']:7.3f}s  "
+              f"{r['bytes'] / 2**20:8.1f} MiB")
+    print(f"  binary is {js['save'] / binary['save']:.1f}x faster to save, "
+          f"{js['load'] / binary['load']:.1f}x faster to load, "
+          f"{js['bytes'] / binary['bytes']:.1f}x smaller")
+    print(f"  lazy open + 50 tasks: {binary['open + 50 tasks'] * 1000:.2f} ms")
+
+
+# ── Suite ──────────────────────────────────────────────────────────────────────
+def runs(fn, repeat, setup=None):
+    """Median/min/max seconds of `repeat` calls to fn(), each after setup()."""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        times.append(timed(fn)[0])
+    return {"median": statistics.median(times), "min": min(times), "max": max(times),
+            "runs": repeat}
+
+
+def bench_store(path, count, repeat):
+    """Storage and model timings for a `count`-task store at `path`."""
+    results = {}
+    tasks = [Task.from_dict(d) for d in synthetic_tasks(count)]
+    rng = random.Random(count)
+    now = now_created()
+    for t in rng.sample(tasks, count // 5):   # a fifth have due dates, within a month
+        t.due = now + rng.randint(-30 * DAY, 30 * DAY)
+    heavy = max(1, min(repeat, 3 if count >= 100_000 else repeat))
+
+    probe = open_store(path)
+    probe.close()
+    if isinstance(probe, JournalTaskStore):
+        save, load = (lambda: save_tasks(tasks, path)), (lambda: load_tasks(path))
+    else:
+        def save():
+            os.remove(path)
+            store = open_store(path)
+            store.put_many(tasks)
+            store.close()
+
+        def load():
+            store = open_store(path)
+            tasks = store.page()
+            store.close()
+            return tasks
+    results["save_tasks"] = runs(save, heavy)
+    results["load_tasks"] = runs(load, heavy)
+    del tasks
+
+    store = open_store(path)
+    store.load()
+    try:
+        word, priority = WORDS[0], store.page(limit=1)[0].priority
+        # The first text query builds the search index; time that on its own.
+        results["search_first_query"] = runs(lambda: store.page("All", text=word), 1)
+        for name, query in (("filter_active", lambda: store.page("Active")),
+                            ("filter_completed", lambda: store.page("Completed")),
+                            ("filter_priority", lambda: store.page("All", priority=priority)),
+                            ("filter_search", lambda: store.page("All", text=word)),
+                            ("filter_overdue", lambda: store.page("All", due="Overdue"))):
+            # Cold: the memory store caches views, so drop the cache first.
+            results[name] = runs(query, repeat, getattr(store, "_views", {}).clear)
+        results["stats"] = runs(lambda: (store.stats(), store.count("Active"),
+                                         store.count("Completed")), repeat)
+
+        # One click on a checkbox: flip a task in the middle and persist it.
+        middle = store.ids()[count // 2]
+        results["toggle"] = runs(
+            lambda: set_completed(store, [middle], not store.get(middle).completed), repeat)
+    finally:
+        store.close()
+    return results
+
+
+def bench_render(path, repeat):
+    """TodoApp startup milestones and _refresh_tasks timings; needs a display."""
+    import todo   # Tk only when there is a display to draw on
+
+    app = todo.TodoApp(path)
+    try:
+        while app.loading or "fully_loaded" not in app.timings:
+            app.update()
+        app.update()
+        results = {name: {"median": t, "min": t, "max": t, "runs": 1}
+                   for name, t in app.timings.items()}
+        results["refresh_tasks"] = runs(app._refresh_tasks, repeat)
+
+        def flip():
+            task = app.store.page(app.current_filter, 0, 1)[0]
+            task.completed = not task.completed
+            app.store.put(task)
+        results["refresh_after_toggle"] = runs(app._refresh_tasks, repeat, flip)
+
+        def switch():
+            app.current_filter = "Active" if app.current_filter == "All" else "All"
+        results["refresh_after_filter"] = runs(app._refresh_tasks, repeat, switch)
+        app.update()
+    finally:
+        app._on_close()
+    return results
+
+
+def start_xvfb():
+    """Starts Xvfb on a free display and points DISPLAY at it; returns the process."""
+    binary = shutil.which("Xvfb")
+    if binary is None:
+        return None
+    for number in range(99, 199):
+        if os.path.exists(f"/tmp/.X11-unix/X{number}") or os.path.exists(f"/tmp/.X{number}-lock"):
+            continue
+        proc = subprocess.Popen([binary, f":{number}", "-screen", "0", "1280x1024x24", "-nolisten",
+                                 "tcp"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        for _ in range(50):
+            if os.path.exists(f"/tmp/.X11-unix/X{number}"):
+                os.environ["DISPLAY"] = f":{number}"
+                return proc
+            if proc.poll() is not None:
+                break
+            time.sleep(0.1)
+        proc.kill()
+    return None
+
+
+def bench_suite(sizes=SUITE_SIZES, repeat=5, fmt=".json", render=True, directory=None):
+    report = {"meta": {"python": platform.python_version(), "platform": platform.platform(),
+                       "machine": platform.machine(), "format": fmt, "repeat": repeat,
+                       "time": time.strftime("%Y-%m-%dT%H:%M:%S")},
+              "results": {}}
+    if render and not os.environ.get("DISPLAY"):
+        report["meta"]["render"] = "skipped: no display (try --xvfb)"
+        render = False
+    for count in sizes:
+        with tempfile.TemporaryDirectory(dir=directory) as tmp:
+            path = os.path.join(tmp, "tasks" + fmt)
+            print(f"  {count:,} tasks…", file=sys.stderr)
+            results = bench_store(path, count, repeat)
+            if render:
+                results.update(("render." + k, v) for k, v in bench_render(path, repeat).items())
+        report["results"][str(count)] = results
+    return report
+
+
+def compare(report, baseline, tolerance=TOLERANCE, min_delta=MIN_DELTA):
+    """Regressions of `report` against `baseline`, as printable lines."""
+    regressions = []
+    for size, results in report["results"].items():
+        for name, r in results.items():
+            base = baseline.get("results", {}).get(size, {}).get(name)
+            if base is None:
+                continue
+            now, then = r["median"], base["median"]
+            if now > then * (1 + tolerance) and now - then > min_delta:
+                regressions.append(f"{size:>8} {name:<26} {then * 1000:10.2f} ms -> "
+                                   f"{now * 1000:10.2f} ms  (+{(now / then - 1) * 100:.0f}%)")
+    return regressions
+
+
+def report_suite(report):
+    for size, results in report["results"].items():
+        print(f"{int(size):,} tasks")
+        for name, r in results.items():
+            print(f"  {name:<26} median {r['median'] * 1000:10.2f} ms   "
+                  f"min {r['min'] * 1000:10.2f} ms")
+    if "render" in report["meta"]:
+        print(f"render: {report['meta']['render']}")
+
+
+# ── Local API ──────────────────────────────────────────────────────────────────
+class QueuedOwner:
+    """Runs API batches on a separate thread that polls like the Tk loop does
+    (TodoApp._drain_api), to measure the hand-off the window adds."""
+
+    def __init__(self, busy=0.001, idle=0.015):
+        self.calls = queue.Queue()
+        self.busy, self.idle = busy, idle
+        self.stopped = False
+        threading.Thread(target=self._loop, daemon=True).start()
+
+    def run(self, fn):
+        future = concurrent.futures.Future()
+        self.calls.put((fn, future))
+        return future
+
+    def _loop(self):
+        while not self.stopped:
+            busy = False
+            while True:
+                try:
+                    fn, future = self.calls.get_nowait()
+                except queue.Empty:
+                    break
+                busy = True
+                future.set_result(fn())
+            time.sleep(self.busy if busy else self.idle)
+
+
+async def _client(port, count, ids, latencies):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    rng = random.Random(len(latencies))
+    for i in range(count):
+        kind = i % 4
+        if kind == 0:
+            method, target, body = "GET", f"/tasks?status=Active&limit=20&offset={rng.randrange(1000)}", b""
+        elif kind == 1:
+            method, target, body = "POST", "/tasks", b'{"text":"bench task","priority":"High"}'
+        elif kind == 2:
+            method, target = "PATCH", f"/tasks/{rng.choice(ids)}"
+            body = b'{"text":"renamed","priority":"Low"}'
+        else:
+            method, target, body = "POST", f"/tasks/{rng.choice(ids)}/complete", b""
+        start = time.perf_counter()
+        writer.write(f"{method} {target} HTTP/1.1\r\nHost: localhost:{port}\r\n"
+                     f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        head = await reader.readuntil(b"\r\n\r\n")
+        length = int(head.split(b"Content-Length: ", 1)[1].split(b"\r\n", 1)[0])
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+def bench_api(requests=20_000, connections=16, tasks=10_000, queued=False, directory=None):
+    """Requests/second and latency of a mixed list/add/update/complete load
+    against a journal store with write-behind, like the window uses."""
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        path = os.path.join(tmp, "tasks.json")
+        store = open_store(path)
+        store.load()
+        store.put_many(Task.from_dict(d) for d in synthetic_tasks(tasks))
+        store.close()
+        store = open_store(path, write_behind=True)
+        store.load()
+        owner = QueuedOwner() if queued else None
+        server = ApiServer(store, port=0, run=owner and owner.run)
+        port = server.start()
+        ids = store.ids()
+        latencies = []
+
+        async def load():
+            per = requests // connections
+            await asyncio.gather(*(_client(port, per, ids, latencies) for _ in range(connections)))
+        elapsed, _ = timed(lambda: asyncio.run(load()))
+        server.stop()
+        if owner is not None:
+            owner.stopped = True
+        store.close()
+        latencies.sort()
+        return {"requests": len(latencies), "connections": connections, "seconds": elapsed,
+                "per_second": len(latencies) / elapsed, "batches": server.batches,
+                "p50": latencies[len(latencies) // 2],
+                "p99": latencies[int(len(latencies) * 0.99)], "max": latencies[-1]}
+
+
+def report_api(r, queued):
+    print(f"{r['requests']:,} requests over {r['connections']} connections"
+          f"{' (queued to another thread)' if queued else ''}")
+    print(f"  {r['per_second']:,.0f} req/s, {r['requests'] / r['batches']:.1f} requests per batch")
+    print(f"  latency p50 {r['p50'] * 1000:.2f} ms  p99 {r['p99'] * 1000:.2f} ms  "
+          f"max {r['max'] * 1000:.2f} ms")
+
+
+# ── Command Line ───────────────────────────────────────────────────────────────
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="todo_bench", description="Todo benchmarks.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("memory", help="bytes per task: dicts vs Task records")
+    p.add_argument("--count", type=int, default=1_000_000)
+    p.add_argument("--seed", type=int, default=0)
+
+    p = sub.add_parser("snapshot", help="JSON vs binary snapshot save/load")
+    p.add_argument("--count", type=int, default=1_000_000)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--dir", help="where to write the temporary files (default: system temp)")
+
+    p = sub.add_parser("suite", help="storage, model and render timings at several sizes")
+    p.add_argument("--sizes", type=int, nargs="+", default=list(SUITE_SIZES))
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--format", choices=[".json", BINARY_SUFFIX, ".db"], default=".json",
+                   help="store format (default: %(default)s)")
+    p.add_argument("--out", help="write the results here as JSON")
+    p.add_argument("--baseline", help="results JSON to compare against")
+    p.add_argument("--tolerance", type=float, default=TOLERANCE,
+                   help="allowed slowdown as a fraction (default: %(default)s)")
+    p.add_argument("--no-render", action="store_true", help="skip the TodoApp timings")
+    p.add_argument("--xvfb", action="store_true", help="run the render timings under Xvfb")
+    p.add_argument("--dir", help="where to write the temporary stores (default: system temp)")
+
+    p = sub.add_parser("api", help="local HTTP API throughput and latency")
+    p.add_argument("--requests", type=int, default=20_000)
+    p.add_argument("--connections", type=int, default=16)
+    p.add_argument("--tasks", type=int, default=10_000, help="tasks in the store beforehand")
+    p.add_argument("--queued", action="store_true",
+                   help="apply batches on a polling thread, as inside the window")
+    p.add_argument("--dir", help="where to write the temporary store (default: system temp)")
+
+    args = parser.parse_args(argv)
+    if args.command == "suite":
+        xvfb = start_xvfb() if args.xvfb and not args.no_render else None
+        try:
+            report = bench_suite(args.sizes, args.repeat, args.format, not args.no_render,
+                                 args.dir)
+        finally:
+            if xvfb is not None:
+                xvfb.terminate()
+        report_suite(report)
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+        if args.baseline:
+            with open(args.baseline, encoding="utf-8") as f:
+                regressions = compare(report, json.load(f), args.tolerance)
+            if regressions:
+                print(f"{len(regressions)} regression(s) against {args.baseline}:", file=sys.stderr)
+                for line in regressions:
+                    print("  " + line, file=sys.stderr)
+                sys.exit(1)
+            print(f"no regressions against {args.baseline}")
+    elif args.command == "memory":
+        report_memory(args.count, bench_memory(args.count, args.seed))
+    elif args.command == "snapshot":
+        report_snapshot(args.count, bench_snapshot(args.count, args.seed, args.dir))
+    elif args.command == "api":
+        report_api(bench_api(args.requests, args.connections, args.tasks, args.queued, args.dir),
+                   args.queued)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,467 @@
+"""Headless todo engine: task helpers, bulk import/export and a command line.
+
+Nothing here imports Tk, so scripts and the CLI start instantly:
+
+    python todo_core.py add "Buy milk" "Call Sam" --priority High
+    python todo_core.py add "Pay rent" --due tomorrow --remind "1 hour"
+    python todo_core.py list --due Overdue
+    python todo_core.py move 1718000000001 --before 1718000000000
+    python todo_core.py done 1718000000000 1718000000001
+    python todo_core.py import archive.jsonl
+    python todo_core.py export pending.csv --status Active
+    python todo_core.py convert tasks.json tasks.tdb
+"""
+import argparse
+import csv
+import heapq
+import json
+import re
+import sys
+from datetime import datetime, time, timedelta
+from itertools import islice
+
+from todo_store import (DAY, DUE_FILTERS, RANK_MAX, JournalTaskStore, Priority, Task,
+                        datetime_of, new_id, now_created, open_store, parse_created, parse_when,
+                        rank_between, spread_ranks, stamp_of)
+
+
+# ── Constants ──────────────────────────────────────────────────────────────────
+TASKS_FILE = "tasks.json"
+PRIORITIES = tuple(p.label for p in Priority)
+FIELDS = ("id", "text", "priority", "completed", "created", "due", "remind", "rank")
+
+# A due date without a time means the end of that day
+END_OF_DAY = time(23, 59)
+
+# Records per store write when streaming an import
+IMPORT_BATCH = 5000
+
+
+# ── Data Layer ─────────────────────────────────────────────────────────────────
+def load_tasks(path=TASKS_FILE):
+    store = JournalTaskStore(path)
+    try:
+        return list(store.load())
+    finally:
+        store.close()
+
+
+def save_tasks(tasks, path=TASKS_FILE):
+    store = JournalTaskStore(path)
+    try:
+        store.rewrite(tasks)
+    finally:
+        store.close()
+
+
+def new_task(text, priority=Priority.MEDIUM, due=None, remind=None):
+    return Task(new_id(), text, Priority.parse(priority), due=due, remind=remind)
+
+
+# ── Due Dates ──────────────────────────────────────────────────────────────────
+_LEAD = re.compile(r"^\s*(\d+)\s*(m|min|mins|minutes?|h|hours?|d|days?)\s*(before)?\s*$", re.I)
+
+
+def parse_due(value, now=None):
+    """A due time from user input: "", "today", "tomorrow", "YYYY-MM-DD" or
+    "YYYY-MM-DD HH:MM". Dates alone mean END_OF_DAY. ValueError if unreadable."""
+    value = value.strip()
+    if not value:
+        return None
+    today = datetime_of(now_created() if now is None else now).date()
+    word = value.lower()
+    if word in ("today", "tomorrow"):
+        day = today + timedelta(days=word == "tomorrow")
+        return stamp_of(datetime.combine(day, END_OF_DAY))
+    try:
+        if len(value) == 10:
+            return stamp_of(datetime.combine(datetime.fromisoformat(value).date(), END_OF_DAY))
+        return parse_when(value)
+    except ValueError:
+        raise ValueError(f"unreadable date {value!r} (use YYYY-MM-DD [HH:MM], today or tomorrow)")
+
+
+def parse_remind(value, due):
+    """A reminder time: a lead before `due` ("15 min", "1 hour", "2 days") or an
+    absolute time accepted by parse_due."""
+    match = _LEAD.match(value)
+    if match is None:
+        return parse_due(value)
+    if due is None:
+        raise ValueError("a reminder relative to the due date needs --due")
+    unit = {"m": 60, "h": 3600, "d": 86400}[match.group(2)[0].lower()]
+    return due - int(match.group(1)) * unit * 1_000_000
+
+
+def format_due(due, now=None):
+    """Short label: "Today 17:00", "Tomorrow 09:30", "Oct 20 17:00" or "2025-10-20 17:00"."""
+    now = now_created() if now is None else now
+    moment = datetime_of(due)
+    day = {0: "Today", 1: "Tomorrow", -1: "Yesterday"}.get(due // DAY - now // DAY)
+    if day is None:
+        day = moment.strftime("%b %d" if moment.year == datetime_of(now).year else "%Y-%m-%d")
+    return f"{day} {moment:%H:%M}"
+
+
+class ReminderQueue:
+    """Pending reminder and due times, soonest first, for a single UI timer.
+
+    A min-heap of (time, id, kind) with lazy deletion: rescheduling or cancelling
+    only updates `_current`, and heap entries that no longer match it are
+    dropped when they reach the top. The heap is rebuilt once stale entries
+    outnumber live ones, so it never grows past twice the scheduled count.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._current = {}   # (task id, "remind" | "due") -> time
+
+    def __len__(self):
+        return len(self._current)
+
+    def schedule(self, task, now):
+        """(Re)schedules `task`'s future reminder and due times; past or
+        completed ones are dropped."""
+        for kind, when in (("remind", task.remind), ("due", task.due)):
+            key = (task.id, kind)
+            if when is None or task.completed or when <= now:
+                self._current.pop(key, None)
+            elif self._current.get(key) != when:
+                self._current[key] = when
+                heapq.heappush(self._heap, (when, task.id, kind))
+        if len(self._heap) > 2 * len(self._current) + 64:
+            self._heap = [(when, i, kind) for (i, kind), when in self._current.items()]
+            heapq.heapify(self._heap)
+
+    def cancel(self, task_id):
+        self._current.pop((task_id, "remind"), None)
+        self._current.pop((task_id, "due"), None)
+
+    def next_time(self):
+        heap = self._heap
+        while heap and self._current.get((heap[0][1], heap[0][2])) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def pop_due(self, now):
+        """Removes and returns (task id, kind) for everything due by `now`."""
+        fired = []
+        while True:
+            when = self.next_time()
+            if when is None or when > now:
+                return fired
+            _, task_id, kind = heapq.heappop(self._heap)
+            del self._current[(task_id, kind)]
+            fired.append((task_id, kind))
+
+
+# ── Batched Mutations ──────────────────────────────────────────────────────────
+def add_tasks(store, texts, priority=Priority.MEDIUM, due=None, remind=None):
+    """Create one task per text and persist them as a single write."""
+    tasks = [new_task(text, priority, due, remind) for text in texts]
+    store.put_many(tasks)
+    return tasks
+
+
+def set_completed(store, task_ids, completed=True):
+    """Mark tasks (not) completed as a single write; returns the tasks changed."""
+    changed = []
+    for task_id in task_ids:
+        t = store.get(task_id)
+        if t is not None and t.completed != completed:
+            t.completed = completed
+            changed.append(t)
+    store.put_many(changed)
+    return changed
+
+
+def set_priority(store, task_ids, priority):
+    """Give tasks `priority` as a single write; returns the tasks changed."""
+    priority = Priority.parse(priority)
+    changed = []
+    for task_id in task_ids:
+        t = store.get(task_id)
+        if t is not None and t.priority != priority:
+            t.priority = priority
+            changed.append(t)
+    store.put_many(changed)
+    return changed
+
+
+def delete_tasks(store, task_ids):
+    """Delete the tasks that exist as a single write; returns their ids."""
+    ids = [i for i in task_ids if store.get(i) is not None]
+    store.delete_many(ids)
+    return ids
+
+
+def clear_completed(store):
+    """Delete every completed task as a single write; returns their ids."""
+    ids = store.ids("Completed")
+    store.delete_many(ids)
+    return ids
+
+
+# ── Manual Ordering ────────────────────────────────────────────────────────────
+def move_task(store, task_id, prev_id=None, next_id=None):
+    """Move a task between `prev_id` and `next_id` (None = that end of the list).
+
+    Only the moved task gets a new rank, so this is one single-record write;
+    all ranks are respread (one write of every task) only when the new key
+    would pass RANK_MAX or the neighbours share a rank. Returns the tasks changed.
+    """
+    task = store.get(task_id)
+    if task is None or task_id in (prev_id, next_id):
+        return []
+    prev, nxt = (store.get(i) if i is not None else None for i in (prev_id, next_id))
+    try:
+        rank = rank_between(prev and prev.rank, nxt and nxt.rank)
+    except ValueError:
+        rank = None
+    if rank is not None and len(rank) <= RANK_MAX:
+        task.rank = rank
+        store.put(task)
+        return [task]
+
+    ids = [i for i in store.ids() if i != task_id]
+    if prev is not None:
+        ids.insert(ids.index(prev.id) + 1, task_id)
+    elif nxt is not None:
+        ids.insert(ids.index(nxt.id), task_id)
+    else:
+        ids.append(task_id)
+    return rebalance_ranks(store, ids)
+
+
+def rebalance_ranks(store, ids=None):
+    """Give the tasks `ids` (default: all, in display order) evenly spaced ranks
+    as a single write; returns the tasks."""
+    tasks = [store.get(i) for i in (store.ids() if ids is None else ids)]
+    for t, rank in zip(tasks, spread_ranks(len(tasks))):
+        t.rank = rank
+    store.put_many(tasks)
+    return tasks
+
+
+# ── Streaming Import / Export ──────────────────────────────────────────────────
+def _coerce(row):
+    text = str(row.get("text") or "").strip()
+    if not text:
+        raise ValueError(f"task has no text: {row!r}")
+    priority = Priority.parse(row.get("priority") or "Medium")
+    completed = row.get("completed", False)
+    if isinstance(completed, str):
+        completed = completed.strip().lower() in ("1", "true", "yes", "x")
+
+    task = new_task(text, priority)
+    if row.get("id") not in (None, ""):
+        task.id = int(row["id"])
+    task.completed = bool(completed)
+    if row.get("created"):
+        task.created = parse_created(row["created"])
+    task.due = parse_when(row.get("due") or None)
+    task.remind = parse_when(row.get("remind") or None)
+    task.rank = row.get("rank") or None
+    return task
+
+
+def read_tasks(f, fmt):
+    """Yields tasks from an open JSONL or CSV file, one line at a time."""
+    if fmt == "csv":
+        rows = csv.DictReader(f)
+    else:
+        rows = (json.loads(line) for line in f if line.strip())
+    for row in rows:
+        yield _coerce(row)
+
+
+def write_tasks(f, fmt, tasks):
+    if fmt == "csv":
+        writer = csv.DictWriter(f, fieldnames=FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(t.to_dict() for t in tasks)
+    else:
+        for t in tasks:
+            f.write(json.dumps(t.to_dict(), separators=(",", ":")) + "\n")
+
+
+def import_tasks(store, f, fmt, batch=IMPORT_BATCH):
+    """Streams tasks from `f` into `store`, one store write per `batch` records."""
+    tasks = read_tasks(f, fmt)
+    total = 0
+    while True:
+        chunk = list(islice(tasks, batch))
+        if not chunk:
+            return total
+        store.put_many(chunk)
+        total += len(chunk)
+
+
+def iter_store(store, status="All", priority=None, text="", due=None, batch=IMPORT_BATCH):
+    after = None
+    while True:
+        page = store.page(status, 0, batch, priority, text, due, after=after)
+        yield from page
+        if len(page) < batch:
+            return
+        after = page[-1]
+
+
+def convert(source, target):
+    """Copies every task in store `source` into store `target`; returns the count.
+
+    Formats follow the extensions (see open_store). A journal target is
+    replaced outright; an SQLite target has the tasks merged in.
+    """
+    src = open_store(source)
+    try:
+        src.load()
+        tasks = list(iter_store(src))
+    finally:
+        src.close()
+    dst = open_store(target)
+    try:
+        if isinstance(dst, JournalTaskStore):
+            dst.rewrite(tasks)
+        else:
+            dst.put_many(tasks)
+    finally:
+        dst.close()
+    return len(tasks)
+
+
+def _format_for(path, fmt):
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+# ── Command Line ───────────────────────────────────────────────────────────────
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="todo", description="Headless todo list.")
+    parser.add_argument("--file", default=TASKS_FILE,
+                        help="task store (.json journal, .tdb binary journal or .db SQLite, "
+                             "default: %(default)s)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("list", help="print tasks")
+    p.add_argument("--status", choices=["All", "Active", "Completed"], default="All")
+    p.add_argument("--priority", choices=PRIORITIES)
+    p.add_argument("--search", default="", help="words (or word prefixes) the text must contain")
+    p.add_argument("--due", choices=DUE_FILTERS)
+
+    sub.add_parser("stats", help="print total/completed/pending counts")
+
+    p = sub.add_parser("add", help="add one task per argument")
+    p.add_argument("texts", nargs="+")
+    p.add_argument("--priority", choices=PRIORITIES, default="Medium")
+    p.add_argument("--due", default="", help="YYYY-MM-DD [HH:MM], today or tomorrow")
+    p.add_argument("--remind", default="",
+                   help="lead before the due time (\"15 min\", \"1 hour\") or a time like --due")
+
+    for name, text in (("done", "mark tasks completed"), ("undo", "mark tasks active"),
+                       ("delete", "delete tasks")):
+        p = sub.add_parser(name, help=text)
+        p.add_argument("ids", nargs="+", type=int)
+
+    p = sub.add_parser("prioritize", help="set the priority of tasks")
+    p.add_argument("priority", choices=PRIORITIES)
+    p.add_argument("ids", nargs="+", type=int)
+
+    sub.add_parser("clear", help="delete every completed task")
+
+    p = sub.add_parser("move", help="move a task to another place in the list")
+    p.add_argument("id", type=int)
+    where = p.add_mutually_exclusive_group(required=True)
+    where.add_argument("--before", type=int, metavar="ID")
+    where.add_argument("--after", type=int, metavar="ID")
+    where.add_argument("--top", action="store_true")
+    where.add_argument("--bottom", action="store_true")
+
+    p = sub.add_parser("import", help="stream tasks in from JSONL or CSV ('-' = stdin)")
+    p.add_argument("source")
+    p.add_argument("--format", choices=["jsonl", "csv"])
+
+    p = sub.add_parser("export", help="stream tasks out as JSONL or CSV ('-' = stdout)")
+    p.add_argument("target")
+    p.add_argument("--format", choices=["jsonl", "csv"])
+    p.add_argument("--status", choices=["All", "Active", "Completed"], default="All")
+
+    p = sub.add_parser("convert", help="copy a whole store into another format "
+                                       "(e.g. tasks.json -> tasks.tdb)")
+    p.add_argument("source")
+    p.add_argument("target")
+
+    args = parser.parse_args(argv)
+    if args.command == "convert":
+        try:
+            print(f"{convert(args.source, args.target)} task(s) converted")
+        except (OSError, ValueError) as exc:
+            parser.exit(1, f"todo: {exc}\n")
+        return
+    if getattr(args, "priority", None):
+        args.priority = Priority.parse(args.priority)
+    store = open_store(args.file)
+    try:
+        store.load()
+        if args.command == "list":
+            now = now_created()
+            for t in iter_store(store, args.status, args.priority, args.search, args.due):
+                mark = "x" if t.completed else " "
+                due = f"  (due {format_due(t.due, now)})" if t.due is not None else ""
+                print(f"[{mark}] {t.id}  {t.priority.label:<6}  {t.text}{due}")
+        elif args.command == "stats":
+            total, done = store.stats()
+            print(f"total {total}  completed {done}  pending {total - done}")
+        elif args.command == "add":
+            due = parse_due(args.due)
+            remind = parse_remind(args.remind, due) if args.remind.strip() else None
+            for t in add_tasks(store, args.texts, args.priority, due, remind):
+                print(t.id)
+        elif args.command in ("done", "undo"):
+            changed = set_completed(store, args.ids, args.command == "done")
+            print(f"{len(changed)} task(s) updated")
+        elif args.command == "prioritize":
+            changed = set_priority(store, args.ids, args.priority)
+            print(f"{len(changed)} task(s) updated")
+        elif args.command == "delete":
+            print(f"{len(delete_tasks(store, args.ids))} task(s) deleted")
+        elif args.command == "clear":
+            print(f"{len(clear_completed(store))} task(s) deleted")
+        elif args.command == "move":
+            order = [i for i in store.ids() if i != args.id]
+            anchor = args.before if args.before is not None else args.after
+            if anchor is not None and anchor not in order:
+                raise ValueError(f"no task {anchor}")
+            if args.top:
+                at = 0
+            elif args.bottom:
+                at = len(order)
+            else:
+                at = order.index(anchor) + (args.after is not None)
+            changed = move_task(store, args.id, order[at - 1] if at else None,
+                                order[at] if at < len(order) else None)
+            print(f"{len(changed)} task(s) updated")
+        elif args.command == "import":
+            fmt = _format_for(args.source, args.format)
+            if args.source == "-":
+                count = import_tasks(store, sys.stdin, fmt)
+            else:
+                with open(args.source, newline="", encoding="utf-8") as f:
+                    count = import_tasks(store, f, fmt)
+            print(f"{count} task(s) imported")
+        elif args.command == "export":
+            fmt = _format_for(args.target, args.format)
+            if args.target == "-":
+                write_tasks(sys.stdout, fmt, iter_store(store, args.status))
+            else:
+                with open(args.target, "w", newline="", encoding="utf-8") as f:
+                    write_tasks(f, fmt, iter_store(store, args.status))
+    except (OSError, ValueError) as exc:
+        parser.exit(1, f"todo: {exc}\n")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Timing spans for the todo app's hot paths.
+
+Off by default. Enabled, instrument() swaps the named functions for timed
+wrappers; left off, nothing is wrapped, so the normal path costs nothing
+at all. Turn it on for the window with
+
+    python todo.py tasks.json --profile [--profile-out samples.csv]
+
+then press F12 for the p50/p95/max overlay. Samples are kept per span
+(the newest MAX_SAMPLES of each) and can be exported as CSV or JSON.
+"""
+import csv
+import functools
+import json
+import threading
+import time
+from collections import deque
+
+
+# ── Constants ──────────────────────────────────────────────────────────────────
+MAX_SAMPLES = 100_000   # per span; older samples are dropped first
+
+
+class Profiler:
+    def __init__(self):
+        self.samples = {}   # span name -> deque of (start, seconds), start relative to t0
+        self.t0 = time.perf_counter()
+        self._patched = []  # (owner, attribute, original) for each wrapped function
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return bool(self._patched)
+
+    def record(self, name, start, seconds):
+        # Called from the Tk, loader and write-behind threads alike.
+        samples = self.samples.get(name)
+        if samples is None:
+            with self._lock:
+                samples = self.samples.setdefault(name, deque(maxlen=MAX_SAMPLES))
+        samples.append((start - self.t0, seconds))
+
+    def span(self, name):
+        """Context manager timing one block under `name`; a no-op while
+        nothing is instrumented, like the rest of the profiler."""
+        return _Span(self, name) if self._patched else _NO_SPAN
+
+    def instrument(self, owner, names):
+        """Time every call to owner.<name> (a class or module) from now on,
+        as span "<Owner>.<name>". Static methods stay static."""
+        label = getattr(owner, "__name__", type(owner).__name__)
+        for name in names:
+            original = vars(owner)[name]
+            func = original.__func__ if isinstance(original, staticmethod) else original
+            wrapped = self._timed(f"{label}.{name}", func)
+            setattr(owner, name, staticmethod(wrapped) if isinstance(original, staticmethod)
+                    else wrapped)
+            self._patched.append((owner, name, original))
+
+    def _timed(self, span, func):
+        record, clock = self.record, time.perf_counter
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(span, start, clock() - start)
+        return timed
+
+    # ── Reporting ──────────────────────────────────────────────────────────────
+    def summary(self):
+        """{span: {"count", "total", "p50", "p95", "max"}} in seconds, busiest first."""
+        rows = {}
+        for name, samples in list(self.samples.items()):
+            times = sorted(seconds for _, seconds in list(samples))
+            if times:
+                rows[name] = {"count": len(times), "total": sum(times),
+                              "p50": _percentile(times, 0.50), "p95": _percentile(times, 0.95),
+                              "max": times[-1]}
+        return dict(sorted(rows.items(), key=lambda item: -item[1]["total"]))
+
+    def format_summary(self, limit=None):
+        lines = [f"{'span':<32} {'n':>7} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}"]
+        for name, r in list(self.summary().items())[:limit]:
+            lines.append(f"{name[-32:]:<32} {r['count']:>7} {r['p50'] * 1000:>8.2f} "
+                         f"{r['p95'] * 1000:>8.2f} {r['max'] * 1000:>8.2f}")
+        return "\n".join(lines)
+
+    def export(self, path):
+        """Write the raw samples: CSV (span,start,seconds) when path ends in
+        .csv, otherwise JSON with the summary alongside."""
+        rows = [(name, start, seconds) for name, samples in list(self.samples.items())
+                for start, seconds in list(samples)]
+        rows.sort(key=lambda row: row[1])
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            if path.lower().endswith(".csv"):
+                writer = csv.writer(f)
+                writer.writerow(("span", "start", "seconds"))
+                writer.writerows(rows)
+            else:
+                json.dump({"summary": self.summary(), "samples": rows}, f)
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler, self.name = profiler, name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter() - self.start)
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def format_counters(label, counters):
+    """One overlay line for a component's counters() dict."""
+    return f"{label}: " + "  ".join(f"{name} {value:,}" for name, value in counters.items())
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+# The app's one profiler
+PROFILER = Profiler()
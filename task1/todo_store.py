@@ -0,0 +1,1854 @@
+import bisect
+import enum
+import gc
+import json
+import mmap
+import os
+import random
+import re
+import sqlite3
+import struct
+import sys
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from itertools import accumulate, repeat
+from operator import attrgetter
+
+try:
+    import fcntl
+except ImportError:   # Windows
+    fcntl = None
+    import msvcrt
+
+
+# Status filter name -> required value of Task.completed (None = any)
+STATUS_FILTERS = {"All": None, "Active": False, "Completed": True}
+
+# Due-date filters: pending tasks past their due time / tasks due today
+DUE_FILTERS = ("Overdue", "Due today")
+
+
+# ── Task Records ───────────────────────────────────────────────────────────────
+class Priority(enum.IntEnum):
+    HIGH = 0
+    MEDIUM = 1
+    LOW = 2
+
+    @property
+    def label(self):
+        return _PRIORITY_LABELS[self]
+
+    @classmethod
+    def parse(cls, value, default=None):
+        """A Priority from a member or its label ("High"). Anything else is
+        `default`, or a ValueError when no default is given."""
+        priority = _PRIORITY_BY_LABEL.get(value)
+        if priority is not None:
+            return priority
+        if isinstance(value, cls):
+            return value
+        try:
+            return cls[str(value).upper()]
+        except KeyError:
+            if default is not None:
+                return default
+            raise ValueError(f"unknown priority {value!r}") from None
+
+
+# Label lookups are on every load and save, so skip the enum machinery
+_PRIORITY_LABELS = {p: p.name.title() for p in Priority}
+_PRIORITY_BY_LABEL = {label: p for p, label in _PRIORITY_LABELS.items()}
+
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+DAY = 86_400_000_000   # microseconds
+
+
+def stamp_of(moment):
+    """A naive datetime as integer microseconds since 1970 (the Task time scale)."""
+    return (moment - _EPOCH) // _MICROSECOND
+
+
+def datetime_of(stamp):
+    return _EPOCH + stamp * _MICROSECOND
+
+
+def now_created():
+    return stamp_of(datetime.now())
+
+
+def parse_created(value):
+    """Microseconds since 1970 (local wall clock) for an ISO `created` string.
+
+    Strings that are not naive ISO timestamps are kept as they are, so
+    hand-edited files still round-trip unchanged.
+    """
+    try:
+        stamp = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return value
+    if stamp.tzinfo is not None:
+        return value
+    return (stamp - _EPOCH) // _MICROSECOND
+
+
+def format_created(created):
+    if isinstance(created, int):
+        return datetime_of(created).isoformat()
+    return created
+
+
+def parse_when(value):
+    """A `due`/`remind` value from JSON: None, or a naive ISO timestamp (ValueError otherwise)."""
+    if value is None or isinstance(value, int):
+        return value
+    stamp = datetime.fromisoformat(value)
+    if stamp.tzinfo is not None:
+        raise ValueError(f"expected a local time, got {value!r}")
+    return stamp_of(stamp)
+
+
+class Task:
+    """One todo item, in roughly a third of the memory of the equivalent dict.
+
+    `priority` is a Priority and `created` an integer (see parse_created);
+    `to_dict`/`from_dict` convert to and from the tasks.json schema, where
+    both are strings. `due` and `remind` are optional times on the same
+    scale; they are left out of the JSON when unset, so files without
+    them read and write exactly as before. `rank` is the task's position
+    key (see rank_between); None until a TaskModel or store places it.
+    """
+
+    __slots__ = ("id", "text", "priority", "completed", "created", "due", "remind", "rank")
+
+    def __init__(self, id, text, priority=Priority.MEDIUM, completed=False, created=None,
+                 due=None, remind=None, rank=None):
+        self.id = id
+        self.text = text
+        self.priority = priority
+        self.completed = completed
+        self.created = now_created() if created is None else created
+        self.due = due
+        self.remind = remind
+        self.rank = rank
+
+    @classmethod
+    def from_dict(cls, d):
+        # A missing priority reads as Medium; an unknown label is a ValueError,
+        # so loaders keep the record as it is instead of rewriting its label.
+        priority = d.get("priority")
+        priority = Priority.MEDIUM if priority is None else Priority.parse(priority)
+        return cls(d["id"], d["text"], priority,
+                   bool(d["completed"]), parse_created(d["created"]),
+                   parse_when(d.get("due")), parse_when(d.get("remind")), d.get("rank"))
+
+    def to_dict(self):
+        d = {"id": self.id, "text": self.text, "priority": self.priority.label,
+             "completed": self.completed, "created": format_created(self.created)}
+        if self.due is not None:
+            d["due"] = datetime_of(self.due).isoformat()
+        if self.remind is not None:
+            d["remind"] = datetime_of(self.remind).isoformat()
+        if self.rank is not None:
+            d["rank"] = self.rank
+        return d
+
+    def copy(self):
+        return Task(self.id, self.text, self.priority, self.completed, self.created,
+                    self.due, self.remind, self.rank)
+
+    def _fields(self):
+        return (self.id, self.text, self.priority, self.completed, self.created,
+                self.due, self.remind, self.rank)
+
+    def __eq__(self, other):
+        if not isinstance(other, Task):
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return (f"Task(id={self.id!r}, text={self.text!r}, priority={self.priority.label}, "
+                f"completed={self.completed!r}, created={format_created(self.created)!r}, "
+                f"due={self.due!r}, remind={self.remind!r}, rank={self.rank!r})")
+
+
+# ── Task Ids ───────────────────────────────────────────────────────────────────
+class IdAllocator:
+    """Strictly increasing 63-bit ids: milliseconds | node | sequence.
+
+    Up to 256 ids per millisecond per allocator; beyond that it borrows the
+    next millisecond instead of repeating itself, so bulk creation never
+    collides. The 14-bit node is random, which keeps two app instances (or
+    a script and the GUI) writing the same store from minting the same id;
+    the module's allocator draws a new one in every forked child, since a
+    child would otherwise carry on with its parent's. Ids are far above the
+    millisecond timestamps older versions used, so they never clash with
+    those either.
+    """
+
+    EPOCH_MS = 1577836800000   # 2020-01-01 UTC
+    NODE_BITS = 14
+    SEQ_BITS = 8
+
+    def __init__(self, node=None):
+        if node is None:
+            node = random.SystemRandom().getrandbits(self.NODE_BITS)
+        self.node = node & ((1 << self.NODE_BITS) - 1)
+        self._last_ms = 0
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def reseed(self):
+        """Switch to a fresh random node, never the current one (for a forked child)."""
+        node = self.node
+        while node == self.node:
+            node = random.SystemRandom().getrandbits(self.NODE_BITS)
+        self.node = node
+        self._lock = threading.Lock()   # another thread may have held it at fork time
+
+    def next(self):
+        with self._lock:
+            now = int(time.time() * 1000) - self.EPOCH_MS
+            if now > self._last_ms:
+                self._last_ms, self._seq = now, 0
+            else:
+                self._seq += 1
+                if self._seq >> self.SEQ_BITS:
+                    self._last_ms, self._seq = self._last_ms + 1, 0
+            return ((self._last_ms << (self.NODE_BITS + self.SEQ_BITS))
+                    | (self.node << self.SEQ_BITS) | self._seq)
+
+
+_ids = IdAllocator()
+new_id = _ids.next
+if hasattr(os, "register_at_fork"):   # not on Windows, which cannot fork
+    os.register_at_fork(after_in_child=_ids.reseed)
+
+
+def dedupe_ids(tasks, seen=None):
+    """Give every task after the first with a repeated id a fresh id. Returns the count.
+
+    Pass the same `seen` set across calls to dedupe a stream of batches.
+    """
+    seen = set() if seen is None else seen
+    fixed = 0
+    for t in tasks:
+        if t.id in seen:
+            t.id = new_id()
+            fixed += 1
+        seen.add(t.id)
+    return fixed
+
+
+# ── Rank Keys ──────────────────────────────────────────────────────────────────
+# Display order is the sort order of each task's rank: a string of base-62
+# digits read as a fraction (0.<digits>), with no trailing "0" so that a key
+# never collides with a shorter one. There is always a key strictly between
+# two others, so moving a task rewrites that task alone. Appending counts up
+# at RANK_WIDTH digits, which leaves room for hundreds of millions of tasks;
+# only repeated moves into the same gap make keys longer, and once one
+# would pass RANK_MAX characters the caller respreads every key.
+RANK_DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+RANK_WIDTH = 5
+RANK_MAX = 32
+_RANK_VALUE = {c: i for i, c in enumerate(RANK_DIGITS)}
+
+
+def _rank_int(rank, width):
+    value = 0
+    for c in rank.ljust(width, "0"):
+        value = value * 62 + _RANK_VALUE[c]
+    return value
+
+
+def _rank_str(value, width):
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, 62)
+        digits.append(RANK_DIGITS[digit])
+    return "".join(reversed(digits)).rstrip("0")
+
+
+def rank_between(lo=None, hi=None):
+    """A rank sorting strictly after `lo` and before `hi` (None = open end).
+
+    ValueError unless lo < hi.
+    """
+    if lo is not None and hi is not None and not lo < hi:
+        raise ValueError(f"no rank between {lo!r} and {hi!r}")
+    if hi is None and lo:
+        # Appending is the common case (every new task): bump the last digit
+        # that is not "z" and drop the ones after it, without integer math.
+        padded = lo.ljust(RANK_WIDTH, "0")
+        last = len(padded.rstrip("z")) - 1
+        if last >= 0:
+            return padded[:last] + RANK_DIGITS[_RANK_VALUE[padded[last]] + 1]
+    width = max(RANK_WIDTH, len(lo or ""), len(hi or ""))
+    low = _rank_int(lo, width) if lo is not None else None
+    high = _rank_int(hi, width) if hi is not None else None
+    if high is not None and low is None and high > 1:
+        return _rank_str(high - 1, width)  # prepend: count down
+    low = low or 0
+    high = 62 ** width if high is None else high
+    while high - low < 2:
+        width += 1
+        low, high = low * 62, high * 62
+    return _rank_str((low + high) // 2, width)
+
+
+def spread_ranks(count):
+    """`count` evenly spaced, increasing ranks, for a rebalance."""
+    width = RANK_WIDTH
+    while 62 ** width < 64 * (count + 1):
+        width += 1
+    step = 62 ** width // (count + 1)
+    return [_rank_str(step * (i + 1), width) for i in range(count)]
+
+
+# ── Snapshot Files ─────────────────────────────────────────────────────────────
+LOAD_BATCH = 2000
+BINARY_SUFFIX = ".tdb"
+_SEPARATORS = re.compile(r"[\s,]*")
+
+
+def iter_snapshot(path, batch=LOAD_BATCH, chunk=1 << 16, skipped=None):
+    """Yields the Tasks of a snapshot in lists of `batch`.
+
+    JSON-array files are read in chunks and decoded one element at a time,
+    so the first tasks are available long before a large file is fully
+    parsed. Elements that are not tasks are skipped and the rest still
+    load; where the JSON itself is malformed, reading stops. Either way
+    nothing is lost if `skipped` is a list: it receives each skipped
+    element as decoded, and a malformed remainder as its raw text. Paths
+    ending in BINARY_SUFFIX are read as a BinarySnapshot. A missing file
+    yields nothing.
+    """
+    if not os.path.exists(path):
+        return
+    if path.endswith(BINARY_SUFFIX):
+        with BinarySnapshot(path) as snapshot:
+            tasks = snapshot.tasks()
+        for i in range(0, len(tasks), batch):
+            yield tasks[i:i + batch]
+        return
+    decoder = json.JSONDecoder()
+    out = []
+    with open(path, "r") as f:
+        buf = f.read(chunk).lstrip()
+        eof = not buf
+        if not buf.startswith("["):
+            return
+        pos = 1
+        while True:
+            pos = _SEPARATORS.match(buf, pos).end()
+            if pos == len(buf) and not eof:
+                buf, pos = f.read(chunk), 0
+                eof = not buf
+                continue
+            if pos == len(buf) or buf[pos] == "]":
+                break
+            try:
+                task, pos = decoder.raw_decode(buf, pos)
+            except ValueError:
+                if eof:
+                    if skipped is not None:
+                        skipped.append(buf[pos:])
+                    break
+                more = f.read(chunk)
+                buf, pos, eof = buf[pos:] + more, 0, not more
+                continue
+            try:
+                out.append(Task.from_dict(task))
+            except (AttributeError, KeyError, TypeError, ValueError):
+                if skipped is not None:
+                    skipped.append(task)
+                continue
+            if len(out) >= batch:
+                yield out
+                out = []
+    if out:
+        yield out
+
+
+def write_snapshot(path, tasks, extra=()):
+    """Atomically replace `path` with `tasks`: write a temp file, fsync it, rename over.
+
+    `extra` are JSON values written after the tasks, as they are (the
+    elements iter_snapshot skipped); a binary snapshot has no room for them.
+    """
+    tmp = path + ".tmp"
+    binary = path.endswith(BINARY_SUFFIX)
+    with open(tmp, "wb" if binary else "w") as f:
+        if binary:
+            write_binary_snapshot(f, tasks)
+        else:
+            json.dump([t.to_dict() for t in tasks] + list(extra), f, separators=(",", ":"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    _fsync_dir(path)
+
+
+def _fsync_dir(path):
+    # Makes the rename itself durable; not possible on every platform.
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+# ── Binary Snapshots ───────────────────────────────────────────────────────────
+_HEADER = struct.Struct("<4sIQQ")
+_MAGIC = b"TDB1"
+_HAS_NUL = 1          # header flags: some string contains NUL, so split by offsets;
+_HAS_TIMES = 2        # the due/remind columns are present
+_HAS_RANKS = 4        # task ranks follow the texts in the string table
+_CREATED_STR = 1      # per-task flag bits: `created` is a string index
+_COMPLETED = 2
+_NO_TIME = -1 << 63   # due/remind column value for None
+_COMPLETED_BITS = bytes((b & 1) * _COMPLETED for b in range(256))   # 0/1 -> flag bit
+_COMPLETED_OF = bytes(int(bool(b & _COMPLETED)) for b in range(256))  # flags -> 0/1
+_PRIORITIES = tuple(Priority)
+(_get_id, _get_text, _get_priority, _get_completed, _get_created, _get_due, _get_remind,
+ _get_rank) = (attrgetter(name) for name in Task.__slots__)
+_order_key = attrgetter("rank", "id")   # display order, as in TaskModel.order
+
+
+def _time_column(values):
+    return array("q", [_NO_TIME if v is None else v for v in values])
+
+
+def _times(column):
+    return [None if v == _NO_TIME else v for v in column]
+
+
+@contextmanager
+def _gc_paused():
+    # Allocating millions of records otherwise triggers repeated full
+    # collections that cost more than building the records themselves.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _column_bytes(column):
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def write_binary_snapshot(f, tasks):
+    """Write `tasks` to the open binary file `f` in the BinarySnapshot layout."""
+    # Column at a time through map/attrgetter, so the per-task work stays in C.
+    tasks = list(tasks)
+    strings = list(map(_get_text, tasks))
+    created = list(map(_get_created, tasks))
+    bits = bytearray(bytes(map(_get_completed, tasks)).translate(_COMPLETED_BITS))
+    due = list(map(_get_due, tasks))
+    remind = list(map(_get_remind, tasks))
+    times = due.count(None) < len(tasks) or remind.count(None) < len(tasks)
+    ranks = list(map(_get_rank, tasks))
+    if ranks.count(None) < len(tasks):
+        strings.extend(r or "" for r in ranks)
+    else:
+        ranks = None
+    try:
+        ids = array("q", map(_get_id, tasks))
+        try:
+            created = array("q", created)
+        except TypeError:
+            # Verbatim `created` strings go to the string table, each stored once.
+            table = {}
+            for i, c in enumerate(created):
+                if isinstance(c, str):
+                    created[i] = table.setdefault(c, len(strings) + len(table))
+                    bits[i] |= _CREATED_STR
+            strings.extend(table)
+            created = array("q", created)
+        if times:
+            due, remind = _time_column(due), _time_column(remind)
+    except OverflowError as exc:
+        raise ValueError(f"task does not fit a binary snapshot: {exc}") from None
+    priority = bytes(map(_get_priority, tasks))
+
+    joined = "\0".join(strings)
+    flags = 0
+    if joined.count("\0") > max(len(strings) - 1, 0):
+        flags |= _HAS_NUL
+    if times:
+        flags |= _HAS_TIMES
+    if ranks is not None:
+        flags |= _HAS_RANKS
+    lengths = map(len, strings if joined.isascii() else map(str.encode, strings))
+    offsets = array("Q", accumulate(lengths, initial=0))
+
+    f.write(_HEADER.pack(_MAGIC, flags, len(tasks), len(strings)))
+    f.write(_column_bytes(ids))
+    f.write(_column_bytes(created))
+    if times:
+        f.write(_column_bytes(due))
+        f.write(_column_bytes(remind))
+    f.write(priority)
+    f.write(bits)
+    f.write(_column_bytes(offsets))
+    f.write(joined.encode())
+
+
+class BinarySnapshot:
+    """Read-only, memory-mapped view of a binary snapshot file.
+
+    Layout (little-endian), one column per field:
+
+        header    magic "TDB1", flags u32, task count n u64, string count u64
+        ids       i64 per task
+        created   i64 per task: microseconds, or a string index (flag bit 0)
+        due       i64 per task, INT64_MIN for none  } only with header flag
+        remind    i64 per task, likewise            } bit 1 (_HAS_TIMES)
+        priority  u8 per task
+        flags     u8 per task: bit 0 created is a string, bit 1 completed
+        offsets   u64 per string, plus one: running byte length of the strings
+        strings   UTF-8, separated by NUL bytes
+
+    String i starts at byte offsets[i] + i (skipping the separators). The
+    first n strings are the task texts in task order; with header flag bit 2
+    (_HAS_RANKS) the next n are the task ranks ("" for none); after them
+    come the distinct verbatim `created` values. Indexing decodes one task and its
+    text straight from the map; `tasks()` materializes everything with
+    one decode of the whole string table.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < _HEADER.size:
+                raise ValueError(f"{path}: not a task snapshot")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, self.flags, self.count, self.string_count = _HEADER.unpack_from(self._map)
+            ranks = self.count if self.flags & _HAS_RANKS else 0
+            if magic != _MAGIC or self.string_count < self.count + ranks:
+                raise ValueError(f"{path}: not a task snapshot")
+            n = self.count
+            self._ids = _HEADER.size
+            self._created = self._ids + 8 * n
+            self._due = self._created + 8 * n
+            self._remind = self._due + 8 * n
+            self._priority = self._remind + 8 * n if self.flags & _HAS_TIMES else self._due
+            self._bits = self._priority + n
+            self._offsets = self._bits + n
+            self._strings = self._offsets + 8 * (self.string_count + 1)
+            if (self._strings > len(self._map) or self._strings + self._offset(self.string_count)
+                    + max(self.string_count - 1, 0) > len(self._map)):
+                raise ValueError(f"{path}: truncated task snapshot")
+        except Exception:
+            self._map.close()
+            raise
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._map.close()
+
+    def _offset(self, i):
+        return struct.unpack_from("<Q", self._map, self._offsets + 8 * i)[0]
+
+    def string(self, i):
+        if not 0 <= i < self.string_count:
+            raise ValueError(f"string index {i} out of range")
+        start, end = struct.unpack_from("<QQ", self._map, self._offsets + 8 * i)
+        return self._map[self._strings + start + i:self._strings + end + i].decode()
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("snapshot index out of range")
+        m = self._map
+        task_id, = struct.unpack_from("<q", m, self._ids + 8 * i)
+        created, = struct.unpack_from("<q", m, self._created + 8 * i)
+        bits = m[self._bits + i]
+        if bits & _CREATED_STR:
+            created = self.string(created)
+        due = remind = None
+        if self.flags & _HAS_TIMES:
+            due, remind = _times(struct.unpack_from("<q", m, start)[0]
+                                 for start in (self._due + 8 * i, self._remind + 8 * i))
+        rank = self.string(self.count + i) or None if self.flags & _HAS_RANKS else None
+        return Task(task_id, self.string(i), _PRIORITIES[m[self._priority + i]],
+                    bool(bits & _COMPLETED), created, due, remind, rank)
+
+    def _column(self, typecode, start, size):
+        column = array(typecode)
+        column.frombytes(self._map[start:start + column.itemsize * size])
+        if sys.byteorder == "big":
+            column.byteswap()
+        return column
+
+    def strings(self):
+        if not self.string_count:
+            return []
+        if self.flags & _HAS_NUL:
+            return [self.string(i) for i in range(self.string_count)]
+        end = self._strings + self._offset(self.string_count) + self.string_count - 1
+        strings = self._map[self._strings:end].decode().split("\0")
+        if len(strings) != self.string_count:
+            raise ValueError("corrupt task snapshot")
+        return strings
+
+    def tasks(self):
+        """Every task, as a list."""
+        n = self.count
+        strings = self.strings()
+        bits = self._map[self._bits:self._bits + n]
+        try:
+            priority = list(map(_PRIORITIES.__getitem__, self._map[self._priority:self._bits]))
+            created = self._column("q", self._created, n)
+            if any(b & _CREATED_STR for b in bits):
+                created = [strings[c] if b & _CREATED_STR else c for c, b in zip(created, bits)]
+        except IndexError:
+            raise ValueError("corrupt task snapshot") from None
+        if self.flags & _HAS_TIMES:
+            due = _times(self._column("q", self._due, n))
+            remind = _times(self._column("q", self._remind, n))
+        else:
+            due = remind = repeat(None)
+        if self.flags & _HAS_RANKS:
+            ranks = strings[n:2 * n]
+            if "" in ranks:
+                ranks = [r or None for r in ranks]
+        else:
+            ranks = repeat(None)
+        with _gc_paused():
+            return list(map(Task, self._column("q", self._ids, n), strings[:n], priority,
+                            map(bool, bits.translate(_COMPLETED_OF)), created, due, remind,
+                            ranks))
+
+
+
+# ── Store Interface ────────────────────────────────────────────────────────────
+class TaskStore:
+    """Interface shared by the todo backends. Tasks travel as Task records.
+
+    A task returned by a store may be the store's own copy: mutate it and
+    hand it back to `put` to save the change.
+    """
+
+    def load(self):
+        raise NotImplementedError
+
+    def get(self, task_id):
+        raise NotImplementedError
+
+    def put(self, task):
+        """Insert `task`, or replace the stored task with the same id."""
+        raise NotImplementedError
+
+    def delete(self, task_id):
+        raise NotImplementedError
+
+    def put_many(self, tasks):
+        """Like `put` for every task, persisted as one batch where the backend can."""
+        for t in tasks:
+            self.put(t)
+
+    def delete_many(self, task_ids):
+        for task_id in task_ids:
+            self.delete(task_id)
+
+    def count(self, status="All", priority=None, text="", due=None):
+        raise NotImplementedError
+
+    def stats(self):
+        """Returns (total, completed)."""
+        raise NotImplementedError
+
+    def page(self, status="All", offset=0, limit=None, priority=None, text="", due=None,
+             after=None):
+        """Tasks passing the filters, in display order, sliced to [offset, offset+limit).
+
+        `priority` restricts to one Priority; `text` keeps tasks containing a
+        word starting with each word of the query; `due` is one of DUE_FILTERS.
+        With `after` (a task from the previous page) the slice starts past it
+        instead of at the start, so walking a whole store costs O(n), not O(n²).
+        """
+        raise NotImplementedError
+
+    def ids(self, status="All", priority=None, text="", due=None):
+        """Ids of the tasks `page` would return, in the same order."""
+        return [t.id for t in self.page(status, priority=priority, text=text, due=due)]
+
+    def scheduled(self):
+        """Every task with a due or reminder time."""
+        raise NotImplementedError
+
+    def poll_changes(self):
+        """Picks up writes other processes made to the same store.
+
+        Returns the set of task ids they added, changed or deleted (empty if
+        none), or None when the store cannot tell which and callers should
+        treat everything as changed.
+        """
+        return set()
+
+    def flush(self):
+        """Block until every accepted write is on disk."""
+
+    def close(self):
+        pass
+
+
+def open_store(path, write_behind=False):
+    """SQLite for .db/.sqlite/.sqlite3 paths, else a journal (binary snapshot for .tdb)."""
+    if path.endswith((".db", ".sqlite", ".sqlite3")):
+        return SQLiteTaskStore(path)
+    return JournalTaskStore(path, write_behind=write_behind)
+
+
+# ── Write-Behind Worker ────────────────────────────────────────────────────────
+class WriteBehind:
+    """Moves persistence off the calling thread.
+
+    `submit` only records the latest write per key and returns immediately.
+    The worker thread waits until `debounce` seconds after the first pending
+    write, then hands everything collected so far to `write(records)` in one
+    call — so a burst of clicks becomes one disk write, and no write waits
+    longer than the window. `flush` and `close` block until nothing is pending.
+    """
+
+    DEBOUNCE = 0.25
+
+    def __init__(self, write, debounce=DEBOUNCE):
+        self.write = write
+        self.debounce = debounce
+        self.requested = 0    # writes submitted
+        self.written = 0      # records actually handed to `write`
+        self.flushes = 0      # calls to `write`
+        self.failures = 0     # calls to `write` that raised
+        self.error = None     # last exception raised by `write`
+        self._pending = {}    # key -> record, latest wins
+        self._inflight = ()   # keys of the batch being written
+        self._busy = False
+        self._flush_now = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="todo-write-behind",
+                                        daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    def pending_keys(self):
+        """Keys submitted but not yet written, including the batch in flight."""
+        with self._cond:
+            return self._pending.keys() | self._inflight
+
+    def counters(self):
+        return {"requested": self.requested, "written": self.written,
+                "flushes": self.flushes, "failures": self.failures,
+                "pending": self.pending}
+
+    def submit(self, key, record):
+        self.submit_many([(key, record)])
+
+    def submit_many(self, items):
+        with self._cond:
+            for key, record in items:
+                self._pending[key] = record
+                self.requested += 1
+            self._cond.notify_all()
+
+    def flush(self):
+        with self._cond:
+            failures = self.failures
+            self._flush_now = True
+            self._cond.notify_all()
+            # Gives up after a failed write rather than blocking forever.
+            while (self._pending or self._busy) and self.failures == failures:
+                self._cond.wait()
+
+    def close(self):
+        self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._flush_now = False
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                deadline = time.monotonic() + self.debounce
+                while not (self._closed or self._flush_now):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._pending
+                self._pending = {}
+                self._inflight = batch.keys()
+                self._busy = True
+
+            try:
+                self.write(list(batch.values()))
+            except Exception as exc:
+                self.error = exc
+                with self._cond:
+                    self.failures += 1
+                    # Keep anything newer that arrived meanwhile; retry after the next window.
+                    batch.update(self._pending)
+                    self._pending = batch
+                    self._flush_now = False
+            else:
+                self.flushes += 1
+                self.written += len(batch)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._inflight = ()
+                    self._cond.notify_all()
+
+
+# ── Search Index ───────────────────────────────────────────────────────────────
+def tokenize(text):
+    return re.findall(r"\w+", text.lower())
+
+
+class SearchIndex:
+    """Inverted index from words to task ids, with prefix lookup.
+
+    Only whole words are posted; prefixes are answered by bisecting a sorted
+    vocabulary, which keeps memory proportional to the text rather than to
+    every prefix of it.
+    """
+
+    def __init__(self):
+        self.postings = {}    # word -> set of task ids
+        self.words_of = {}    # task id -> frozenset of its words
+        self._vocab = None    # sorted words; rebuilt lazily after bulk loads
+
+    def update(self, task_id, text):
+        new = frozenset(tokenize(text))
+        old = self.words_of.get(task_id, frozenset())
+        if new == old:
+            return
+        for word in old - new:
+            self._discard(word, task_id)
+        for word in new - old:
+            self._add(word, task_id)
+        self.words_of[task_id] = new
+
+    def remove(self, task_id):
+        for word in self.words_of.pop(task_id, ()):
+            self._discard(word, task_id)
+
+    def _add(self, word, task_id):
+        ids = self.postings.get(word)
+        if ids is None:
+            self.postings[word] = {task_id}
+            if self._vocab is not None:
+                bisect.insort(self._vocab, word)
+        else:
+            ids.add(task_id)
+
+    def _discard(self, word, task_id):
+        ids = self.postings[word]
+        ids.discard(task_id)
+        if not ids:
+            del self.postings[word]
+            if self._vocab is not None:
+                del self._vocab[bisect.bisect_left(self._vocab, word)]
+
+    def _prefixed(self, prefix):
+        if self._vocab is None:
+            self._vocab = sorted(self.postings)
+        vocab = self._vocab
+        i = bisect.bisect_left(vocab, prefix)
+        matches = []
+        while i < len(vocab) and vocab[i].startswith(prefix):
+            matches.append(self.postings[vocab[i]])
+            i += 1
+        if len(matches) == 1:
+            return matches[0]
+        return set().union(*matches)
+
+    def match(self, query):
+        """Ids whose text has a word starting with every query word (None: empty query)."""
+        result = None
+        for word in sorted(set(tokenize(query)), key=len, reverse=True):
+            ids = self._prefixed(word)
+            result = set(ids) if result is None else result & ids
+            if not result:
+                break
+        return result
+
+
+# ── In-Memory Model ────────────────────────────────────────────────────────────
+class TaskModel:
+    """Tasks by id in rank order, with running completed/pending totals.
+
+    Lookups are O(1); inserts, updates and deletes cost one bisect into the
+    sorted (rank, id) list. A task put without a rank is placed last. Rank and
+    completion are tracked per id rather than by diffing old/new records,
+    because callers usually mutate a task in place before handing it back to
+    `put`.
+    """
+
+    def __init__(self, tasks=()):
+        self.by_id = {}
+        self.done_ids = set()
+        self.by_priority = {}   # priority -> set of ids
+        self.rank_of = {}       # id -> rank the task is filed under in `order`
+        self.order = []         # sorted (rank, id) pairs: display order
+        self.due = {}           # id -> due time, for tasks that have one
+        self.due_days = {}      # day number (due // DAY) -> set of ids due that day
+        self._days = []         # sorted keys of due_days
+        self.reminding = set()  # ids with a reminder time
+        self._search = None     # SearchIndex, built on the first text query
+        self.version = 0        # bumped on every change; lets callers cache views
+        with _gc_paused():
+            for t in tasks:
+                self.put(t)
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __iter__(self):
+        by_id = self.by_id
+        return (by_id[i] for _, i in self.order)
+
+    def __contains__(self, task_id):
+        return task_id in self.by_id
+
+    @property
+    def completed(self):
+        return len(self.done_ids)
+
+    @property
+    def pending(self):
+        return len(self.by_id) - len(self.done_ids)
+
+    def get(self, task_id):
+        return self.by_id.get(task_id)
+
+    def put(self, task):
+        task_id = task.id
+        if task_id in self.by_id:
+            for ids in self.by_priority.values():
+                ids.discard(task_id)
+        order, rank = self.order, task.rank
+        old_rank = self.rank_of.get(task_id)
+        if rank is None:
+            rank = task.rank = old_rank or rank_between(order[-1][0] if order else None)
+        if rank != old_rank:
+            if old_rank is not None:
+                del order[bisect.bisect_left(order, (old_rank, task_id))]
+            entry = (rank, task_id)
+            if not order or order[-1] < entry:
+                order.append(entry)   # loads arrive in rank order
+            else:
+                bisect.insort(order, entry)
+            self.rank_of[task_id] = rank
+        self.by_id[task_id] = task
+        if task.completed:
+            self.done_ids.add(task_id)
+        else:
+            self.done_ids.discard(task_id)
+        bucket = self.by_priority.get(task.priority)
+        if bucket is None:
+            bucket = self.by_priority[task.priority] = set()
+        bucket.add(task_id)
+        if task.due is not None or task_id in self.due:
+            self._index_due(task_id, task.due)
+        if task.remind is not None:
+            self.reminding.add(task_id)
+        else:
+            self.reminding.discard(task_id)
+        if self._search is not None:
+            self._search.update(task_id, task.text)
+        self.version += 1
+
+    def remove(self, task_id):
+        task = self.by_id.pop(task_id, None)
+        if task is not None:
+            rank = self.rank_of.pop(task_id)
+            del self.order[bisect.bisect_left(self.order, (rank, task_id))]
+            self.done_ids.discard(task_id)
+            for ids in self.by_priority.values():
+                ids.discard(task_id)
+            self._index_due(task_id, None)
+            self.reminding.discard(task_id)
+            if self._search is not None:
+                self._search.remove(task_id)
+            self.version += 1
+        return task
+
+    def _index_due(self, task_id, due):
+        old = self.due.get(task_id)
+        if old == due:
+            return
+        if old is not None:
+            del self.due[task_id]
+            day = old // DAY
+            ids = self.due_days[day]
+            ids.discard(task_id)
+            if not ids:
+                del self.due_days[day]
+                del self._days[bisect.bisect_left(self._days, day)]
+        if due is not None:
+            self.due[task_id] = due
+            day = due // DAY
+            ids = self.due_days.get(day)
+            if ids is None:
+                ids = self.due_days[day] = set()
+                bisect.insort(self._days, day)
+            ids.add(task_id)
+
+    def overdue(self, now):
+        """Ids of pending tasks due before `now`; touches only days up to today."""
+        today = now // DAY
+        stop = bisect.bisect_left(self._days, today)
+        ids = set().union(*(self.due_days[day] for day in self._days[:stop]))
+        ids.update(i for i in self.due_days.get(today, ()) if self.due[i] < now)
+        return ids - self.done_ids
+
+    def due_on(self, day):
+        return set(self.due_days.get(day, ()))
+
+    def scheduled(self):
+        return self.due.keys() | self.reminding
+
+    @property
+    def search(self):
+        if self._search is None:
+            self._search = SearchIndex()
+            for t in self.by_id.values():
+                self._search.update(t.id, t.text)
+        return self._search
+
+    def ordered(self, ids):
+        """The tasks for `ids`, in rank order."""
+        by_id = self.by_id
+        if len(ids) * 4 > len(by_id):
+            return [by_id[i] for _, i in self.order if i in ids]
+        rank_of = self.rank_of
+        return [by_id[i] for i in sorted(ids, key=lambda i: (rank_of[i], i))]
+
+
+
+
+# ── In-Memory Stores ───────────────────────────────────────────────────────────
+class MemoryTaskStore(TaskStore):
+    """Keeps every task in a TaskModel; subclasses persist via `_write`."""
+
+    def __init__(self, write_behind=False):
+        self.tasks = TaskModel()
+        self._views = {}   # filter key -> (model version, filtered list)
+        self._lock = threading.Lock()   # held while the model changes or is copied
+        self.writer = WriteBehind(self._write) if write_behind else None
+
+    def load(self):
+        return self.tasks
+
+    def get(self, task_id):
+        return self.tasks.get(task_id)
+
+    def put(self, task):
+        self.put_many([task])
+
+    def delete(self, task_id):
+        self.delete_many([task_id])
+
+    def put_many(self, tasks):
+        tasks = list(tasks)
+        with self._lock:
+            for t in tasks:
+                self.tasks.put(t)
+        if self.writer is None:
+            self._write([{"op": "put", "task": t.to_dict()} for t in tasks])
+        else:
+            # Serialize now so later in-place edits cannot race the worker.
+            self.writer.submit_many((t.id, {"op": "put", "task": t.to_dict()}) for t in tasks)
+
+    def delete_many(self, task_ids):
+        task_ids = list(task_ids)
+        with self._lock:
+            for task_id in task_ids:
+                self.tasks.remove(task_id)
+        records = [(task_id, {"op": "del", "id": task_id}) for task_id in task_ids]
+        if self.writer is None:
+            self._write([r for _, r in records])
+        else:
+            self.writer.submit_many(records)
+
+    def _write(self, records):
+        raise NotImplementedError
+
+    def flush(self):
+        if self.writer is not None:
+            self.writer.flush()
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+    def _view(self, status, priority=None, text="", due=None):
+        model = self.tasks
+        now = now_created()
+        # Due filters also change with the clock: overdue per second, today per day.
+        moment = None if not due else now // 1_000_000 if due == "Overdue" else now // DAY
+        key = (status, priority, text.strip().lower(), due, moment)
+        cached = self._views.get(key)
+        if cached is not None and cached[0] == model.version:
+            return cached[1]
+
+        ids = model.search.match(key[2]) if key[2] else None
+        if priority is not None:
+            bucket = model.by_priority.get(priority, set())
+            ids = set(bucket) if ids is None else ids & bucket
+        if due:
+            dated = model.overdue(now) if due == "Overdue" else model.due_on(now // DAY)
+            ids = dated if ids is None else ids & dated
+        want = STATUS_FILTERS[status]
+        if ids is None:
+            view = list(model) if want is None else [t for t in model if t.completed == want]
+        else:
+            if want is not None:
+                ids = ids & model.done_ids if want else ids - model.done_ids
+            view = model.ordered(ids)
+
+        if len(self._views) > 16:
+            self._views.clear()
+        self._views[key] = (model.version, view)
+        return view
+
+    def count(self, status="All", priority=None, text="", due=None):
+        if priority is not None or text.strip() or due:
+            return len(self._view(status, priority, text, due))
+        want = STATUS_FILTERS[status]
+        if want is None:
+            return len(self.tasks)
+        return self.tasks.completed if want else self.tasks.pending
+
+    def stats(self):
+        return len(self.tasks), self.tasks.completed
+
+    def page(self, status="All", offset=0, limit=None, priority=None, text="", due=None,
+             after=None):
+        view = self._view(status, priority, text, due)
+        if after is not None:
+            offset += bisect.bisect_right(view, (after.rank, after.id), key=_order_key)
+        return view[offset:] if limit is None else view[offset:offset + limit]
+
+    def ids(self, status="All", priority=None, text="", due=None):
+        return list(map(_get_id, self._view(status, priority, text, due)))
+
+    def scheduled(self):
+        return self.tasks.ordered(self.tasks.scheduled())
+
+
+# ── File Locking ───────────────────────────────────────────────────────────────
+class FileLock:
+    """Advisory lock on `path` shared by every store that opens the same file.
+
+    Re-entrant and held per process: the first acquire takes an OS lock
+    (flock, or msvcrt on Windows) plus a thread lock; nested acquires from the
+    owning thread only count. Processes that honour the lock wait for it, or
+    give up straight away with `acquire(blocking=False)`.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = None
+        self._depth = 0
+        self._mutex = threading.RLock()
+
+    def acquire(self, blocking=True):
+        if not self._mutex.acquire(blocking):
+            return False
+        if self._depth == 0:
+            try:
+                if not self._lock_file(blocking):
+                    self._mutex.release()
+                    return False
+            except BaseException:
+                self._mutex.release()
+                raise
+        self._depth += 1
+        return True
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        self._mutex.release()
+
+    def _lock_file(self, blocking):
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                return False
+            return True
+        while True:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            try:
+                msvcrt.locking(self._fd, msvcrt.LK_NBLCK, 1)
+                return True
+            except OSError:
+                if not blocking:
+                    return False
+                time.sleep(0.05)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def close(self):
+        with self._mutex:
+            if self._fd is not None and self._depth == 0:
+                os.close(self._fd)
+                self._fd = None
+
+
+def _record_id(record):
+    task = record.get("task")
+    if task is None:
+        return record["id"]
+    return task.id if isinstance(task, Task) else task["id"]
+
+
+def _file_identity(st):
+    return st.st_dev, st.st_ino
+
+
+# ── Journal Store ──────────────────────────────────────────────────────────────
+class JournalTaskStore(MemoryTaskStore):
+    """tasks.json snapshot plus an append-only log of put/delete records.
+
+    Every mutation appends one fsynced line to `<path>.log`. Loading replays
+    the log over the snapshot. Once the log grows past `compact_bytes` it is
+    rotated to `<path>.log.1` and a background thread folds it into a fresh
+    snapshot. Records are whole-task upserts or deletes by id, so replaying a
+    log that the snapshot already contains is harmless — that is what makes a
+    crash at any point during compaction recoverable.
+
+    Several processes can share one store. Every read and write of the files
+    happens under an advisory lock on `<path>.lock`, and a writer first reads
+    whatever the others appended since it last looked, so nothing is
+    overwritten. `poll_changes` merges those records into this store's model
+    and reports which ids they touched. A compaction leaves a note in
+    `<path>.compacted` naming the log it folded and how far; a store that had
+    read exactly that far keeps its model, anyone else (or after a `rewrite`)
+    re-reads the files and applies only the differences.
+    """
+
+    COMPACT_BYTES = 256 * 1024
+
+    def __init__(self, path, compact_bytes=COMPACT_BYTES, write_behind=False):
+        super().__init__(write_behind)
+        self.path = path
+        self.log_path = path + ".log"
+        self.old_log_path = path + ".log.1"
+        self.note_path = path + ".compacted"
+        self.lock = FileLock(path + ".lock")
+        self.compact_bytes = compact_bytes
+        self._repaired = 0
+        self._loaded = False    # the model holds everything the files did (a load ran to the end)
+        self._unreadable = []   # snapshot elements that are not tasks; written back as they are
+        self._log = None
+        self._compactor = None
+        # How far the files have been read: snapshot (inode, mtime, size), log
+        # (device, inode) and the offset just past the last record seen.
+        self._snapshot_sig = None
+        self._log_ident = None
+        self._log_offset = 0
+        self._inbox = []      # other processes' records, read while writing, not yet merged
+        self._stale = False   # the files were replaced; the next poll re-reads them
+
+    # ── Loading ────────────────────────────────────────────────────────────────
+    def load(self):
+        for batch in self.iter_load():
+            self.apply_loaded(batch)
+        self.finish_load()
+        return self.tasks
+
+    def iter_load(self, batch=LOAD_BATCH):
+        """Yields ("tasks", snapshot tasks) then ("records", log records) batches.
+
+        Touches no shared state, so it can run on a worker thread while the
+        caller feeds each batch to `apply_loaded` and ends with `finish_load`.
+        Holds the file lock throughout, so other processes wait rather than
+        compact the files out from under it.
+        """
+        with self.lock:
+            self._loaded = False
+            yield from self._read_files(batch)
+            self._loaded = True
+
+    def _read_files(self, batch):
+        # A plain tasks.json from before the journal existed is just a snapshot
+        # with an empty log, so old files need no conversion step. Older
+        # versions could also mint the same millisecond id twice; those tasks
+        # get fresh ids here and the snapshot is rewritten in finish_load.
+        # Files from before manual ordering get ranks (in file order) from the
+        # model; those are only saved along with the next write.
+        seen = set()
+        self._repaired = 0
+        self._unreadable = []
+        self._snapshot_sig = self._snapshot_signature()
+        self._log_ident, self._log_offset = None, 0
+        for tasks in iter_snapshot(self.path, batch, skipped=self._unreadable):
+            self._repaired += dedupe_ids(tasks, seen)
+            yield "tasks", tasks
+        for log_path in (self.old_log_path, self.log_path):
+            records = []
+            for record in self._read_log(log_path):
+                record = self._decode(record)
+                if record is None:
+                    continue
+                records.append(record)
+                if len(records) >= batch:
+                    yield "records", records
+                    records = []
+            if records:
+                yield "records", records
+
+    @staticmethod
+    def _decode(record):
+        if record.get("op") == "put":
+            try:
+                record["task"] = Task.from_dict(record["task"])
+            except (AttributeError, KeyError, TypeError, ValueError):
+                return None   # not a record this version wrote
+        return record
+
+    def apply_loaded(self, batch):
+        """Apply one `iter_load` batch to the model without persisting it again."""
+        with self._lock:
+            self._apply(self.tasks, batch)
+
+    @staticmethod
+    def _apply(model, batch):
+        kind, items = batch
+        if kind == "tasks":
+            with _gc_paused():   # each put allocates an order entry
+                for t in items:
+                    model.put(t)
+            return
+        for record in items:
+            if record.get("op") == "put":
+                model.put(record["task"])
+            elif record.get("op") == "del":
+                model.remove(record["id"])
+
+    def finish_load(self):
+        """Ends a load. Never writes after one that failed or was cut short:
+        the model is then missing tasks, and a snapshot of it would lose them."""
+        self.flush()
+        with self.lock:
+            self.poll_changes()   # whatever others wrote since the load finished reading
+            if self._loaded and (self._repaired or os.path.exists(self.old_log_path)):
+                # Persist repaired ids / finish a compaction that was interrupted.
+                self.rewrite(list(self.tasks))
+            self._repaired = 0
+
+    def _read_log(self, log_path):
+        if not os.path.exists(log_path):
+            return
+        with open(log_path, "rb") as f:
+            data = f.read()
+            identity = _file_identity(os.fstat(f.fileno()))
+        end = data.rfind(b"\n") + 1
+        if end < len(data) and log_path == self.log_path:
+            # Drop a torn trailing record so the next append starts on a fresh line.
+            with open(log_path, "r+b") as f:
+                f.truncate(end)
+        if log_path == self.log_path:
+            self._log_ident, self._log_offset = identity, end
+        for line in data[:end].splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                yield record
+
+    # ── External Changes ───────────────────────────────────────────────────────
+    def _snapshot_signature(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return [st.st_ino, st.st_mtime_ns, st.st_size]
+
+    def _catch_up(self):
+        """Records other processes appended since the last look, or None when
+        the files were replaced and must be re-read. Call with `lock` held."""
+        signature = self._snapshot_signature()
+        if signature != self._snapshot_sig:
+            try:
+                with open(self.note_path, "rb") as f:
+                    note = json.load(f)
+            except (OSError, ValueError):
+                note = None
+            seen = {"log": list(self._log_ident or ()), "end": self._log_offset,
+                    "snapshot": signature}
+            if note != seen:
+                return None
+            # Someone compacted exactly what we had already read.
+            self._snapshot_sig = signature
+            self._log_ident, self._log_offset = None, 0
+
+        try:
+            f = open(self.log_path, "rb")
+        except FileNotFoundError:
+            return None if self._log_ident is not None else []
+        with f:
+            identity = _file_identity(os.fstat(f.fileno()))
+            if identity != self._log_ident:
+                if self._log_ident is not None:
+                    return None
+                self._log_ident, self._log_offset = identity, 0
+            f.seek(self._log_offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            # A writer died mid-record; cut it off before anyone appends.
+            with open(self.log_path, "r+b") as f:
+                f.truncate(self._log_offset + end)
+        self._log_offset += end
+        records = []
+        for line in data[:end].splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and self._decode(record) is not None:
+                records.append(record)
+        return records
+
+    def poll_changes(self):
+        """Merges records other processes wrote since the last call into the
+        model; returns the set of task ids added, changed or deleted.
+
+        Cheap when nothing changed (two stats). Never waits for the lock: if
+        another writer holds it, this call merges only what is already read.
+        Ids with writes of our own still pending keep our version.
+        """
+        incoming = []
+        if self.lock.acquire(blocking=False):
+            try:
+                incoming = self._catch_up()
+                if incoming is None:
+                    return self._reload()
+            finally:
+                self.lock.release()
+        with self._lock:
+            inbox, self._inbox = self._inbox, []
+            stale, self._stale = self._stale, False
+        if stale:
+            with self.lock:
+                return self._reload()
+
+        pending = self.writer.pending_keys() if self.writer is not None else ()
+        changed = set()
+        with self._lock:
+            for record in inbox + incoming:
+                task_id = _record_id(record)
+                if task_id in pending:
+                    continue
+                self._apply(self.tasks, ("records", [record]))
+                changed.add(task_id)
+        return changed
+
+    def _reload(self):
+        # Re-read everything, but only touch the tasks that differ.
+        model = TaskModel()
+        for batch in self._read_files(LOAD_BATCH):
+            self._apply(model, batch)
+        self._repaired = 0
+        pending = self.writer.pending_keys() if self.writer is not None else ()
+        changed = set()
+        with self._lock:
+            self._inbox = []
+            for t in model:
+                if t.id not in pending and self.tasks.get(t.id) != t:
+                    self.tasks.put(t)
+                    changed.add(t.id)
+            for t in list(self.tasks):
+                if t.id not in model.by_id and t.id not in pending:
+                    self.tasks.remove(t.id)
+                    changed.add(t.id)
+            self._loaded = True
+        return changed
+
+    # ── Mutations ──────────────────────────────────────────────────────────────
+    def _write(self, records):
+        with self.lock:
+            incoming = self._catch_up()
+            written = {_record_id(r) for r in records}
+            with self._lock:
+                if incoming is None:
+                    self._stale = True
+                    self._log_ident, self._log_offset = None, 0
+                else:
+                    # Earlier records for the ids written here are superseded by them.
+                    self._inbox = [r for r in self._inbox + incoming
+                                   if _record_id(r) not in written]
+            if self._log is not None and (
+                    _file_identity(os.fstat(self._log.fileno())) != self._log_ident):
+                self._close_log()   # rotated or replaced by another process
+            if self._log is None:
+                self._log = open(self.log_path, "ab")
+                self._log_ident = _file_identity(os.fstat(self._log.fileno()))
+            self._log.write(b"".join(json.dumps(r, separators=(",", ":")).encode() + b"\n"
+                                     for r in records))
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._log_offset = self._log.tell()
+            if self._log_offset >= self.compact_bytes:
+                self._start_compaction()
+
+    def _close_log(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    # ── Compaction ─────────────────────────────────────────────────────────────
+    def _start_compaction(self):
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        if os.path.exists(self.old_log_path):
+            return  # an earlier compaction failed; leave its log for the next load
+        self._compactor = threading.Thread(target=self._compact, name="todo-compact")
+        self._compactor.start()
+
+    def rewrite(self, tasks):
+        """Replace the whole store with `tasks` and start a fresh, empty log."""
+        self.flush()
+        if self._compactor is not None:
+            self._compactor.join()
+        with self.lock:
+            self._close_log()
+            self.tasks = TaskModel(tasks)
+            self._loaded = True
+            write_snapshot(self.path, list(self.tasks), self._unreadable)
+            for path in (self.old_log_path, self.log_path, self.note_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            _fsync_dir(self.path)
+            self._snapshot_sig = self._snapshot_signature()
+            self._log_ident, self._log_offset = None, 0
+            self._inbox, self._stale = [], False
+
+    def _compact(self):
+        # Runs entirely under the file lock, so other processes never see a
+        # half-compacted store; this process's writes queue up behind it.
+        with self.lock:
+            if os.path.exists(self.old_log_path) or not os.path.exists(self.log_path):
+                return
+            incoming = self._catch_up()
+            with self._lock:
+                stale = self._stale = self._stale or incoming is None
+                if not stale:
+                    self._inbox.extend(incoming)
+            if stale or not self._loaded:
+                # The model is behind the files (or never held all of them),
+                # so fold the files themselves.
+                model = TaskModel()
+                for batch in self._read_files(LOAD_BATCH):
+                    self._apply(model, batch)
+                self._repaired = 0
+                snapshot = {t.id: t for t in model}
+            else:
+                pending = self.writer.pending_keys() if self.writer is not None else ()
+                with self._lock:
+                    snapshot = {t.id: t.copy() for t in self.tasks}
+                    for record in self._inbox:
+                        task_id = _record_id(record)
+                        if task_id in pending:
+                            continue
+                        if record.get("op") == "put":
+                            snapshot[task_id] = record["task"]
+                        elif record.get("op") == "del":
+                            snapshot.pop(task_id, None)
+
+            self._close_log()
+            folded = {"log": list(self._log_ident or ()), "end": self._log_offset}
+            os.replace(self.log_path, self.old_log_path)
+            write_snapshot(self.path, list(snapshot.values()), self._unreadable)
+            os.remove(self.old_log_path)
+            self._snapshot_sig = self._snapshot_signature()
+            self._log_ident, self._log_offset = None, 0
+            with open(self.note_path, "w", encoding="utf-8") as f:
+                json.dump(dict(folded, snapshot=self._snapshot_sig), f)
+            _fsync_dir(self.path)
+
+    def close(self):
+        super().close()
+        if self._compactor is not None:
+            self._compactor.join()
+        self._close_log()
+        self.lock.close()
+
+
+# ── SQLite Store ───────────────────────────────────────────────────────────────
+class SQLiteTaskStore(TaskStore):
+    """Tasks live in an SQLite table; filters and counters are indexed queries.
+
+    Nothing is held in memory beyond the pages the UI asks for, so very large
+    databases open instantly. Display order is `rank` (ties by id).
+    """
+
+    COLUMNS = "id, text, priority, completed, created, due, remind, rank"
+
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                seq       INTEGER PRIMARY KEY AUTOINCREMENT,
+                id        INTEGER NOT NULL UNIQUE,
+                text      TEXT    NOT NULL,
+                priority  TEXT    NOT NULL,
+                completed INTEGER NOT NULL DEFAULT 0,
+                created   TEXT    NOT NULL,
+                due       INTEGER,
+                remind    INTEGER,
+                rank      TEXT
+            );
+        """)
+        columns = {row[1] for row in self.db.execute("PRAGMA table_info(tasks)")}
+        for column, kind in (("due", "INTEGER"), ("remind", "INTEGER"), ("rank", "TEXT")):
+            if column not in columns:   # databases from before due dates / ordering
+                self.db.execute(f"ALTER TABLE tasks ADD COLUMN {column} {kind}")
+        self.db.executescript("""
+            CREATE INDEX IF NOT EXISTS tasks_completed ON tasks (completed, seq);
+            CREATE INDEX IF NOT EXISTS tasks_priority  ON tasks (priority);
+            CREATE INDEX IF NOT EXISTS tasks_created   ON tasks (created);
+            CREATE INDEX IF NOT EXISTS tasks_due       ON tasks (due);
+            CREATE INDEX IF NOT EXISTS tasks_remind    ON tasks (remind);
+            CREATE INDEX IF NOT EXISTS tasks_rank      ON tasks (rank, id);
+            CREATE INDEX IF NOT EXISTS tasks_done_rank ON tasks (completed, rank, id);
+        """)
+        self._rank_unranked()
+        self.fts = self._create_fts()
+        self._stats = None
+        self._data_version = self._version()
+
+    def _rank_unranked(self):
+        # Rows written before manual ordering are ranked after the rest, in seq order.
+        ids = [r[0] for r in self.db.execute(
+            "SELECT id FROM tasks WHERE rank IS NULL ORDER BY seq")]
+        if ids:
+            with self.db:
+                self.db.executemany("UPDATE tasks SET rank = ? WHERE id = ?",
+                                    zip(self._next_ranks(len(ids)), ids))
+
+    def _next_ranks(self, count):
+        rank = self.db.execute("SELECT MAX(rank) FROM tasks").fetchone()[0]
+        ranks = []
+        for _ in range(count):
+            rank = rank_between(rank)
+            ranks.append(rank)
+        return ranks
+
+    def _create_fts(self):
+        # Full-text search rides on an FTS5 index kept in sync by triggers;
+        # builds without FTS5 fall back to LIKE scans.
+        exists = self.db.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'tasks_fts'").fetchone()
+        try:
+            self.db.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts
+                    USING fts5(text, content='tasks', content_rowid='seq');
+                CREATE TRIGGER IF NOT EXISTS tasks_fts_ins AFTER INSERT ON tasks BEGIN
+                    INSERT INTO tasks_fts (rowid, text) VALUES (new.seq, new.text);
+                END;
+                CREATE TRIGGER IF NOT EXISTS tasks_fts_del AFTER DELETE ON tasks BEGIN
+                    INSERT INTO tasks_fts (tasks_fts, rowid, text) VALUES ('delete', old.seq, old.text);
+                END;
+                CREATE TRIGGER IF NOT EXISTS tasks_fts_upd AFTER UPDATE OF text ON tasks BEGIN
+                    INSERT INTO tasks_fts (tasks_fts, rowid, text) VALUES ('delete', old.seq, old.text);
+                    INSERT INTO tasks_fts (rowid, text) VALUES (new.seq, new.text);
+                END;
+            """)
+        except sqlite3.OperationalError:
+            return False
+        if not exists:
+            with self.db:
+                self.db.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+        return True
+
+    def load(self):
+        return None   # rows are paged on demand
+
+    def _version(self):
+        return self.db.execute("PRAGMA data_version").fetchone()[0]
+
+    def poll_changes(self):
+        # SQLite does its own locking; data_version only moves when another
+        # connection commits, but it cannot say which rows changed.
+        version = self._version()
+        if version == self._data_version:
+            return set()
+        self._data_version = version
+        self._stats = None
+        return None
+
+    def _row(self, row):
+        return Task(row[0], row[1], Priority.parse(row[2]), bool(row[3]), parse_created(row[4]),
+                    row[5], row[6], row[7])
+
+    def _where(self, status, priority=None, text="", due=None):
+        clauses, args = [], []
+        want = STATUS_FILTERS[status]
+        if want is not None:
+            clauses.append("completed = ?")
+            args.append(int(want))
+        if priority is not None:
+            clauses.append("priority = ?")
+            args.append(priority.label)
+        if due == "Overdue":
+            clauses.append("completed = 0 AND due < ?")
+            args.append(now_created())
+        elif due:
+            today = now_created() // DAY
+            clauses.append("due >= ? AND due < ?")
+            args.extend((today * DAY, (today + 1) * DAY))
+        words = tokenize(text)
+        if words and self.fts:
+            clauses.append("seq IN (SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ?)")
+            args.append(" ".join(f'"{w}"*' for w in words))
+        else:
+            for w in words:
+                clauses.append("text LIKE ?")
+                args.append(f"%{w}%")
+        if not clauses:
+            return "", ()
+        return " WHERE " + " AND ".join(clauses), tuple(args)
+
+    def get(self, task_id):
+        row = self.db.execute(f"SELECT {self.COLUMNS} FROM tasks WHERE id = ?",
+                              (task_id,)).fetchone()
+        return self._row(row) if row else None
+
+    def put(self, task):
+        self.put_many([task])
+
+    def put_many(self, tasks):
+        tasks = list(tasks)
+        with self.db:
+            unranked = [t for t in tasks if t.rank is None]
+            if unranked:
+                # Existing rows keep their place; new ones go last.
+                ids = [t.id for t in unranked]
+                known = {}
+                for start in range(0, len(ids), 500):
+                    chunk = ids[start:start + 500]
+                    known.update(self.db.execute(
+                        f"SELECT id, rank FROM tasks WHERE id IN ({','.join('?' * len(chunk))})",
+                        chunk))
+                new = [t for t in unranked if known.get(t.id) is None]
+                for t, rank in zip(new, self._next_ranks(len(new))):
+                    t.rank = rank
+                for t in unranked:
+                    t.rank = t.rank or known[t.id]
+            self.db.executemany(
+                f"INSERT INTO tasks ({self.COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET text = excluded.text, "
+                "priority = excluded.priority, completed = excluded.completed, "
+                "created = excluded.created, due = excluded.due, remind = excluded.remind, "
+                "rank = excluded.rank",
+                ((t.id, t.text, t.priority.label, int(t.completed), format_created(t.created),
+                  t.due, t.remind, t.rank)
+                 for t in tasks))
+        self._stats = None
+
+    def delete(self, task_id):
+        self.delete_many([task_id])
+
+    def delete_many(self, task_ids):
+        with self.db:
+            self.db.executemany("DELETE FROM tasks WHERE id = ?", ((i,) for i in task_ids))
+        self._stats = None
+
+    def count(self, status="All", priority=None, text="", due=None):
+        if priority is not None or text.strip() or due:
+            where, args = self._where(status, priority, text, due)
+            return self.db.execute(f"SELECT COUNT(*) FROM tasks{where}", args).fetchone()[0]
+        total, done = self.stats()
+        want = STATUS_FILTERS[status]
+        if want is None:
+            return total
+        return done if want else total - done
+
+    def stats(self):
+        if self._stats is None:
+            total = self.db.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+            done = self.db.execute(
+                "SELECT COUNT(*) FROM tasks WHERE completed = 1").fetchone()[0]
+            self._stats = (total, done)
+        return self._stats
+
+    def page(self, status="All", offset=0, limit=None, priority=None, text="", due=None,
+             after=None):
+        where, args = self._where(status, priority, text, due)
+        if after is not None:
+            # Keyset, not OFFSET: the tasks_rank index seeks straight to the next page
+            where += (" AND" if where else " WHERE") + " (rank, id) > (?, ?)"
+            args += (after.rank, after.id)
+        rows = self.db.execute(
+            f"SELECT {self.COLUMNS} FROM tasks{where} ORDER BY rank, id LIMIT ? OFFSET ?",
+            args + (-1 if limit is None else limit, offset))
+        return [self._row(r) for r in rows]
+
+    def ids(self, status="All", priority=None, text="", due=None):
+        where, args = self._where(status, priority, text, due)
+        return [r[0] for r in self.db.execute(f"SELECT id FROM tasks{where} ORDER BY rank, id", args)]
+
+    def scheduled(self):
+        rows = self.db.execute(f"SELECT {self.COLUMNS} FROM tasks "
+                               "WHERE due IS NOT NULL OR remind IS NOT NULL ORDER BY rank, id")
+        return [self._row(r) for r in rows]
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,119 @@
+import argparse
+import random
+import re
+import time
+
+from calc_engine import IncrementalEvaluator, evaluate, parse_cached
+
+
+# ──────────────────────────────────────────────────────────────────
+#  BASELINE (the replace + regex + eval path CalcEngine used to run)
+# ──────────────────────────────────────────────────────────────────
+def eval_baseline(expr: str):
+    safe = expr.replace("×", "*").replace("÷", "/").replace("%", "/100")
+    if not re.fullmatch(r"[\d\s\+\-\*/\.\(\)]+", safe):
+        raise ValueError("Invalid expression")
+    return eval(safe, {"__builtins__": {}})  # noqa: S307
+
+
+# ──────────────────────────────────────────────────────────────────
+#  WORKLOAD
+# ──────────────────────────────────────────────────────────────────
+def synthetic_expressions(count: int, terms: int, seed: int = 0) -> list[str]:
+    """Calculator-style input: numbers, + - × ÷, parentheses and unary minus."""
+    rng = random.Random(seed)
+    exprs = []
+    for _ in range(count):
+        parts = []
+        for i in range(terms):
+            number = str(rng.randint(1, 9999)) if rng.random() < 0.7 else f"{rng.uniform(0, 100):.2f}"
+            if rng.random() < 0.1:
+                number = "-" + number
+            if rng.random() < 0.15:
+                number = f"({number}{rng.choice('+-')}{rng.randint(1, 99)})"
+            parts.append(number if i == 0 else rng.choice("+-×÷") + number)
+        exprs.append("".join(parts))
+    return exprs
+
+
+def per_call(fn, exprs: list[str], repeat: int) -> float:
+    """Best-of-`repeat` seconds per evaluation over `exprs`."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for expr in exprs:
+            fn(expr)
+        best = min(best, time.perf_counter() - start)
+    return best / len(exprs)
+
+
+def bench(count: int = 2000, terms: int = 8, repeat: int = 5) -> dict[str, float]:
+    exprs = synthetic_expressions(count, terms)
+    for expr in exprs:
+        if abs(evaluate(expr) - eval_baseline(expr)) > 1e-9 * max(1, abs(eval_baseline(expr))):
+            raise AssertionError(f"engine and eval disagree on {expr}")
+
+    def cold(expr):
+        parse_cached.cache_clear()
+        return evaluate(expr)
+
+    return {
+        "eval (old path)": per_call(eval_baseline, exprs, repeat),
+        "engine, cold cache": per_call(cold, exprs, repeat),
+        "engine, cached": per_call(evaluate, exprs, repeat),
+    }
+
+
+def bench_keystrokes(lengths=(100, 1000, 8000), keys: int = 200) -> dict[int, tuple[float, float]]:
+    """Live preview cost of one more keystroke after a pasted expression of
+    each length: {length: (full re-evaluation, incremental)} in seconds."""
+    results = {}
+    for length in lengths:
+        pasted = "".join(synthetic_expressions(length // 40 + 1, 8, seed=length))
+        pasted = pasted.replace("(", "").replace(")", "")[:length].rstrip("+-×÷.")
+        typed = "+12×3-4÷5" * (keys // 9 + 1)
+
+        parse_cached.cache_clear()
+        text = pasted
+        start = time.perf_counter()
+        for char in typed[:keys]:
+            text += char
+            try:
+                evaluate(text)
+            except ValueError:
+                pass
+        full = (time.perf_counter() - start) / keys
+
+        live = IncrementalEvaluator()
+        live.set_text(pasted)
+        start = time.perf_counter()
+        for char in typed[:keys]:
+            live.push(char)
+            try:
+                live.value()
+            except ValueError:
+                pass
+        results[length] = (full, (time.perf_counter() - start) / keys)
+    return results
+
+
+# ──────────────────────────────────────────────────────────────────
+#  ENTRY POINT
+# ──────────────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Calculator engine vs eval, per evaluation.")
+    parser.add_argument("--count", type=int, default=2000, help="distinct expressions")
+    parser.add_argument("--terms", type=int, default=8, help="numbers per expression")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = bench(args.count, args.terms, args.repeat)
+    baseline = results["eval (old path)"]
+    print(f"{args.count:,} expressions of {args.terms} terms")
+    for name, seconds in results.items():
+        print(f"  {name:<20} {seconds * 1e6:8.2f} µs   {baseline / seconds:5.1f}x")
+
+    print("live preview per keystroke after a paste")
+    for length, (full, incremental) in bench_keystrokes().items():
+        print(f"  {length:>6,} chars   full {full * 1e6:9.2f} µs   "
+              f"incremental {incremental * 1e6:6.2f} µs")
@@ -0,0 +1,239 @@
+"""Headless calculator: one expression per input line, one result per output line.
+
+    python calc_cli.py formulas.txt > results.txt
+    generate_formulas | python calc_cli.py --format jsonl
+
+Results come out in input order. Large inputs are cut into chunks and spread
+over a process pool; small ones are evaluated in-process. Every expression
+runs under the engine's Budget plus a wall-clock limit, so one bad line costs
+at most --timeout seconds and is reported, not fatal. Imports only
+calc_engine, never the Tk window.
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+from collections import deque
+from typing import Iterable, Iterator, Optional, TextIO
+
+from calc_engine import (DEFAULT_BUDGET, EVAL_TIMEOUT, LITERAL_DIGITS, Budget, CalcError,
+                         CalcTimeoutError, evaluate, format_result)
+
+
+# ──────────────────────────────────────────────────────────────────
+#  CONSTANTS
+# ──────────────────────────────────────────────────────────────────
+CHUNK_LINES = 2000    # lines per pool task; an input of one chunk stays in-process
+
+FORMATS = ("plain", "tsv", "jsonl")
+
+# setitimer() is Unix-only; elsewhere the Budget alone bounds each expression
+_CAN_TIME_OUT = hasattr(signal, "setitimer")
+
+
+# ──────────────────────────────────────────────────────────────────
+#  EVALUATION
+# ──────────────────────────────────────────────────────────────────
+def _on_alarm(signum, frame):
+    raise CalcTimeoutError("took too long")
+
+
+def format_line(line: str, result: str, error: str, style: str) -> str:
+    expr = line.strip()
+    if style == "jsonl":
+        return json.dumps({"expr": expr, "result": result or None, "error": error or None},
+                          ensure_ascii=False)
+    if style == "tsv":
+        return f"{expr}\t{result}\t{error}"
+    return f"error: {error}" if error else result
+
+
+class Evaluator:
+    """Turns chunks of input lines into chunks of output text. One per
+    process: the pool builds its own from the same arguments. The time
+    limit needs SIGALRM, so it only applies on Unix, in the main thread."""
+
+    def __init__(self, budget: Budget, timeout: float, style: str):
+        self.budget, self.timeout, self.style = budget, timeout, style
+        self.timed = (timeout > 0 and _CAN_TIME_OUT
+                      and threading.current_thread() is threading.main_thread())
+        if self.timed:
+            signal.signal(signal.SIGALRM, _on_alarm)
+
+    def __call__(self, lines: list[str]) -> tuple[str, int, int]:
+        """(output text, lines done, lines that failed)."""
+        out, failed = [], 0
+        for line in lines:
+            result, error = self.evaluate_line(line)
+            failed += bool(error)
+            out.append(format_line(line, result, error, self.style))
+        return "\n".join(out) + "\n" if out else "", len(lines), failed
+
+    def evaluate_line(self, line: str) -> tuple[str, str]:
+        """(result, error message) for one input line; blank lines give ("", "")."""
+        text = line.strip()
+        if not text:
+            return "", ""
+        try:
+            if self.timed:
+                signal.setitimer(signal.ITIMER_REAL, self.timeout)
+            try:
+                value = evaluate(text, self.budget)
+            finally:
+                if self.timed:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+            return format_result(value), ""
+        except CalcError as exc:
+            return "", str(exc)
+        except Exception as exc:   # an engine bug must cost one line, not the batch
+            return "", f"{type(exc).__name__}: {exc}"
+
+
+_evaluator: Optional[Evaluator] = None   # the pool worker's own
+
+
+def _init_worker(budget: Budget, timeout: float, style: str) -> None:
+    global _evaluator
+    signal.signal(signal.SIGINT, signal.SIG_IGN)   # Ctrl+C is the parent's to handle
+    _evaluator = Evaluator(budget, timeout, style)
+
+
+def _run_chunk(lines: list[str]) -> tuple[str, int, int]:
+    return _evaluator(lines)
+
+
+# ──────────────────────────────────────────────────────────────────
+#  STREAMING
+# ──────────────────────────────────────────────────────────────────
+def _chunks(lines: Iterable[str], size: int) -> Iterator[list[str]]:
+    lines = iter(lines)
+    while chunk := list(itertools.islice(lines, size)):
+        yield chunk
+
+
+def run(lines: Iterable[str], out: TextIO, budget: Budget = DEFAULT_BUDGET,
+        timeout: float = EVAL_TIMEOUT, style: str = "plain", jobs: Optional[int] = None,
+        chunk: int = CHUNK_LINES, line_buffered: bool = False) -> tuple[int, int]:
+    """Evaluate every line of `lines` and write the results to `out` in the
+    same order. Returns (lines read, lines that failed)."""
+    total = failed = 0
+    if line_buffered:
+        # Answer each line as soon as it arrives (tail -f | calc_cli.py -u)
+        evaluator = Evaluator(budget, timeout, style)
+        for line in lines:
+            text, done, errors = evaluator([line])
+            out.write(text)
+            out.flush()
+            total, failed = total + done, failed + errors
+        return total, failed
+
+    chunks = _chunks(lines, chunk)
+    head = list(itertools.islice(chunks, 2))
+    chunks = itertools.chain(head, chunks)
+    jobs = jobs or os.cpu_count() or 1
+    if len(head) < 2 or jobs == 1:
+        # Small input, or no pool wanted: stay in this process
+        results = map(Evaluator(budget, timeout, style), chunks)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(jobs, _init_worker, (budget, timeout, style))
+        results = _windowed(pool, chunks, 2 * jobs)
+    try:
+        for text, done, errors in results:
+            out.write(text)
+            total, failed = total + done, failed + errors
+    finally:
+        if pool is not None:
+            pool.terminate()
+    return total, failed
+
+
+def _windowed(pool, chunks: Iterator[list[str]], window: int) -> Iterator[tuple[str, int, int]]:
+    """pool results for `chunks`, in order, with at most `window` chunks in
+    flight. Unlike pool.imap, which reads all of its input as fast as it can
+    and queues every result, this reads ahead only as far as the slowest
+    of input, workers and output allows."""
+    pending = deque()
+    for lines in chunks:
+        pending.append(pool.apply_async(_run_chunk, (lines,)))
+        if len(pending) >= window:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
+
+
+# ──────────────────────────────────────────────────────────────────
+#  ENTRY POINT
+# ──────────────────────────────────────────────────────────────────
+def _read(paths: list[str]) -> Iterator[str]:
+    for path in paths:
+        if path == "-":
+            sys.stdin.reconfigure(encoding="utf-8", errors="replace")
+            yield from sys.stdin
+        else:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                yield from f
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Evaluate calculator expressions, one per line, without the window.")
+    parser.add_argument("files", nargs="*", default=["-"],
+                        help="input files, read in turn (default: stdin, also '-')")
+    parser.add_argument("-o", "--output", help="write results here instead of stdout")
+    parser.add_argument("--format", choices=FORMATS, default="plain",
+                        help="plain: result or 'error: …'; tsv: expr, result, error; "
+                             "jsonl: one JSON object per line")
+    parser.add_argument("-j", "--jobs", type=int, default=0,
+                        help="worker processes for large inputs (default: one per CPU; "
+                             "1 evaluates in-process)")
+    parser.add_argument("--chunk", type=int, default=CHUNK_LINES,
+                        help="lines per worker task")
+    parser.add_argument("--timeout", type=float, default=EVAL_TIMEOUT,
+                        help="seconds allowed per expression (0: no limit)")
+    parser.add_argument("--max-digits", type=int, default=DEFAULT_BUDGET.max_digits,
+                        help="largest integer, in decimal digits, any step may produce "
+                             f"(at most {LITERAL_DIGITS})")
+    parser.add_argument("--max-length", type=int, default=DEFAULT_BUDGET.max_length,
+                        help="longest expression accepted, in characters")
+    parser.add_argument("-u", "--line-buffered", action="store_true",
+                        help="evaluate and flush line by line, for interactive pipes")
+    parser.add_argument("--stats", action="store_true",
+                        help="print line and error counts to stderr at the end")
+    args = parser.parse_args(argv)
+    if args.jobs < 0 or args.chunk < 1:
+        parser.error("--jobs must be >= 0 and --chunk >= 1")
+    if not 1 <= args.max_digits <= LITERAL_DIGITS:
+        # Python will not print an int longer than this, so no result could be shown
+        parser.error(f"--max-digits must be between 1 and {LITERAL_DIGITS}")
+
+    budget = Budget(max_digits=args.max_digits, max_length=args.max_length)
+    sys.stdout.reconfigure(encoding="utf-8")
+    out = sys.stdout
+    try:
+        if args.output:
+            out = open(args.output, "w", encoding="utf-8", newline="\n")
+        total, failed = run(_read(args.files), out, budget, args.timeout, args.format,
+                            args.jobs, args.chunk, args.line_buffered)
+    except BrokenPipeError:   # e.g. piped into head: stop quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except KeyboardInterrupt:
+        return 130
+    except OSError as exc:
+        print(f"calc_cli: {exc}", file=sys.stderr)
+        return 2
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if args.stats:
+        print(f"{total:,} lines, {failed:,} errors", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
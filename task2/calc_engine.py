@@ -0,0 +1,753 @@
+import math
+import multiprocessing
+import operator
+import os
+import re
+import time
+from functools import lru_cache
+from typing import NamedTuple, Optional, Union
+
+
+# ──────────────────────────────────────────────────────────────────
+#  GRAMMAR
+# ──────────────────────────────────────────────────────────────────
+#   expr    := term (("+" | "-") term)*
+#   term    := unary (("×" | "*" | "÷" | "/") unary)*
+#   unary   := ("-" | "+") unary | power
+#   power   := postfix ("**" unary)?          right-assoc, -2**2 == -4
+#   postfix := atom "%"*                      x% == x / 100
+#   atom    := NUMBER | "(" expr ")"
+#
+# Same values as the old replace-and-eval path, except where its text
+# substitution of "/100" for "%" went wrong: "a÷b%" was a/b/100 and is now
+# a/(b/100), and "5%3" was 5/1003 and is now an error.
+Number = Union[int, float]
+
+CACHE_SIZE = 4096   # parsed expressions kept, by exact expression string
+
+# Longest integer literal the parser converts at all (int() refuses more anyway)
+LITERAL_DIGITS = 4300
+
+# A worker evaluation that has not answered after this many seconds is killed,
+# or after CANCEL_AFTER once a newer submission has made it pointless
+EVAL_TIMEOUT = 0.25
+CANCEL_AFTER = 0.02
+
+# One alternative per token kind; every character lands in exactly one group,
+# so token positions are a running sum of match lengths.
+_SCAN = re.compile(r"(\d+\.?\d*|\.\d+)|(\*\*|[-+×*÷/%()])|(\s+)|(.)", re.S)
+
+# Binding power of the infix operators and of unary +/- (between × and **)
+_PREC = {"+": 1, "-": 1, "×": 2, "*": 2, "÷": 2, "/": 2, "**": 4}
+_UNARY_PREC = 3
+
+_isfinite = math.isfinite
+_INF = math.inf
+
+_BINARY = {"+": operator.add, "-": operator.sub, "×": operator.mul, "*": operator.mul,
+           "÷": operator.truediv, "/": operator.truediv, "**": operator.pow}
+
+
+class CalcError(ValueError):
+    """A bad expression; `position` is the 0-based index of the offending
+    character, or None when the problem is not at any one place."""
+
+    def __init__(self, message: str, position: Optional[int] = None):
+        super().__init__(message if position is None else f"{message} at column {position + 1}")
+        self.message = message
+        self.position = position
+
+    def __reduce__(self):
+        # Rebuilt from the real arguments when it comes back from a worker
+        return type(self), (self.message, self.position)
+
+
+class CalcSyntaxError(CalcError):
+    pass
+
+
+class CalcZeroDivisionError(CalcError, ZeroDivisionError):
+    pass
+
+
+class CalcOverflowError(CalcError, OverflowError):
+    """Over the cost budget: a number, result or expression too large to work with."""
+
+
+class CalcTimeoutError(CalcError):
+    pass
+
+
+class Budget(NamedTuple):
+    """Limits that bound the cost of one evaluation. Every operand and result
+    stays under max_digits, so each step is a bounded amount of work, and
+    operations that would cross the limit are refused before they run."""
+    max_digits: int = 1000       # decimal digits of any integer operand or result
+    max_length: int = 10_000     # characters per expression
+
+    @property
+    def max_bits(self) -> int:
+        return int(self.max_digits * 3.3219280948873626) + 1
+
+
+DEFAULT_BUDGET = Budget()
+
+
+# ──────────────────────────────────────────────────────────────────
+#  TOKENIZER
+# ──────────────────────────────────────────────────────────────────
+def tokenize(text: str) -> list[tuple[str, int, bool]]:
+    """[(token, position, is_number), ...] with whitespace dropped."""
+    tokens = []
+    pos = 0
+    for number, op, space, bad in _SCAN.findall(text):
+        if bad:
+            raise CalcSyntaxError(f"unexpected {bad!r}", pos)
+        if not space:
+            tokens.append((number or op, pos, bool(number)))
+        pos += len(number or op or space)
+    return tokens
+
+
+# ──────────────────────────────────────────────────────────────────
+#  SYNTAX TREE
+# ──────────────────────────────────────────────────────────────────
+class Num(NamedTuple):
+    value: Number
+    pos: int
+
+
+class Unary(NamedTuple):
+    op: str          # "-" or "+"
+    operand: "Node"
+    pos: int
+
+
+class Percent(NamedTuple):
+    operand: "Node"
+    pos: int
+
+
+class Binary(NamedTuple):
+    op: str
+    left: "Node"
+    right: "Node"
+    pos: int         # of the operator
+
+
+Node = Union[Num, Unary, Percent, Binary]
+
+
+# ──────────────────────────────────────────────────────────────────
+#  PARSER
+# ──────────────────────────────────────────────────────────────────
+# Operator precedence (shunting-yard) over the token list: one loop, no
+# recursion, and every error is reported at the token that caused it.
+def _reduce(out: list, op: str, pos: int) -> None:
+    if op == "u-" or op == "u+":
+        out[-1] = Unary(op[1], out[-1], pos)
+    else:
+        right = out.pop()
+        out[-1] = Binary(op, out[-1], right, pos)
+
+
+def parse(text: str) -> Node:
+    """The syntax tree of `text`; CalcSyntaxError with the position if it has none."""
+    out: list = []               # finished operands
+    ops: list = []               # pending (op, precedence, pos); "(" has precedence 0
+    expect_operand = True
+    for token, pos, is_number in tokenize(text):
+        if expect_operand:
+            if is_number:
+                if len(token) > LITERAL_DIGITS:
+                    raise CalcOverflowError("too large", pos)
+                value = float(token) if "." in token else int(token)
+                if value == _INF:   # float literal past 1.8e308
+                    raise CalcOverflowError("too large", pos)
+                out.append(Num(value, pos))
+                expect_operand = False
+            elif token == "-" or token == "+":
+                if ops and ops[-1][0] in ("u-", "u+"):
+                    # A run of signs folds into one node, as in _feed, so
+                    # "----…1" is not a tree as deep as the run is long
+                    top = ops[-1]
+                    op = "u-" if (top[0] == "u-") != (token == "-") else "u+"
+                    ops[-1] = (op, _UNARY_PREC, top[2])
+                else:
+                    ops.append(("u" + token, _UNARY_PREC, pos))
+            elif token == "(":
+                ops.append(("(", 0, pos))
+            else:
+                raise CalcSyntaxError(f"unexpected {token!r}", pos)
+        elif token == "%":
+            out[-1] = Percent(out[-1], pos)
+        elif token == ")":
+            while ops and ops[-1][0] != "(":
+                op, _, at = ops.pop()
+                _reduce(out, op, at)
+            if not ops:
+                raise CalcSyntaxError("unmatched ')'", pos)
+            ops.pop()
+        else:
+            prec = _PREC.get(token)
+            if prec is None:
+                raise CalcSyntaxError(f"unexpected {token!r}", pos)
+            right_assoc = token == "**"
+            while ops and (ops[-1][1] > prec or ops[-1][1] == prec and not right_assoc):
+                op, _, at = ops.pop()
+                _reduce(out, op, at)
+            ops.append((token, prec, pos))
+            expect_operand = True
+    if expect_operand:
+        raise CalcSyntaxError("incomplete expression", len(text))
+    while ops:
+        op, _, at = ops.pop()
+        if op == "(":
+            raise CalcSyntaxError("missing ')'", len(text))
+        _reduce(out, op, at)
+    return out[0]
+
+
+# ──────────────────────────────────────────────────────────────────
+#  EVALUATOR
+# ──────────────────────────────────────────────────────────────────
+def evaluate_tree(node: Node, budget: Budget = DEFAULT_BUDGET) -> Number:
+    try:
+        return _evaluate(node, budget.max_bits)
+    except RecursionError:
+        raise CalcOverflowError("too deeply nested") from None
+
+
+def _evaluate(node: Node, max_bits: int) -> Number:
+    kind = type(node)
+    if kind is Num:
+        return _checked(node.value, max_bits, node.pos)
+    if kind is Binary:
+        # Long chains such as 1+2+3+… are left-deep; walk that spine in a
+        # loop so only genuinely nested input costs stack depth.
+        if type(node.left) is Binary:
+            spine = []
+            while type(node) is Binary:
+                spine.append(node)
+                node = node.left
+            spine.reverse()
+        else:
+            spine = (node,)
+            node = node.left
+        value = node.value if type(node) is Num else _evaluate(node, max_bits)
+        if type(value) is int and value.bit_length() > max_bits:
+            raise CalcOverflowError("too large", node.pos)
+        for step in spine:
+            right = step.right
+            if type(right) is Num:
+                b = right.value
+                if type(b) is int and b.bit_length() > max_bits:
+                    raise CalcOverflowError("too large", right.pos)
+            else:
+                b = _evaluate(right, max_bits)
+            # + and - inline: with both operands in budget they can only
+            # overshoot by a bit, reach inf, or (a float with a big int)
+            # fail to convert.
+            op = step.op
+            try:
+                if op == "+":
+                    value = value + b
+                elif op == "-":
+                    value = value - b
+                else:
+                    value = _apply(op, value, b, step.pos, max_bits)
+                    continue
+            except OverflowError:
+                raise CalcOverflowError("too large", step.pos) from None
+            if type(value) is int:
+                if value.bit_length() > max_bits:
+                    raise CalcOverflowError("too large", step.pos)
+            elif not _isfinite(value):
+                raise CalcOverflowError("too large", step.pos)
+        return value
+    if kind is Unary:
+        value = _evaluate(node.operand, max_bits)
+        return -value if node.op == "-" else value
+    try:
+        return _checked(_evaluate(node.operand, max_bits) / 100, max_bits, node.pos)
+    except OverflowError:   # int too large for a float
+        raise CalcOverflowError("too large", node.pos) from None
+
+
+def _apply(op: str, a: Number, b: Number, pos: int, max_bits: int) -> Number:
+    int_operands = type(a) is int and type(b) is int
+    if op in ("÷", "/"):
+        if not b:
+            raise CalcZeroDivisionError("division by zero", pos)
+    elif op in ("×", "*"):
+        if int_operands and a.bit_length() + b.bit_length() > max_bits + 1:
+            raise CalcOverflowError("too large", pos)
+    elif op == "**":
+        if not a and b < 0:
+            raise CalcZeroDivisionError("zero to a negative power", pos)
+        # |a|**b has about bit_length(a) * b bits: refuse before computing it
+        if int_operands and b > 0 and abs(a) > 1 and (a.bit_length() - 1) * b > max_bits:
+            raise CalcOverflowError("too large", pos)
+    try:
+        result = _BINARY[op](a, b)
+    except OverflowError:
+        raise CalcOverflowError("too large", pos) from None
+    kind = type(result)
+    if kind is int:
+        if result.bit_length() > max_bits:
+            raise CalcOverflowError("too large", pos)
+        return result
+    if kind is float and _isfinite(result):
+        return result
+    return _checked(result, max_bits, pos)
+
+
+def _checked(value: Number, max_bits: int, pos: int) -> Number:
+    kind = type(value)
+    if kind is int:
+        if value.bit_length() > max_bits:
+            raise CalcOverflowError("too large", pos)
+    elif kind is float:
+        if not _isfinite(value):
+            raise CalcOverflowError("too large", pos)
+    else:   # e.g. (-8)**0.5 is complex
+        raise CalcError("not a real number", pos)
+    return value
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_cached(text: str) -> Node:
+    return parse(text)
+
+
+def evaluate(text: str, budget: Budget = DEFAULT_BUDGET) -> Number:
+    """The value of `text` within `budget`. Raises CalcError (with a position)
+    if it is not valid, CalcOverflowError if it would exceed the budget."""
+    if len(text) > budget.max_length:
+        raise CalcOverflowError("expression too long")
+    return evaluate_tree(parse_cached(text), budget)
+
+
+def format_result(value: Number) -> str:
+    if isinstance(value, float):
+        if value == int(value) and abs(value) < 1e15:
+            return str(int(value))
+        return f"{value:.10g}"
+    return str(value)
+
+
+# ──────────────────────────────────────────────────────────────────
+#  INCREMENTAL EVALUATION
+# ──────────────────────────────────────────────────────────────────
+# The parser's shunting-yard loop, run one character at a time over values
+# instead of tree nodes. Whatever can no longer change is folded into a
+# value as soon as it is complete, so a state holds only the open tail of
+# the expression. States are immutable and share their stacks (cons cells:
+# (head, rest) or None), so keeping one per character costs O(1) each.
+class _State(NamedTuple):
+    out: Optional[tuple]           # operand values
+    ops: Optional[tuple]           # pending (op, precedence, pos); "(" has precedence 0
+    expect_operand: bool = True
+    number: str = ""               # digits of the number being typed
+    number_pos: int = 0
+    depth: int = 0                 # unclosed "("
+    last: str = ""                 # previous token, to join "*" "*" into "**"
+    error: Optional[CalcError] = None   # sticky: no continuation can fix it
+    fault: Optional[CalcError] = None   # first arithmetic error; parsing goes on,
+                                        # since evaluate() reports syntax errors first
+
+
+_START = _State(None, None)
+
+
+def _fold(state: _State, out: tuple, op: str, pos: int, max_bits: int):
+    """Apply `op` to the top of `out`: (out, state with any new fault)."""
+    if op == "u+":
+        return out, state
+    if op == "u-":
+        return (-out[0], out[1]), state
+    right, (left, rest) = out
+    if state.fault is not None:
+        return (0, rest), state
+    try:
+        return (_apply(op, left, right, pos, max_bits), rest), state
+    except CalcError as exc:
+        return (0, rest), state._replace(fault=exc)
+
+
+def _end_number(state: _State, max_bits: int) -> _State:
+    number, pos = state.number, state.number_pos
+    if number == ".":
+        raise CalcSyntaxError("unexpected '.'", pos)
+    if len(number) > LITERAL_DIGITS:
+        raise CalcOverflowError("too large", pos)
+    value = float(number) if "." in number else int(number)
+    if value == _INF or type(value) is int and value.bit_length() > max_bits:
+        raise CalcOverflowError("too large", pos)
+    return state._replace(out=(value, state.out), number="", expect_operand=False)
+
+
+def _feed(state: _State, token: str, pos: int, max_bits: int) -> _State:
+    """The state after `token` (one character, or "**") at `pos`."""
+    if state.error is not None:
+        return state
+    try:
+        if token.isdigit() or token == ".":
+            if state.number and not (token == "." and "." in state.number):
+                return state._replace(number=state.number + token, last=token)
+            if state.number:
+                state = _end_number(state, max_bits)
+            if not state.expect_operand:
+                raise CalcSyntaxError(f"unexpected {token!r}", pos)
+            return state._replace(number=token, number_pos=pos, last=token)
+        if state.number:
+            state = _end_number(state, max_bits)
+        if token.isspace():
+            return state._replace(last=" ")
+        out, ops = state.out, state.ops
+        if state.expect_operand:
+            if token == "-" or token == "+":
+                top = ops[0] if ops else None
+                if top is not None and top[0] in ("u-", "u+"):
+                    # A run of signs folds into one entry, so "----…" stays O(1)
+                    op = "u-" if (top[0] == "u-") != (token == "-") else "u+"
+                    ops = ((op, _UNARY_PREC, top[2]), ops[1])
+                else:
+                    ops = (("u" + token, _UNARY_PREC, pos), ops)
+                return state._replace(ops=ops, last=token)
+            if token == "(":
+                return state._replace(ops=(("(", 0, pos), ops), depth=state.depth + 1,
+                                      last=token)
+            raise CalcSyntaxError(f"unexpected {token!r}", pos)
+        if token == "%":
+            if state.fault is not None:
+                return state._replace(last=token)
+            try:
+                value = _checked(out[0] / 100, max_bits, pos)
+            except OverflowError:
+                state = state._replace(fault=CalcOverflowError("too large", pos))
+                value = 0
+            except CalcError as exc:
+                state, value = state._replace(fault=exc), 0
+            return state._replace(out=(value, out[1]), last=token)
+        if token == ")":
+            while ops is not None and ops[0][0] != "(":
+                (op, _, at), ops = ops
+                out, state = _fold(state, out, op, at, max_bits)
+            if ops is None:
+                raise CalcSyntaxError("unmatched ')'", pos)
+            return state._replace(out=out, ops=ops[1], depth=state.depth - 1, last=token)
+        prec = _PREC.get(token)
+        if prec is None:
+            raise CalcSyntaxError(f"unexpected {token!r}", pos)
+        right_assoc = token == "**"
+        while ops is not None and (ops[0][1] > prec or ops[0][1] == prec and not right_assoc):
+            (op, _, at), ops = ops
+            out, state = _fold(state, out, op, at, max_bits)
+        return state._replace(out=out, ops=((token, prec, pos), ops), expect_operand=True,
+                              last=token)
+    except CalcError as exc:
+        return state._replace(error=exc, last=token)
+
+
+class IncrementalEvaluator:
+    """Evaluates text as it is typed: push() and pop() cost the same however
+    long the expression already is, and value() only has to finish the
+    still-open tail. Agrees with evaluate() on every value and error type;
+    when text has several syntax errors, the one named may differ."""
+
+    def __init__(self, budget: Budget = DEFAULT_BUDGET):
+        self.max_bits = budget.max_bits
+        self.max_length = budget.max_length
+        self.text = ""
+        self._states = [_START]   # state after each prefix of text
+
+    def push(self, char: str) -> None:
+        pos = len(self.text)
+        state = self._states[-1]
+        if char == "*" and state.last == "*" and self.text.endswith("*"):
+            # Second half of "**": redo the first "*" as the power operator
+            state = _feed(self._states[-2], "**", pos - 1, self.max_bits)
+        else:
+            state = _feed(state, char, pos, self.max_bits)
+        self._states.append(state)
+        self.text += char
+
+    def pop(self) -> None:
+        """Undo the last push (backspace)."""
+        if self.text:
+            self._states.pop()
+            self.text = self.text[:-1]
+
+    def set_text(self, text: str) -> None:
+        """Move to `text`, keeping the states of the prefix it shares with
+        the current text, so an edit costs only the characters it changed."""
+        if text == self.text:
+            return
+        keep = len(os.path.commonprefix((self.text, text)))
+        del self._states[keep + 1:]
+        self.text = self.text[:keep]
+        for char in text[keep:]:
+            self.push(char)
+
+    def value(self) -> Number:
+        """The value of the text so far; CalcError as evaluate() would raise."""
+        if len(self.text) > self.max_length:
+            raise CalcOverflowError("expression too long")
+        state = self._states[-1]
+        if state.error is not None:
+            raise state.error
+        if state.number:
+            state = _end_number(state, self.max_bits)
+        if state.expect_operand:
+            raise CalcSyntaxError("incomplete expression", len(self.text))
+        if state.depth:
+            raise CalcSyntaxError("missing ')'", len(self.text))
+        out, ops = state.out, state.ops
+        while ops is not None:
+            (op, _, at), ops = ops
+            out, state = _fold(state, out, op, at, self.max_bits)
+        if state.fault is not None:
+            raise state.fault
+        return out[0]
+
+
+# ──────────────────────────────────────────────────────────────────
+#  WORKER PROCESS
+# ──────────────────────────────────────────────────────────────────
+def _worker_main(conn, budget: Budget) -> None:
+    conn.send("ready")
+    while True:
+        try:
+            job, text = conn.recv()
+        except EOFError:
+            return
+        try:
+            conn.send((job, format_result(evaluate(text, budget)), None))
+        except CalcError as exc:
+            conn.send((job, None, exc))
+        except Exception as exc:   # a bug, not bad input: answer it rather than die
+            conn.send((job, None, CalcError(f"{type(exc).__name__}: {exc}")))
+
+
+class EvalWorker:
+    """Evaluates expressions in a child process, so nothing the budget misses
+    can stall the caller; an evaluation still running after `timeout`
+    seconds is killed and answered with CalcTimeoutError; one superseded by a
+    newer submission is killed after CANCEL_AFTER.
+
+    Non-blocking: submit() returns a job id, poll() (from a timer) returns
+    (job, result_str, error) once the latest job is done. Only the latest
+    submission is ever answered — a newer submit() or cancel() drops any
+    older one, and an older one still queued is never sent.
+    """
+
+    def __init__(self, budget: Budget = DEFAULT_BUDGET, timeout: float = EVAL_TIMEOUT):
+        self.budget = budget
+        self.timeout = timeout
+        self.kills = 0          # evaluations killed at their deadline
+        self._proc = None
+        self._conn = None
+        self._ready = False
+        self._job = 0           # id of the latest submission
+        self._queued: Optional[tuple[int, str]] = None
+        self._running: Optional[tuple[int, float]] = None   # (job, time sent)
+
+    @property
+    def busy(self) -> bool:
+        return self._queued is not None or self._running is not None
+
+    def start(self) -> None:
+        # Spawned, not forked: the parent may be a Tk process with an X connection.
+        ctx = multiprocessing.get_context("spawn")
+        self._conn, child = ctx.Pipe()
+        self._proc = ctx.Process(target=_worker_main, args=(child, self.budget),
+                                 name="calc-eval", daemon=True)
+        self._proc.start()
+        child.close()
+        self._ready = False
+
+    def submit(self, text: str) -> int:
+        self._job += 1
+        self._queued = (self._job, text)
+        if self._proc is None:
+            self.start()
+        self._send()
+        return self._job
+
+    def cancel(self) -> None:
+        self._job += 1
+        self._queued = None
+
+    def poll(self) -> Optional[tuple[int, Optional[str], Optional[CalcError]]]:
+        if not self._ready:
+            if self._proc is None or not self._conn.poll():
+                return None
+            try:
+                self._conn.recv()
+            except (EOFError, OSError):   # died before it was ready
+                job = self._queued[0] if self._queued is not None else None
+                self._queued = None
+                self._restart()
+                return (job, None, CalcError("evaluation failed")) if job == self._job else None
+            self._ready = True
+            self._send()
+            return None
+        if self._running is None:
+            return None
+        job, sent = self._running
+        elapsed = time.monotonic() - sent
+        if self._conn.poll():
+            try:
+                answer = self._conn.recv()
+            except (EOFError, OSError):
+                answer = (job, None, CalcError("evaluation failed"))
+                self._restart()
+        elif elapsed >= self.timeout or job != self._job and elapsed >= CANCEL_AFTER:
+            self.kills += 1
+            answer = (job, None, CalcTimeoutError("took too long"))
+            self._restart()
+        else:
+            return None
+        self._running = None
+        self._send()
+        return answer if answer[0] == self._job else None
+
+    def close(self) -> None:
+        if self._proc is not None:
+            self._conn.close()
+            self._proc.kill()
+            self._proc.join()
+            self._proc = self._conn = None
+
+    def _send(self) -> None:
+        if self._ready and self._running is None and self._queued is not None:
+            job, text = self._queued
+            self._queued = None
+            self._conn.send((job, text))
+            self._running = (job, time.monotonic())
+
+    def _restart(self) -> None:
+        self.close()
+        self.start()
+
+
+def evaluate_with_timeout(text: str, budget: Budget = DEFAULT_BUDGET,
+                          timeout: float = EVAL_TIMEOUT) -> str:
+    """Blocking convenience over a throwaway EvalWorker: the formatted result."""
+    worker = EvalWorker(budget, timeout)
+    try:
+        worker.submit(text)
+        while True:
+            answer = worker.poll()
+            if answer is not None:
+                _, result, error = answer
+                if error is not None:
+                    raise error
+                return result
+            time.sleep(0.001)
+    finally:
+        worker.close()
+
+
+# ──────────────────────────────────────────────────────────────────
+#  CALCULATOR ENGINE
+# ──────────────────────────────────────────────────────────────────
+# Pasted "*" and "/" shown as the keypad's symbols; "**" stays as is
+_PASTE_OPERATOR = re.compile(r"\*\*|[*/]")
+_PASTE_SYMBOLS = {"*": "×", "/": "÷"}
+
+
+class CalcEngine:
+    """Pure-logic calculator engine — no UI dependency."""
+
+    def __init__(self):
+        self.expression = ""
+        self.history: list[tuple[str, str]] = []   # [(expr, result), ...]
+        self.max_history = 5
+        self.last_result = ""
+        self.just_evaluated = False
+        self._live = IncrementalEvaluator()   # preview state, synced to expression
+
+    # ── input handling ──────────────────────────────────────────
+    def input(self, char: str) -> None:
+        if self.just_evaluated:
+            # After =, start fresh unless appending operator
+            if char in "+-×÷%":
+                self.expression = self.last_result + char
+            else:
+                self.expression = char
+            self.just_evaluated = False
+        else:
+            self.expression += char
+
+    def paste(self, text: str) -> None:
+        """Append a whole pasted expression in one edit. Whitespace is
+        dropped and keyboard operators become the display's × and ÷."""
+        text = _PASTE_OPERATOR.sub(lambda m: _PASTE_SYMBOLS.get(m.group(), m.group()),
+                                   "".join(text.split()))
+        if text:
+            self.input(text[0])
+            self.expression += text[1:]
+
+    def backspace(self) -> None:
+        self.just_evaluated = False
+        self.expression = self.expression[:-1]
+
+    def clear(self) -> None:
+        self.expression = ""
+        self.last_result = ""
+        self.just_evaluated = False
+
+    def toggle_sign(self) -> None:
+        self.just_evaluated = False
+        if not self.expression:
+            return
+        # Try to negate the last number token
+        m = re.search(r"(-?\d+\.?\d*)$", self.expression)
+        if m:
+            num_str = m.group(1)
+            if num_str.startswith("-"):
+                new_num = num_str[1:]
+            else:
+                new_num = "-" + num_str
+            self.expression = self.expression[: m.start()] + new_num
+
+    # ── evaluation ───────────────────────────────────────────────
+    def evaluate(self) -> tuple[str, str]:
+        """Returns (display_expr, result_str). Raises CalcError on bad input."""
+        expr = self.expression.strip()
+        if not expr:
+            return "", ""
+        return self.commit(expr, format_result(evaluate(expr)))
+
+    def commit(self, display_expr: str, result_str: str) -> tuple[str, str]:
+        """Record a finished evaluation (however it was computed) as evaluate() does."""
+        # Store history
+        self.history.insert(0, (display_expr, result_str))
+        self.history = self.history[: self.max_history]
+
+        self.last_result = result_str
+        self.just_evaluated = True
+        self.expression = result_str
+        return display_expr, result_str
+
+    def preview(self) -> str:
+        """Live result of the expression so far; "" while it is incomplete or invalid."""
+        expr = self.expression
+        if not expr.strip():
+            return "0"
+        self._live.set_text(expr)
+        try:
+            return format_result(self._live.value())
+        except CalcError as exc:
+            return self.preview_error(exc)
+
+    @staticmethod
+    def preview_error(exc: CalcError) -> str:
+        """What the live preview shows for a failed evaluation."""
+        if isinstance(exc, CalcOverflowError):
+            return "Too large"
+        if isinstance(exc, CalcTimeoutError):
+            return "Too slow"
+        return ""
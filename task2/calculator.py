@@ -1,9 +1,14 @@
 
+import argparse
 import customtkinter as ctk
 import math
-import re
+import sys
+import tkinter as tk
 from tkinter import font as tkfont
 
+from calc_engine import (CalcEngine, CalcError, CalcOverflowError, CalcSyntaxError,
+                         CalcTimeoutError, EvalWorker)
+
 
 # ──────────────────────────────────────────────────────────────────
 #  THEME CONSTANTS
@@ -51,89 +56,8 @@ COLORS = {
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
-
-# ──────────────────────────────────────────────────────────────────
-#  CALCULATOR ENGINE
-# ──────────────────────────────────────────────────────────────────
-class CalcEngine:
-    """Pure-logic calculator engine — no UI dependency."""
-
-    def __init__(self):
-        self.expression = ""
-        self.history: list[tuple[str, str]] = []   # [(expr, result), ...]
-        self.max_history = 5
-        self.last_result = ""
-        self.just_evaluated = False
-
-    # ── input handling ──────────────────────────────────────────
-    def input(self, char: str) -> None:
-        if self.just_evaluated:
-            # After =, start fresh unless appending operator
-            if char in "+-×÷%":
-                self.expression = self.last_result + char
-            else:
-                self.expression = char
-            self.just_evaluated = False
-        else:
-            self.expression += char
-
-    def backspace(self) -> None:
-        self.just_evaluated = False
-        self.expression = self.expression[:-1]
-
-    def clear(self) -> None:
-        self.expression = ""
-        self.last_result = ""
-        self.just_evaluated = False
-
-    def toggle_sign(self) -> None:
-        self.just_evaluated = False
-        if not self.expression:
-            return
-        # Try to negate the last number token
-        m = re.search(r"(-?\d+\.?\d*)$", self.expression)
-        if m:
-            num_str = m.group(1)
-            if num_str.startswith("-"):
-                new_num = num_str[1:]
-            else:
-                new_num = "-" + num_str
-            self.expression = self.expression[: m.start()] + new_num
-
-    # ── evaluation ───────────────────────────────────────────────
-    def evaluate(self) -> tuple[str, str]:
-        """Returns (display_expr, result_str). Raises on error."""
-        expr = self.expression.strip()
-        if not expr:
-            return "", ""
-
-        display_expr = expr  # what we'll show as the "history" expression
-        # Replace display symbols with Python operators
-        safe = expr.replace("×", "*").replace("÷", "/").replace("%", "/100")
-
-        # Safety: only allow digits, operators, dot, parens, spaces
-        if not re.fullmatch(r"[\d\s\+\-\*/\.\(\)]+", safe):
-            raise ValueError("Invalid expression")
-
-        result = eval(safe, {"__builtins__": {}})  # noqa: S307
-
-        # Format result
-        if isinstance(result, float):
-            if result == int(result) and abs(result) < 1e15:
-                result_str = str(int(result))
-            else:
-                result_str = f"{result:.10g}"
-        else:
-            result_str = str(result)
-
-        # Store history
-        self.history.insert(0, (display_expr, result_str))
-        self.history = self.history[: self.max_history]
-
-        self.last_result = result_str
-        self.just_evaluated = True
-        self.expression = result_str
-        return display_expr, result_str
+# How often (ms) to check the evaluation worker while it owes an answer
+WORKER_POLL_MS = 4
 
 
 # ──────────────────────────────────────────────────────────────────
@@ -264,10 +188,21 @@ class HistoryPanel(ctk.CTkFrame):
 #  MAIN CALCULATOR APP
 # ──────────────────────────────────────────────────────────────────
 class LiquidGlassCalculator(ctk.CTk):
-    def __init__(self):
+    def __init__(self, render_stats: bool = False):
         super().__init__()
 
         self.engine = CalcEngine()
+        # All evaluation happens in this child process, so the window keeps
+        # responding whatever is typed; only the newest request is answered.
+        self.worker = EvalWorker()
+        self.worker.start()
+        self._poll_job = None
+        self._equals_job = None    # worker job id of a pending "="
+        self._equals_expr = ""
+        self._render_job = None    # after_idle id while a display refresh is queued
+        self._edits = 0            # engine edits since the app started
+        self._renders = 0          # display refreshes they actually caused
+        self._render_stats = render_stats   # report both on stderr at close
         self._history_visible = True
 
         # ── window setup ─────────────────────────────────────────
@@ -280,6 +215,7 @@ class LiquidGlassCalculator(ctk.CTk):
         self._build_ui()
         self._bind_keyboard()
         self._refresh_display()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
 
     # ── UI construction ──────────────────────────────────────────
     def _build_ui(self):
@@ -460,36 +396,69 @@ class LiquidGlassCalculator(ctk.CTk):
         op("+",  lambda: self._input("+"), 3, 4)
 
     # ── Logic handlers ───────────────────────────────────────────
+    # Edits only change the engine; the display catches up once per idle
+    # cycle, so a burst of queued keystrokes costs one preview and one redraw.
     def _input(self, char: str):
         self.engine.input(char)
-        self._refresh_display()
+        self._schedule_refresh()
+
+    def _paste(self, _event=None):
+        try:
+            text = self.clipboard_get()
+        except tk.TclError:   # empty or non-text clipboard
+            return "break"
+        self.engine.paste(text)
+        self._schedule_refresh()
+        return "break"
 
     def _backspace(self):
         self.engine.backspace()
-        self._refresh_display()
+        self._schedule_refresh()
 
     def _clear(self):
         self.engine.clear()
-        self._refresh_display()
+        self._schedule_refresh()
 
     def _toggle_sign(self):
         self.engine.toggle_sign()
-        self._refresh_display()
+        self._schedule_refresh()
 
     def _equals(self):
-        try:
-            expr, result = self.engine.evaluate()
+        expr = self.engine.expression.strip()
+        if not expr:
+            self.expr_var.set(" =")
+            self.result_var.set("")
+            return
+        self._equals_expr = expr
+        self._equals_job = self.worker.submit(expr)
+        self._watch_worker()
+
+    def _equals_done(self, result: str | None, error: CalcError | None):
+        expr = self._equals_expr
+        if self.engine.expression.strip() != expr:
+            return   # edited while it was being worked out
+        if error is None:
+            expr, result = self.engine.commit(expr, result)
             self.expr_var.set(expr + " =")
             self.result_var.set(result)
             self.history_panel.update_history(self.engine.history)
-        except ZeroDivisionError:
+        elif isinstance(error, ZeroDivisionError):
             self._show_error("Division by zero!")
-        except Exception:
+        elif isinstance(error, CalcOverflowError):
+            self._show_error("Too large!")
+        elif isinstance(error, CalcTimeoutError):
+            self._show_error("Took too long!")
+        elif isinstance(error, CalcSyntaxError):
+            # Keep the expression so it can be fixed; mark where it went wrong.
+            self._show_error(error.message[:1].upper() + error.message[1:],
+                             expr[:error.position] + "▸" + expr[error.position:])
+        else:
             self._show_error("Invalid input!")
 
-    def _show_error(self, msg: str):
-        self.engine.clear()
-        self.expr_var.set("")
+    def _show_error(self, msg: str, marked_expr: str | None = None):
+        if marked_expr is None:
+            self.engine.clear()
+        self.expr_var.set(marked_expr or "")
         self.result_var.set(msg)
         self.result_label.configure(text_color="#FF6B6B")
         self.after(1600, lambda: (
@@ -497,27 +466,50 @@ class LiquidGlassCalculator(ctk.CTk):
             self._refresh_display(),
         ))
 
+    def _schedule_refresh(self):
+        self._edits += 1
+        if self._render_job is None:
+            self._render_job = self.after_idle(self._flush_display)
+
+    def _flush_display(self):
+        self._render_job = None
+        self._renders += 1
+        self._refresh_display()
+
     def _refresh_display(self):
+        if self._render_job is not None:   # called directly; this render covers the queue
+            self.after_cancel(self._render_job)
+            self._render_job = None
+            self._renders += 1
         expr = self.engine.expression
         self.expr_var.set(expr)
-        if not expr:
-            self.result_var.set("0")
-        else:
-            # Live preview
-            try:
-                safe = expr.replace("×", "*").replace("÷", "/").replace("%", "/100")
-                if re.fullmatch(r"[\d\s\+\-\*/\.\(\)]+", safe):
-                    val = eval(safe, {"__builtins__": {}})  # noqa: S307
-                    if isinstance(val, float):
-                        if val == int(val) and abs(val) < 1e15:
-                            val = int(val)
-                        self.result_var.set(f"{val:.10g}")
-                    else:
-                        self.result_var.set(str(val))
-                else:
-                    self.result_var.set("")
-            except Exception:
-                self.result_var.set("")
+        # Live preview runs in-process: the engine keeps its parse state per
+        # keystroke, so this costs the same at 10 characters or 10,000.
+        # "=" still goes through the worker.
+        self.result_var.set(self.engine.preview())
+
+    # ── Evaluation worker ────────────────────────────────────────
+    def _watch_worker(self):
+        if self._poll_job is None:
+            self._poll_job = self.after(WORKER_POLL_MS, self._poll_worker)
+
+    def _poll_worker(self):
+        self._poll_job = None
+        answer = self.worker.poll()
+        if answer is not None:
+            job, result, error = answer
+            if job == self._equals_job:
+                self._equals_job = None
+                self._equals_done(result, error)
+        if self.worker.busy:
+            self._watch_worker()
+
+    def _on_close(self):
+        self.worker.close()
+        if self._render_stats:
+            print(f"calculator: {self._edits} edits, {self._renders} renders "
+                  f"({self._edits - self._renders} saved by coalescing)", file=sys.stderr)
+        self.destroy()
 
     # ── Keyboard bindings ────────────────────────────────────────
     def _bind_keyboard(self):
@@ -533,6 +525,7 @@ class LiquidGlassCalculator(ctk.CTk):
         self.bind("<Return>",    lambda e: self._equals())
         self.bind("<KP_Enter>",  lambda e: self._equals())
         self.bind("<BackSpace>", lambda e: self._backspace())
+        self.bind("<<Paste>>",   self._paste)     # Ctrl+V, Shift+Insert, ⌘V
         self.bind("<Escape>",    lambda e: self._clear())
         self.bind("<Delete>",    lambda e: self._clear())
 
@@ -553,5 +546,8 @@ class LiquidGlassCalculator(ctk.CTk):
 #  ENTRY POINT
 # ──────────────────────────────────────────────────────────────────
 if __name__ == "__main__":
-    app = LiquidGlassCalculator()
+    parser = argparse.ArgumentParser(description="Calculator window.")
+    parser.add_argument("--render-stats", action="store_true",
+                        help="on close, print edits vs display refreshes to stderr")
+    app = LiquidGlassCalculator(parser.parse_args().render_stats)
     app.mainloop()
@@ -0,0 +1,34 @@
+import io
+
+import pytest
+
+import calc_cli
+
+
+def test_an_unexpected_error_costs_one_line(monkeypatch):
+    real = calc_cli.evaluate
+
+    def flaky(text, budget):
+        if text == "boom":
+            raise OverflowError("int too large to convert to float")
+        return real(text, budget)
+
+    monkeypatch.setattr(calc_cli, "evaluate", flaky)
+    out = io.StringIO()
+    assert calc_cli.run(["1+2\n", "boom\n", "91÷8.+36**329\n", "4\n"], out, jobs=1) == (4, 2)
+    assert out.getvalue().splitlines() == [
+        "3", "error: OverflowError: int too large to convert to float",
+        "error: too large at column 6", "4"]
+
+
+def test_pool_keeps_input_order():
+    lines = [f"{i}×2\n" for i in range(50)]
+    out = io.StringIO()
+    assert calc_cli.run(lines, out, jobs=2, chunk=7) == (50, 0)
+    assert out.getvalue().splitlines() == [str(i * 2) for i in range(50)]
+
+
+def test_max_digits_cannot_exceed_what_python_prints(capsys):
+    with pytest.raises(SystemExit):
+        calc_cli.main(["--max-digits", "10000"])
+    assert "--max-digits must be between 1 and 4300" in capsys.readouterr().err
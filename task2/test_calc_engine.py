@@ -0,0 +1,31 @@
+import pytest
+
+from calc_engine import CalcError, CalcOverflowError, IncrementalEvaluator, evaluate
+
+
+def test_float_plus_huge_int_is_an_overflow_not_a_crash():
+    # 36**329 is within the digit budget but too large to become a float
+    with pytest.raises(CalcOverflowError):
+        evaluate("91÷8.+36**329")
+
+
+@pytest.mark.parametrize("text", ["91÷8.+36**329", "91÷8.-36**329", "1.5×36**329"])
+def test_incremental_preview_reports_the_same_overflow(text):
+    live = IncrementalEvaluator()
+    live.set_text(text)
+    with pytest.raises(CalcOverflowError):
+        live.value()
+
+
+def test_errors_are_calc_errors_with_a_position():
+    with pytest.raises(CalcError) as info:
+        evaluate("1+(2")
+    assert info.value.position == 4
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("-" * 1000 + "1", 1), ("-" * 1001 + "1", -1), ("2×-+-3", 6), ("--2**2", 4)])
+def test_runs_of_signs_agree_with_the_preview(text, expected):
+    live = IncrementalEvaluator()
+    live.set_text(text)
+    assert evaluate(text) == live.value() == expected